@@ -1,6 +1,25 @@
 import streamlit as st
 from notice_rag import NoticeRAG
 
+# 첨삭 앱과 같은 LLM 게이트웨이(연결 풀, 타임아웃, 재시도, 모델별 동시 요청 제한)를 쓰려면
+# 저장소 루트에서 `python -m streamlit run SongYuna/app.py`로 실행하세요 (루트의 llm_gateway.py를 임포트할 수 있어야 함).
+# 다른 위치에서 실행하면 NoticeRAG가 기본 OpenAI 클라이언트를 직접 만듭니다.
+try:
+    from llm_gateway import get_chat_model, get_embeddings
+except ImportError:
+    get_chat_model = get_embeddings = None
+    print("[경고] llm_gateway를 찾을 수 없어 기본 OpenAI 클라이언트를 사용합니다. 저장소 루트에서 실행하세요.")
+
+
+def gateway_models():
+    if get_chat_model is None:
+        return {}
+    return {
+        "summary_llm": get_chat_model('gpt-4o-mini', temperature=0.1),
+        "qa_llm": get_chat_model('gpt-4o-mini', temperature=0.3),
+        "embeddings": get_embeddings('text-embedding-3-small'),
+    }
+
 st.set_page_config(page_title='공고문 요약 및 질의응답 RAG', layout='wide')
 
 # 세션 상태 초기화
@@ -24,7 +43,7 @@ if uploaded_file:
     with open('uploaded_notice.pdf', 'wb') as f:
         f.write(uploaded_file.read())
     # NoticeRAG 인스턴스 생성
-    st.session_state.rag = NoticeRAG("uploaded_notice.pdf")
+    st.session_state.rag = NoticeRAG("uploaded_notice.pdf", **gateway_models())
     st.session_state.summary = None
     st.session_state.history = []
     st.success("파일 업로드 및 분석 완료!")
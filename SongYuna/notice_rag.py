@@ -41,8 +41,9 @@ def preprocess_docs(docs):
     return clean_docs, chunks
 
 
-def build_vector_store(docs):
-    embeddings = OpenAIEmbeddings(model='text-embedding-3-small')
+def build_vector_store(docs, embeddings=None):
+    # embeddings를 넘기지 않으면 기본 OpenAI 임베딩을 만듭니다 (app.py는 LLM 게이트웨이의 것을 넘김)
+    embeddings = embeddings or OpenAIEmbeddings(model='text-embedding-3-small')
     vector_store = Chroma.from_documents(
         documents=docs,
         embedding=embeddings
@@ -50,7 +51,7 @@ def build_vector_store(docs):
     return vector_store
 
 
-def get_summary_chain():
+def get_summary_chain(llm=None):
     summary_prompt = ChatPromptTemplate.from_messages([
         ('system', '당신은 정부 지원 공고문을 핵심만 뽑아 알려주는 정확하고 친절한 챗봇입니다.'),
         ('human', """
@@ -72,11 +73,11 @@ def get_summary_chain():
          
         """)
     ])
-    llm = ChatOpenAI(model='gpt-4o-mini', temperature=0.1)
+    llm = llm or ChatOpenAI(model='gpt-4o-mini', temperature=0.1)
     return summary_prompt | llm
 
 
-def get_qa_chain(vector_store):
+def get_qa_chain(vector_store, llm=None):
     retriever = vector_store.as_retriever(search_kwargs={'k':3})
     qa_prompt = ChatPromptTemplate.from_messages([
         ('system', '당신은 공고문의 내용만 근거로 답변하는 정확하고 친절한 챗봇입니다.'),
@@ -96,7 +97,7 @@ def get_qa_chain(vector_store):
 
         """)
     ])
-    llm = ChatOpenAI(model='gpt-4o-mini', temperature=0.3)
+    llm = llm or ChatOpenAI(model='gpt-4o-mini', temperature=0.3)
     output_parser = StrOutputParser()
     qa_chain = (
         {'context': retriever, 'query': RunnablePassthrough()}
@@ -105,13 +106,14 @@ def get_qa_chain(vector_store):
     return qa_chain
 
 # Streamlit 등에서 import해서 사용할 수 있도록 클래스화
+# summary_llm / qa_llm / embeddings를 넘기면 그 모델을 쓰고, 없으면 기본 OpenAI 클라이언트를 만듭니다.
 class NoticeRAG:
-    def __init__(self, path: str):
+    def __init__(self, path: str, summary_llm=None, qa_llm=None, embeddings=None):
         self.docs = load_pdf(path)
         self.clean_docs, self.chunks = preprocess_docs(self.docs)
-        self.vector_store = build_vector_store(self.docs)
-        self.summary_chain = get_summary_chain()
-        self.qa_chain = get_qa_chain(self.vector_store)
+        self.vector_store = build_vector_store(self.docs, embeddings)
+        self.summary_chain = get_summary_chain(summary_llm)
+        self.qa_chain = get_qa_chain(self.vector_store, qa_llm)
 
     def summary(self):
         context_text = '\n\n'.join([chunk.page_content for chunk in self.chunks])
@@ -0,0 +1,74 @@
+# answer_index.py (학생 답안 / 채점 기준을 문장 단위로 임베딩해 질문과 관련된 문장만 고르기)
+
+import re
+
+import numpy as np
+
+ANSWER_TOP_K = 5          # 멘토 챗봇 질문마다 넣을 학생 답안 문장 수
+CRITERIA_TOP_K = 3        # 함께 넣을 채점 기준 발췌 문장 수
+MIN_SENTENCE_CHARS = 15   # 이보다 짧은 조각은 앞 문장에 붙입니다 ("예를 들어," 같은 조각 방지)
+MAX_SENTENCE_CHARS = 300  # 마침표 없이 이어지는 OCR 텍스트는 이 길이로 자릅니다
+
+# 문장 끝 문장부호 뒤의 공백, 또는 빈 줄(문단 경계)에서 나눕니다.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。？！])\s+|\n\s*\n")
+# 빈 줄이 아닌 줄바꿈은 OCR이 줄 끝에서 끊은 것이므로 공백으로 잇습니다.
+_LINE_WRAP = re.compile(r"(?<!\n)[ \t]*\n[ \t]*(?!\n)")
+
+
+def split_sentences(text):
+    """한국어 답안을 문장 목록으로 나눕니다. 비어 있거나 문자열이 아니면 빈 목록."""
+    if not isinstance(text, str) or not text.strip():
+        return []
+    sentences = []
+    for piece in _SENTENCE_BOUNDARY.split(_LINE_WRAP.sub(" ", text.strip())):
+        piece = " ".join(piece.split())
+        if not piece:
+            continue
+        if sentences and len(piece) < MIN_SENTENCE_CHARS:
+            sentences[-1] = f"{sentences[-1]} {piece}"
+            continue
+        while len(piece) > MAX_SENTENCE_CHARS:
+            sentences.append(piece[:MAX_SENTENCE_CHARS])
+            piece = piece[MAX_SENTENCE_CHARS:]
+        sentences.append(piece)
+    return sentences
+
+
+class SentenceIndex:
+    """
+    글 하나(학생 답안, 채점 기준)의 문장 임베딩. 한 번 만들어 두면 질문마다 임베딩은 질문 하나만 합니다.
+    text를 함께 들고 있어 답안이 바뀌었는지(matches) 확인할 수 있습니다.
+    """
+
+    def __init__(self, text, sentences, vectors):
+        self.text = text
+        self.sentences = sentences
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, text, embedding_model):
+        sentences = split_sentences(text)
+        if not sentences:
+            return cls(text, [], np.zeros((0, 0), dtype=np.float32))
+        vectors = np.asarray(embedding_model.embed_documents(sentences), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return cls(text, sentences, vectors)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def matches(self, text):
+        return self.text == text
+
+    def top_k(self, query_vector, k):
+        """질의 벡터와 코사인 유사도가 높은 k개 문장을 원문 순서대로 돌려줍니다."""
+        if not self.sentences:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        scores = self.vectors @ (query / max(np.linalg.norm(query), 1e-12))
+        top = np.argsort(-scores)[:k]
+        return [self.sentences[i] for i in sorted(top)]
+
+
+def format_excerpt(sentences, empty_message):
+    return "\n".join(f"- {sentence}" for sentence in sentences) if sentences else empty_message
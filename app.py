@@ -1,15 +1,18 @@
-from PIL import Image
-from openai import OpenAI
-from dotenv import load_dotenv
-from paddleocr import PaddleOCR
-from config import UNIVERSITY_DATA
-from essay_grader import EssayGrader
-from display_ui import display_correction_with_diff
-import numpy as np
-import streamlit as st
-import streamlit.components.v1 as components
-import fitz  # PDF 미리보기용
-import base64
+from startup import BackgroundLoader, startup_timer
+from tracing import tracer
+
+# 첨삭 엔진(ko-sbert, FAISS, OpenAI)과 OCR(PaddleOCR)은 여기서 임포트하지 않고 백그라운드 스레드에서 로딩합니다.
+with startup_timer.measure("app (streamlit/UI)", "import", once=True):
+    from PIL import Image
+    from dotenv import load_dotenv
+    from config import UNIVERSITY_DATA
+    from display_ui import display_correction_stream
+    import streamlit as st
+    import streamlit.components.v1 as components
+    from page_renderer import get_page_render_cache  # PDF 미리보기용
+    import os
+    import threading
+    import time
 
 
 load_dotenv()
@@ -20,17 +23,95 @@ if "page_config_set" not in st.session_state:
     st.session_state.page_config_set = True
 
 
-@st.cache_resource
-def load_grader():
+def _load_grader():
+    with startup_timer.measure("essay_grader (langchain/torch/faiss)", "import"):
+        from essay_grader import EssayGrader
     return EssayGrader()
 
-grader = load_grader()
 
-# PaddleOCR 초기화
+def _load_ocr():
+    from ocr_service import get_ocr_processor
+    processor = get_ocr_processor()
+    try:
+        processor.warm_up()  # 프로세스 공용 OCR 서비스의 PaddleOCR 모델(워커 풀 사용 시 워커마다)을 미리 로딩
+    except Exception as e:
+        # 미리 로딩에 실패해도 첫 OCR 실행 때 다시 시도하고, 그때 오류를 화면에 보여줍니다.
+        print(f"[경고] PaddleOCR 미리 로딩 실패: {e}")
+    return processor
+
+
+def _print_startup_report(loaders):
+    for loader in loaders.values():
+        loader.wait()
+    print("\n--- 시작 시간 ---\n" + startup_timer.format_report())
+
+
 @st.cache_resource
-def load_ocr():
-    return PaddleOCR(use_angle_cls=True, lang='korean')
-ocr_model = load_ocr()
+def start_model_loading():
+    # 홈/시험지 화면은 바로 그리고, 무거운 모델은 프로세스당 한 번 백그라운드에서 로딩합니다.
+    loaders = {
+        "grader": BackgroundLoader("첨삭 엔진", _load_grader).start(),
+        "ocr": BackgroundLoader("OCR 모델", _load_ocr).start(),
+    }
+    threading.Thread(target=_print_startup_report, args=(loaders,), daemon=True).start()
+    return loaders
+
+model_loaders = start_model_loading()
+# 로더는 프로세스 동안 캐시되므로, 실패한 로더만 재실행 때마다 다시 시작합니다. (예전처럼 새로고침하면 재시도)
+for _loader in model_loaders.values():
+    _loader.restart_if_failed()
+
+
+def wait_for_models():
+    """첨삭 엔진과 OCR 모델이 준비될 때까지 진행 표시줄을 보여주며 기다립니다."""
+    pending = [loader for loader in model_loaders.values() if not loader.ready]
+    if pending:
+        progress = st.progress(0.0)
+        while pending:
+            done = len(model_loaders) - len(pending)
+            steps = ", ".join(startup_timer.current_steps()) or "준비 중"
+            elapsed = time.perf_counter() - min(loader.started_at for loader in pending)
+            names = ", ".join(loader.name for loader in pending)
+            progress.progress(done / len(model_loaders), text=f"⏳ {names} 로딩 중... ({steps}, {elapsed:.0f}초)")
+            time.sleep(0.25)
+            pending = [loader for loader in pending if not loader.ready]
+        progress.empty()
+    try:
+        return model_loaders["grader"].result(), model_loaders["ocr"].result()
+    except Exception as e:
+        st.error(f"모델 로딩 중 오류가 발생했습니다: {e}")
+        st.stop()
+
+
+def render_startup_report():
+    with st.expander("⏱️ 시작 시간"):
+        for loader in model_loaders.values():
+            status = f"완료 ({loader.elapsed:.1f}초)" if loader.ready else "로딩 중..."
+            if loader.error is not None:
+                status = f"실패: {loader.error}"
+            st.markdown(f"- **{loader.name}**: {status}")
+        st.code(startup_timer.format_report())
+    if tracer.enabled:
+        with st.expander("📈 단계별 처리 시간"):
+            summary = tracer.registry.summary()
+            if summary:
+                st.table([{"단계": stage, "횟수": s["count"], "평균(s)": round(s["mean"], 3), "최대(s)": round(s["max"], 3)}
+                          for stage, s in summary.items()])
+            else:
+                st.caption("아직 측정된 요청이 없습니다.")
+
+# 시험지 페이지 렌더링 캐시. PAGE_WARM_UP=false가 아니면 시작할 때 모든 시험지 페이지를 백그라운드에서 미리 렌더링합니다.
+page_cache = get_page_render_cache()
+
+@st.cache_resource
+def start_page_warm_up():
+    if os.getenv("PAGE_WARM_UP", "true").lower() not in ("1", "true", "yes"):
+        return None
+    thread = threading.Thread(target=page_cache.warm_up, args=(UNIVERSITY_DATA,), daemon=True)
+    thread.start()
+    return thread
+
+start_page_warm_up()
 
 
 def render_js_timer(timer_id):
@@ -126,6 +207,7 @@ def render_home():
             st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
+    render_startup_report()
 
 
 
@@ -229,18 +311,13 @@ def render_exam():
         st.info("⏸ 타이머 일시정지 상태입니다.")
 
     try:
-        doc = fitz.open(pdf_path)
         total_pages = len(page_list)
         cur_page = st.session_state.page_num
 
         st.markdown(f"**페이지 {cur_page + 1} / {total_pages}**")
 
-        page = doc[page_list[cur_page]]
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        # st.image(pix.tobytes("png"), use_container_width=True)
-        # pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))
-        image_bytes = pix.tobytes("png")
-        base64_image = base64.b64encode(image_bytes).decode()
+        # 타이머 버튼 등으로 다시 실행될 때마다 PDF를 렌더링하지 않도록 캐시된 PNG(base64)를 사용합니다.
+        base64_image = page_cache.get_page_base64(pdf_path, page_list[cur_page], zoom=2)
 
         st.markdown(
             f"""
@@ -273,6 +350,7 @@ def render_exam():
 
 def render_grading():
     st.title("✏ GPT 기반 손글씨 첨삭")
+    grader, ocr_processor = wait_for_models()
 
     uploaded_files = []
     with st.sidebar:
@@ -325,29 +403,27 @@ def render_grading():
                 # st.image(image, use_column_width=True)
 
             if st.button("🤖 GPT 첨삭 실행", key=f"gpt_feedback_{index}"):
-                with st.spinner("첨삭을 진행 중입니다..."):
+                # 첨삭 실행 한 번(OCR → 검색 → LLM → 표시)을 하나의 요청으로 측정합니다. (GRADER_TRACE를 켠 경우)
+                with st.spinner("첨삭을 진행 중입니다..."), tracer.request("grading", question_id=st.session_state.get("question_id")):
                     st.markdown("## 📄 첨삭 결과")
 
-                    # 이미지 전처리
-                    image = Image.open(current_file).convert('RGB')
-                    img_np = np.array(image)
-
-                    # OCR 수행
+                    # OCR 수행 (선택한 모든 페이지를 순서대로 OCR해 하나의 답안으로 합칩니다)
                     try:
-                        result = ocr_model.ocr(img_np)
-
-                        if result:
-                            extracted_text = '\n'.join(result[0]['rec_texts'])
-                        else:
+                        extracted_text = ocr_processor.process_pages([f.getvalue() for f in selected_files])
+                        if not extracted_text:
                             extracted_text = "❌ 인식된 텍스트가 없습니다."
 
                     except Exception as e:
                         extracted_text = f"❌ OCR 실행 중 오류: {e}"
 
                     # OCR 결과 표시
-                    st.subheader("📄 OCR 추출 텍스트:")
+                    st.subheader(f"📄 OCR 추출 텍스트 ({len(selected_files)}페이지):")
                     st.code(extracted_text)
+                    cache_stats = ocr_processor.cache.stats()
+                    st.caption(f"OCR 캐시 적중 {cache_stats['memory_hits'] + cache_stats['disk_hits']}회 / 미스 {cache_stats['misses']}회")
                     st.session_state.extracted_text = extracted_text
+                    # 챗봇이 질문마다 관련 문장만 고를 수 있도록 답안 문장 임베딩을 한 번만 만들어 둡니다. (OCR 실패 문구는 임베딩하지 않음)
+                    st.session_state.answer_index = grader.build_answer_index(extracted_text) if "❌" not in extracted_text else None
                     # GPT 첨삭 결과
                     # st.subheader("🤖 GPT 첨삭 결과:")
                     if 'grading_criteria' not in st.session_state:
@@ -355,23 +431,30 @@ def render_grading():
                     if 'model_answer' not in st.session_state:
                         st.session_state.model_answer = False
                     if "❌" not in extracted_text and st.session_state['question_id']:
-                        st.session_state.grading_criteria = grader.get_document_content(st.session_state['question_id'], "채점기준")
-                        st.session_state.model_answer = grader.get_document_content(st.session_state['question_id'], "모범답안")
-                        st.session_state.purpose = grader.get_document_content(st.session_state['question_id'], "출제의도")
-                        correction_result = grader.grade_essay(st.session_state['question_id'], extracted_text)
-                        
-                        display_correction_with_diff(extracted_text, st.session_state.model_answer, correction_result)
+                        question_docs = grader.get_question_documents(st.session_state['question_id'])
+                        st.session_state.grading_criteria = question_docs["채점기준"]
+                        st.session_state.model_answer = question_docs["모범답안"]
+                        st.session_state.purpose = question_docs["출제의도"]
+                        display_correction_stream(
+                            extracted_text,
+                            st.session_state.model_answer,
+                            grader.stream_grade_essay(st.session_state['question_id'], extracted_text)
+                        )
                     else:
                         st.info("텍스트 추출 결과가 없어 GPT 첨삭을 실행할 수 없습니다.")
 
     # 챗봇 섹션
+    # 세션마다 대화 기억(요약 + 최근 턴)을 하나씩 둡니다.
+    if "chat_memory" not in st.session_state:
+        st.session_state.chat_memory = grader.new_chat_memory()
+    chat_memory = st.session_state.chat_memory
     st.markdown("---")
     st.markdown("## 💬 GPT 챗봇과 대화해보세요")
     chat_input = st.text_input("질문을 입력하세요:", key="chat_input")
 
     if st.button("질문하기", key="chat_button") and chat_input:
         with st.spinner("답변 생성 중..."):
-            gpt_response = grader.mento_chat(st.session_state.grading_criteria, st.session_state.model_answer, st.session_state.extracted_text, chat_input, st.session_state.chat_history)
+            gpt_response = grader.mento_chat(st.session_state.grading_criteria, st.session_state.model_answer, st.session_state.extracted_text, chat_input, st.session_state.chat_history, memory=chat_memory, answer_index=st.session_state.get("answer_index"))
             st.session_state.chat_history.append({"user": chat_input, "assistant": gpt_response})
     st.markdown("---")
     st.subheader("🧠 내 답변 기반 Q&A 챗봇")
@@ -400,12 +483,19 @@ def render_grading():
                 st.session_state.model_answer,
                 st.session_state.extracted_text,
                 user_q,
-                st.session_state.chat_history
+                st.session_state.chat_history,
+                memory=chat_memory,
+                answer_index=st.session_state.get("answer_index")
             )
             st.session_state.chat_history.append({"user": user_q, "assistant": gpt_response})
 
         st.session_state["faq_clicked"] = ""
 
+    # 자주 묻는 질문/반복 질문이 LLM 호출 없이 캐시에서 처리된 비율
+    cache_stats = grader.response_cache_stats()
+    if cache_stats:
+        st.caption(f"답변 캐시 적중률 {cache_stats['hit_rate']:.0%} (적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회, 저장 {cache_stats['entries']}개)")
+
     for i, turn in enumerate(st.session_state.chat_history[::-1]):
         st.markdown(f"**👤 질문:** {turn['user']}")
         st.markdown(f"**🤖 GPT:**\n{turn['assistant']}")
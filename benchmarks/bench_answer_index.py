@@ -0,0 +1,62 @@
+# benchmarks/bench_answer_index.py
+# 멘토 챗봇 프롬프트에 학생 답안 전체를 넣는 경우와 문장 색인으로 관련 문장만 넣는 경우를 비교합니다.
+#   전체 답안 : 답안 길이만큼 프롬프트가 커짐
+#   문장 색인 : 답안 문장을 한 번만 임베딩해 두고, 질문마다 top-k 문장 + 채점 기준 발췌만 넣음
+# 실행: python benchmarks/bench_answer_index.py [--sentences 20 80 200] [--questions 20]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+from chat_memory import count_tokens
+from essay_grader import EssayGrader
+
+QUESTION_ID = "ajou_2023_1"
+SENTENCE_TEMPLATES = [
+    "정체성은 공동체를 유지하는 힘이며 구성원을 하나로 묶는 역할을 한다({i}).",
+    "그러나 변화하지 않는 정체성은 새로운 생각을 받아들이지 못하게 하여 발전을 막는다({i}).",
+    "제시문 (가)는 전통의 계승을, 제시문 (나)는 변화의 필요성을 강조한다({i}).",
+    "예를 들어 한 지역 공동체가 외부 문화를 거부하면 구성원의 삶은 오히려 어려워질 수 있다({i}).",
+]
+
+
+def make_answer(n_sentences):
+    # OCR 결과처럼 줄 중간에서 끊긴 답안을 흉내 냅니다.
+    text = " ".join(SENTENCE_TEMPLATES[i % len(SENTENCE_TEMPLATES)].format(i=i) for i in range(n_sentences))
+    return "\n".join(text[pos:pos + 40] for pos in range(0, len(text), 40))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[20, 80, 200])
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    grader = EssayGrader(llm=SleepyChatModel(), embedding_model=make_fake_embeddings())
+    docs = grader.get_question_documents(QUESTION_ID)
+    questions = [f"{i + 1}번째 질문: 제 결론이 제시문 비교와 잘 이어지나요?" for i in range(args.questions)]
+
+    print(f"\n질문 {args.questions}개, 프롬프트(요청 메시지) 토큰 수와 질문당 준비 시간")
+    print(f"{'답안 문장 수':>10}{'답안 토큰':>10}{'색인 생성(ms)':>15}{'질문당(ms)':>12}{'색인 프롬프트 토큰':>20}")
+    for n_sentences in args.sentences:
+        answer = make_answer(n_sentences)
+        start = time.perf_counter()
+        answer_index = grader.build_answer_index(answer)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        prompts = [grader._build_mento_messages(docs["채점기준"], docs["모범답안"], answer, q, [], None, answer_index)[-1]["content"]
+                   for q in questions]
+        per_question_ms = (time.perf_counter() - start) / len(questions) * 1000
+        prompt_tokens = max(count_tokens(p) for p in prompts)
+        print(f"{len(answer_index):>10}{count_tokens(answer):>10}{build_ms:>15.2f}{per_question_ms:>12.2f}{prompt_tokens:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_async_grading.py
+# 지연 시간이 있는 가짜 LLM으로 grade_essay(동기, 순차)와 agrade_essay(비동기, 동시) 처리량을 비교합니다.
+# 실행: python benchmarks/bench_async_grading.py [동시 첨삭 수] [LLM 지연(초)]
+
+import asyncio
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+from essay_grader import EssayGrader
+
+QUESTION_ID = "ajou_2023_1"
+STUDENT_ANSWER = "정체성은 공동체를 유지하는 힘이다. 그러나 변화하지 않는 정체성은 발전을 막는다."
+
+
+async def run_async(grader, n_requests):
+    return await asyncio.gather(*[
+        grader.agrade_essay(QUESTION_ID, STUDENT_ANSWER) for _ in range(n_requests)
+    ])
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    grader = EssayGrader(llm=SleepyChatModel(delay=delay), embedding_model=make_fake_embeddings(), response_cache=False)
+
+    # 순차 처리는 오래 걸리므로 일부만 실행해 요청당 시간을 구합니다.
+    n_sequential = min(n_requests, 10)
+    start = time.perf_counter()
+    for _ in range(n_sequential):
+        grader.grade_essay(QUESTION_ID, STUDENT_ANSWER)
+    sequential_per_request = (time.perf_counter() - start) / n_sequential
+
+    start = time.perf_counter()
+    results = asyncio.run(run_async(grader, n_requests))
+    async_elapsed = time.perf_counter() - start
+
+    print("\n--- 비동기 첨삭 부하 테스트 ---")
+    print(f"LLM 지연: {delay:.2f}s, 동시 첨삭 수: {n_requests}")
+    print(f"동기 grade_essay  : 요청당 {sequential_per_request:.3f}s -> {n_requests}건 예상 {sequential_per_request * n_requests:.1f}s")
+    print(f"비동기 agrade_essay: {n_requests}건 {async_elapsed:.2f}s ({len(results) / async_elapsed:.1f} req/s)")
+    print(f"처리량 향상: x{sequential_per_request * n_requests / async_elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_bulk_embedding.py
+# 전처리 문서를 복제해 만든 합성 코퍼스로 워커 수(1..N)별 인덱스 생성 처리량(texts/sec)을 잽니다.
+# 기본은 실제 ko-sbert 모델을 사용하고, --fake를 주면 텍스트당 지연이 있는 가짜 임베딩으로 오프라인 실행합니다.
+# 실행: python benchmarks/bench_bulk_embedding.py [--fake] [--copies 20] [--max-workers 4]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from bulk_embedder import BULK_BATCH_SIZE, build_faiss_index_bulk, load_sbert_model
+from essay_grader import DOCUMENT_CACHE_PATH, EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS
+from index_maintenance import load_documents
+
+
+class SlowFakeEmbeddings(DeterministicFakeEmbedding):
+    # 배치 하나를 인코딩하는 데 드는 CPU 시간을 흉내 냅니다 (sleep이 아니라 실제로 코어를 점유).
+    seconds_per_text: float = 0.005
+
+    def embed_documents(self, texts):
+        deadline = time.perf_counter() + self.seconds_per_text * len(texts)
+        while time.perf_counter() < deadline:
+            pass
+        return super().embed_documents(texts)
+
+
+def make_fake_model(size):
+    return SlowFakeEmbeddings(size=size)
+
+
+def synthetic_corpus(documents, copies):
+    corpus = []
+    for copy in range(copies):
+        for doc in documents:
+            metadata = {**doc.metadata, "question_id": f"{doc.metadata.get('question_id')}#{copy}"}
+            corpus.append(Document(page_content=f"{doc.page_content} ({copy})", metadata=metadata))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fake", action="store_true", help="가짜 임베딩 모델 사용 (오프라인)")
+    parser.add_argument("--copies", type=int, default=20, help="전처리 문서를 몇 번 복제할지")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    documents = synthetic_corpus(load_documents(DOCUMENT_CACHE_PATH), args.copies)
+    if args.fake:
+        factory, factory_args = make_fake_model, (768,)
+    else:
+        factory, factory_args = load_sbert_model, (EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS, BULK_BATCH_SIZE)
+    in_process_model = factory(*factory_args)
+
+    print(f"\n합성 코퍼스 {len(documents)}개 문서, CPU {os.cpu_count()}개")
+    baseline = None
+    for n_workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        vector_db = build_faiss_index_bulk(
+            documents, in_process_model, n_workers=n_workers,
+            model_factory=factory, factory_args=factory_args,
+        )
+        elapsed = time.perf_counter() - start
+        assert vector_db.index.ntotal == len(documents)
+        throughput = len(documents) / elapsed
+        baseline = baseline or throughput
+        # 워커 수가 2 이상이면 워커 프로세스의 모델 로딩 시간도 포함됩니다.
+        print(f"workers={n_workers}: {elapsed:.2f}s, {throughput:.1f} texts/sec (x{throughput / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
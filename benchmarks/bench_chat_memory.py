@@ -0,0 +1,85 @@
+# benchmarks/bench_chat_memory.py
+# 50턴 멘토 챗봇 세션에서 턴마다 보내는 프롬프트 토큰 수와 응답 지연을 비교합니다.
+#   전체 기록 : 이전 대화를 전부 그대로 보내는 기존 방식
+#   예산 기억 : 최근 턴 + 백그라운드 요약 (ConversationMemory 기본 설정)
+# 가짜 LLM은 프롬프트 토큰 수에 비례해 지연됩니다 (기본 1000토큰당 0.1초).
+# 실행: python benchmarks/bench_chat_memory.py [--turns 50] [--seconds-per-1k-tokens 0.1]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+from chat_memory import ConversationMemory, count_message_tokens, count_tokens
+from essay_grader import EssayGrader
+
+QUESTION_ID = "ajou_2023_1"
+STUDENT_ANSWER = "정체성은 공동체를 유지하는 힘이다. 그러나 변화하지 않는 정체성은 발전을 막는다."
+QUESTIONS = [
+    "내 주장의 논리 전개가 괜찮은가요?",
+    "더 설득력 있게 쓰려면 어떤 표현을 쓰면 좋을까요?",
+    "결론 부분을 어떻게 보완할 수 있을까요?",
+    "예시가 부족한가요?",
+    "문장이 너무 평범한가요? 인상 깊게 고치는 방법은?",
+]
+
+
+class TokenLatencyChatModel(SleepyChatModel):
+    """프롬프트 토큰 수에 비례해 지연되는 가짜 채팅 모델"""
+
+    seconds_per_1k_tokens: float = 0.1
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt_tokens = sum(count_tokens(m.content) for m in messages)
+        time.sleep(prompt_tokens / 1000 * self.seconds_per_1k_tokens)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+
+def run_session(grader, memory, turns):
+    history, prompt_tokens, latencies = [], [], []
+    docs = grader.get_question_documents(QUESTION_ID)
+    for turn in range(turns):
+        question = f"{QUESTIONS[turn % len(QUESTIONS)]} ({turn + 1}번째 질문)"
+        messages = grader._build_mento_messages(docs["채점기준"], docs["모범답안"], STUDENT_ANSWER, question, history, memory)
+        prompt_tokens.append(count_message_tokens(messages))
+        start = time.perf_counter()
+        answer = grader.mento_chat(docs["채점기준"], docs["모범답안"], STUDENT_ANSWER, question, history, memory=memory)
+        latencies.append(time.perf_counter() - start)
+        history.append({"user": question, "assistant": answer})
+        # 학생이 답변을 읽는 동안 백그라운드 요약이 끝난다고 가정합니다.
+        memory.wait()
+    return prompt_tokens, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.1)
+    args = parser.parse_args()
+
+    llm = TokenLatencyChatModel(seconds_per_1k_tokens=args.seconds_per_1k_tokens)
+    grader = EssayGrader(llm=llm, embedding_model=make_fake_embeddings(), response_cache=False)
+    sessions = {
+        "전체 기록": ConversationMemory(llm, grader._summary_executor, recent_turns=10 ** 6, token_budget=10 ** 9),
+        "예산 기억": grader.new_chat_memory(),
+    }
+    results = {name: run_session(grader, memory, args.turns) for name, memory in sessions.items()}
+
+    checkpoints = sorted({1, 10, 20, 30, 40, args.turns} & set(range(1, args.turns + 1)))
+    print(f"\n{args.turns}턴 세션, 가짜 LLM 지연 {args.seconds_per_1k_tokens}s / 1k 프롬프트 토큰")
+    print(f"{'방식':<10}" + "".join(f"{f'{t}턴 토큰':>12}" for t in checkpoints) + f"{'총 토큰':>12}{'평균 지연(s)':>14}{'마지막 지연(s)':>16}")
+    for name, (tokens, latencies) in results.items():
+        print(f"{name:<10}" + "".join(f"{tokens[t - 1]:>12}" for t in checkpoints)
+              + f"{sum(tokens):>12}{sum(latencies) / len(latencies):>14.3f}{latencies[-1]:>16.3f}")
+    print(f"예산 기억 요약 길이: {count_tokens(sessions['예산 기억'].summary)} 토큰, 요약된 턴 {sessions['예산 기억'].summarized_turns}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_document_index.py
+# 문서 수를 100k까지 늘려가며 기존 docstore 선형 탐색과 DocumentIndex 조회 시간을 비교합니다.
+# 실행: python benchmarks/bench_document_index.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+from document_index import DocumentIndex
+
+SOURCE_TYPES = ("출제의도", "채점기준", "모범답안")
+CORPUS_SIZES = (1_000, 10_000, 100_000)
+LOOKUPS = 300
+
+
+def make_docstore_dict(n_documents):
+    docs = {}
+    for i in range(n_documents):
+        question_no, source_type = divmod(i, len(SOURCE_TYPES))
+        university = f"univ{question_no % 50}"
+        year = str(2000 + question_no % 25)
+        docs[f"doc-{i}"] = Document(
+            page_content=f"본문 {i}",
+            metadata={
+                "question_id": f"{university}_{year}_{question_no}",
+                "university": university,
+                "year": year,
+                "number": str(question_no),
+                "source_type": SOURCE_TYPES[source_type],
+            },
+        )
+    return docs
+
+
+def linear_lookup(docstore_dict, question_id, source_type):
+    for doc in docstore_dict.values():
+        if doc.metadata.get("question_id") == question_id and doc.metadata.get("source_type") == source_type:
+            return doc.page_content
+    return None
+
+
+def time_per_call(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    print(f"{'문서 수':>10} | {'인덱스 생성(ms)':>15} | {'선형 탐색(us)':>14} | {'인덱스 조회(us)':>15} | {'문항 일괄 조회(us)':>18}")
+    for n_documents in CORPUS_SIZES:
+        docstore_dict = make_docstore_dict(n_documents)
+        # 뒤쪽 문항일수록 선형 탐색이 오래 걸리므로 전체 구간에서 고르게 질의합니다.
+        step = max(1, n_documents // LOOKUPS)
+        queries = [
+            (doc.metadata["question_id"], doc.metadata["source_type"])
+            for doc in list(docstore_dict.values())[::step][:LOOKUPS]
+        ]
+
+        start = time.perf_counter()
+        index = DocumentIndex(docstore_dict.items())
+        build_ms = (time.perf_counter() - start) * 1000
+
+        linear_us = time_per_call(lambda q, s: linear_lookup(docstore_dict, q, s), queries) * 1e6
+        index_us = time_per_call(index.get, queries) * 1e6
+        bulk_us = time_per_call(lambda q, s: index.get_question(q), queries) * 1e6
+        print(f"{n_documents:>10} | {build_ms:>15.1f} | {linear_us:>14.1f} | {index_us:>15.2f} | {bulk_us:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_embedding_cache.py
+# 빈 캐시(cold)와 채워진 캐시(warm)로 전체 FAISS 인덱스를 다시 만드는 시간을 비교합니다.
+# 기본은 실제 ko-sbert 모델을 사용하고, --fake를 주면 텍스트당 지연이 있는 가짜 임베딩으로 오프라인 실행합니다.
+# 실행: python benchmarks/bench_embedding_cache.py [--fake]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from embedding_cache import CachedEmbeddings, EmbeddingCache
+from essay_grader import DOCUMENT_CACHE_PATH, EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS, load_embedding_model
+from index_maintenance import build_index, load_documents
+
+
+class SlowFakeEmbeddings(DeterministicFakeEmbedding):
+    # CPU에서 ko-sbert가 문서 하나를 인코딩하는 데 걸리는 시간을 흉내 냅니다.
+    delay_per_text: float = 0.02
+
+    def embed_documents(self, texts):
+        time.sleep(self.delay_per_text * len(texts))
+        return super().embed_documents(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fake", action="store_true", help="가짜 임베딩 모델 사용 (오프라인)")
+    args = parser.parse_args()
+
+    documents = load_documents(DOCUMENT_CACHE_PATH)
+    base_model = SlowFakeEmbeddings(size=768) if args.fake else load_embedding_model(use_cache=False)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(cache_dir, EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS)
+        embeddings = CachedEmbeddings(base_model, cache)
+        timings = {}
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            build_index(documents, embeddings)
+            timings[label] = time.perf_counter() - start
+
+    print(f"\n문서 {len(documents)}개 전체 인덱스 재생성")
+    print(f"cold cache: {timings['cold']:.2f}s")
+    print(f"warm cache: {timings['warm']:.2f}s (x{timings['cold'] / timings['warm']:.1f})")
+    print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_filtered_retrieval.py
+# 대학/연도/유형으로 범위를 좁힌 의미 검색을 두 방식으로 비교합니다.
+#   post-filter : 전체에서 fetch_k개를 뽑은 뒤 메타데이터로 거르기 (LangChain FAISS filter= 기본 동작)
+#   pre-filter  : 메타데이터 역색인으로 후보를 먼저 고른 뒤 후보만 점수 매기기 (FilteredSearcher)
+# 임베딩 모델 없이 저장된 index.faiss 벡터와 전처리 문서를 연도별로 복제해 합성 코퍼스를 만듭니다.
+# 실행: python benchmarks/bench_filtered_retrieval.py [--copies 50] [--queries 200] [--index-type flat]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from benchmarks.fakes import make_fake_embeddings
+from data_preprocessor import document_id_of
+from document_index import DocumentIndex
+from document_store import load_vector_store
+from essay_grader import FAISS_INDEX_DIR
+from filtered_retrieval import FilteredSearcher
+from index_factory import build_ann_index, reconstruct_vectors
+
+
+def synthetic_store(copies, index_type, rng):
+    stored = load_vector_store(FAISS_INDEX_DIR, make_fake_embeddings())
+    base = reconstruct_vectors(stored.index)
+    base_docs = [stored.docstore.search(stored.index_to_docstore_id[pos]) for pos in range(len(base))]
+
+    documents, vectors = [], []
+    for copy in range(copies):
+        noise = rng.normal(scale=0.05, size=base.shape).astype(np.float32)
+        copy_vectors = base + noise
+        vectors.append(copy_vectors / np.linalg.norm(copy_vectors, axis=1, keepdims=True))
+        for doc in base_docs:
+            # 복제본마다 다른 연도를 붙여 여러 해의 기출이 쌓인 상황을 흉내 냅니다.
+            metadata = {**doc.metadata, "year": str(2000 + copy), "question_id": f"{doc.metadata['question_id']}#{copy}"}
+            documents.append(Document(page_content=doc.page_content, metadata=metadata))
+    vectors = np.concatenate(vectors)
+
+    ids = [document_id_of(doc) for doc in documents]
+    vector_db = FAISS(
+        embedding_function=make_fake_embeddings(),
+        index=build_ann_index(vectors, {"index_type": index_type}),
+        docstore=InMemoryDocstore(dict(zip(ids, documents))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+    return vector_db, vectors, base, documents
+
+
+def exact_top_k(vectors, documents, query, k, filters):
+    mask = np.array([all(doc.metadata.get(f) == v for f, v in filters.items()) for doc in documents])
+    positions = np.flatnonzero(mask)
+    distances = ((vectors[positions] - query) ** 2).sum(axis=1)
+    return [document_id_of(documents[pos]) for pos in positions[np.argsort(distances)[:k]]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=50, help="전처리 문서를 몇 해 분량으로 복제할지")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--index-type", default="flat")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vector_db, vectors, base, documents = synthetic_store(args.copies, args.index_type, rng)
+    searcher = FilteredSearcher(vector_db, DocumentIndex.from_docstore(vector_db.docstore))
+    universities = sorted({doc.metadata["university"] for doc in documents})
+
+    scopes = {
+        "university": lambda: {"university": rng.choice(universities)},
+        "university+year": lambda: {"university": rng.choice(universities), "year": str(2000 + rng.integers(args.copies))},
+        "source_type+year": lambda: {"source_type": "채점기준", "year": str(2000 + rng.integers(args.copies))},
+    }
+    print(f"\n합성 코퍼스 {len(documents)}개 문서 ({args.index_type}), 질의 {args.queries}개, k={args.k}")
+    print(f"{'범위':<18}{'방식':<13}{'지연(ms)':>10}{'recall':>8}{'k개 미만':>10}")
+    for scope, make_filters in scopes.items():
+        cases = []
+        for _ in range(args.queries):
+            query = base[rng.integers(len(base))] + rng.normal(scale=0.05, size=base.shape[1]).astype(np.float32)
+            filters = make_filters()
+            cases.append((query, filters, exact_top_k(vectors, documents, query, args.k, filters)))
+
+        methods = {
+            "post-filter": lambda q, f: vector_db.similarity_search_with_score_by_vector(q.tolist(), k=args.k, filter=f),
+            "pre-filter": lambda q, f: searcher.search_by_vector(q, k=args.k, **f),
+        }
+        for name, search in methods.items():
+            recalls, short = [], 0
+            start = time.perf_counter()
+            results = [search(query, filters) for query, filters, _ in cases]
+            elapsed_ms = (time.perf_counter() - start) / len(cases) * 1000
+            for found, (_, _, truth) in zip(results, cases):
+                found_ids = {document_id_of(doc) for doc, _ in found}
+                recalls.append(len(found_ids & set(truth)) / len(truth))
+                short += len(found) < len(truth)
+            print(f"{scope:<18}{name:<13}{elapsed_ms:>10.3f}{np.mean(recalls):>8.3f}{short:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_index_types.py
+# flat 인덱스를 정답으로 삼아 IVF-Flat / IVF-PQ / HNSW 인덱스의 recall@k와 질의 지연 시간을 비교합니다.
+# 임베딩 모델 없이 저장된 index.faiss의 ko-sbert 벡터 주변에 잡음을 더해 큰 합성 코퍼스를 만듭니다.
+# 실행: python benchmarks/bench_index_types.py [--size 20000] [--queries 200] [--k 4]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+import faiss
+import numpy as np
+from essay_grader import FAISS_INDEX_DIR
+from index_factory import build_ann_index, reconstruct_vectors, set_search_params
+
+# (설정, 바꿔 가며 잴 검색 파라미터 이름, 값 목록)
+SWEEPS = [
+    ({"index_type": "ivf_flat"}, "nprobe", (1, 4, 8, 16, 32)),
+    ({"index_type": "ivf_pq"}, "nprobe", (1, 4, 8, 16, 32)),
+    ({"index_type": "hnsw"}, "ef_search", (16, 32, 64, 128)),
+]
+
+
+def synthetic_vectors(base, n, noise, rng):
+    picks = base[rng.integers(0, len(base), size=n)]
+    vectors = picks + rng.normal(scale=noise, size=picks.shape).astype(np.float32)
+    # 인덱스의 벡터는 정규화된 ko-sbert 임베딩이므로 합성 벡터도 정규화합니다.
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def timed_search(index, queries, k):
+    # 실제 검색기처럼 질의를 하나씩 보냅니다.
+    labels = np.empty((len(queries), k), dtype=np.int64)
+    start = time.perf_counter()
+    for i, query in enumerate(queries):
+        _, labels[i] = index.search(query[None, :], k)
+    return labels, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def recall_at_k(labels, truth):
+    return np.mean([len(set(found) & set(expected)) / len(expected) for found, expected in zip(labels, truth)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20000, help="합성 코퍼스 벡터 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--noise", type=float, default=0.05, help="기준 벡터에 더할 잡음 크기")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = reconstruct_vectors(faiss.read_index(os.path.join(FAISS_INDEX_DIR, "index.faiss")))
+    corpus = synthetic_vectors(base, args.size, args.noise, rng)
+    queries = synthetic_vectors(base, args.queries, args.noise, rng)
+
+    flat = build_ann_index(corpus, {"index_type": "flat"})
+    truth, flat_ms = timed_search(flat, queries, args.k)
+    print(f"\n합성 코퍼스 {args.size}개 x {corpus.shape[1]}차원, 질의 {args.queries}개, recall@{args.k}")
+    print(f"{'인덱스':<24}{'크기(MB)':>10}{'학습+추가(s)':>14}{'지연(ms)':>10}{'recall':>8}")
+    print(f"{'flat':<24}{len(faiss.serialize_index(flat)) / 1e6:>10.1f}{'-':>14}{flat_ms:>10.3f}{1.0:>8.3f}")
+
+    for config, param, values in SWEEPS:
+        start = time.perf_counter()
+        index = build_ann_index(corpus, config)
+        build_s = time.perf_counter() - start
+        size_mb = len(faiss.serialize_index(index)) / 1e6
+        for value in values:
+            set_search_params(index, **{param: value})
+            labels, ms = timed_search(index, queries, args.k)
+            label = f"{config['index_type']} {param}={value}"
+            print(f"{label:<24}{size_mb:>10.1f}{build_s:>14.2f}{ms:>10.3f}{recall_at_k(labels, truth):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
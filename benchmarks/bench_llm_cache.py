@@ -0,0 +1,77 @@
+# benchmarks/bench_llm_cache.py
+# 여러 Streamlit 세션이 같은 답안으로 '자주 묻는 질문' 버튼 5개를 누르고 같은 첨삭을 다시 요청하는 상황에서
+# LLM 응답 캐시(메모리 LRU / SQLite)가 있을 때와 없을 때의 지연 시간과 적중률을 비교합니다.
+# 실행: python benchmarks/bench_llm_cache.py [--sessions 10] [--delay 0.5]
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+from essay_grader import EssayGrader
+from llm_cache import LLMResponseCache, MemoryResponseStore, SQLiteResponseStore
+
+QUESTION_ID = "ajou_2023_1"
+STUDENT_ANSWER = "정체성은 공동체를 유지하는 힘이다. 그러나 변화하지 않는 정체성은 발전을 막는다."
+FAQ_QUESTIONS = [
+    "내 주장의 논리 전개가 괜찮은가요?",
+    "더 설득력 있게 쓰려면 어떤 표현을 쓰면 좋을까요?",
+    "결론 부분을 어떻게 보완할 수 있을까요?",
+    "예시가 부족한가요?",
+    "문장이 너무 평범한가요? 인상 깊게 고치는 방법은?",
+]
+
+
+def run_sessions(grader, n_sessions):
+    docs = grader.get_question_documents(QUESTION_ID)
+    answer_index = grader.build_answer_index(STUDENT_ANSWER)
+    chat_latencies, grade_latencies = [], []
+    for _ in range(n_sessions):
+        # 세션마다 첨삭(스트리밍) 한 번 + 새 대화에서 FAQ 버튼 하나씩
+        start = time.perf_counter()
+        "".join(grader.stream_grade_essay(QUESTION_ID, STUDENT_ANSWER))
+        grade_latencies.append(time.perf_counter() - start)
+        for question in FAQ_QUESTIONS:
+            start = time.perf_counter()
+            grader.mento_chat(docs["채점기준"], docs["모범답안"], STUDENT_ANSWER, question, [], answer_index=answer_index)
+            chat_latencies.append(time.perf_counter() - start)
+    # 비동기 경로도 같은 캐시를 쓰는지 확인합니다.
+    asyncio.run(grader.agrade_essay(QUESTION_ID, STUDENT_ANSWER))
+    return chat_latencies, grade_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.5, help="가짜 LLM 응답 지연(초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        caches = {
+            "캐시 없음": False,
+            "메모리 LRU": LLMResponseCache(MemoryResponseStore()),
+            "SQLite": LLMResponseCache(SQLiteResponseStore(os.path.join(tmp_dir, "responses.sqlite3"))),
+        }
+        print(f"\n세션 {args.sessions}개 x (스트리밍 첨삭 1회 + FAQ {len(FAQ_QUESTIONS)}개), 가짜 LLM 지연 {args.delay}s")
+        print(f"{'캐시':<12}{'FAQ 평균(ms)':>14}{'FAQ 적중 시(ms)':>16}{'첨삭 평균(ms)':>14}{'총 시간(s)':>12}{'적중률':>8}")
+        for name, cache in caches.items():
+            grader = EssayGrader(llm=SleepyChatModel(delay=args.delay), embedding_model=make_fake_embeddings(deterministic=True), response_cache=cache)
+            start = time.perf_counter()
+            chat_latencies, grade_latencies = run_sessions(grader, args.sessions)
+            total = time.perf_counter() - start
+            # 첫 세션 이후의 FAQ 호출은 모두 캐시 적중이어야 합니다.
+            repeat = chat_latencies[len(FAQ_QUESTIONS):] or chat_latencies
+            stats = grader.response_cache_stats()
+            print(f"{name:<12}{sum(chat_latencies) / len(chat_latencies) * 1000:>14.1f}{sum(repeat) / len(repeat) * 1000:>16.2f}"
+                  f"{sum(grade_latencies) / len(grade_latencies) * 1000:>14.1f}{total:>12.2f}{stats.get('hit_rate', 0.0):>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_llm_gateway.py
+# 로컬 스텁 서버(지연 + 429/5xx 오류 주입)에 동시 요청을 보내 두 방식을 비교합니다.
+#   기존       : 호출마다 ChatOpenAI를 새로 만들고 재시도 없음 (예전 mento_chat 방식)
+#   게이트웨이 : llm_gateway 공용 연결 풀 + 지터 백오프 재시도 + 모델별 동시 요청 제한
+# 실행: python benchmarks/bench_llm_gateway.py [--requests 48] [--threads 16] [--error-rate 0.25] [--cap 4]
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+import numpy as np
+from langchain_openai import ChatOpenAI
+from benchmarks.stub_llm_server import StubLLMServer
+from llm_gateway import LLMGateway
+
+MODEL = "gpt-4o-mini"
+MESSAGES = [{"role": "user", "content": "내 주장의 논리 전개가 괜찮은가요?"}]
+
+
+def run_threads(call, n_requests, n_threads):
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            call()
+            return True, time.perf_counter() - start
+        except Exception:
+            return False, time.perf_counter() - start
+
+    with ThreadPoolExecutor(n_threads) as pool:
+        return list(pool.map(timed, range(n_requests)))
+
+
+def report(name, results, stub, elapsed, gateway=None):
+    ok = [latency for success, latency in results if success]
+    p50, p95 = (np.percentile(ok, 50), np.percentile(ok, 95)) if ok else (float("nan"), float("nan"))
+    retries = gateway.stats()["retries"] if gateway else 0
+    print(f"{name:<22}{len(ok):>6}/{len(results):<4}{p50:>9.2f}{p95:>9.2f}{elapsed:>9.2f}"
+          f"{stub.requests:>9}{retries:>8}{len(stub.connections):>8}{stub.peak_in_flight:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=48)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.25)
+    parser.add_argument("--cap", type=int, default=4, help="게이트웨이의 모델별 동시 요청 상한")
+    args = parser.parse_args()
+
+    print(f"\n요청 {args.requests}개, 스레드 {args.threads}개, 스텁 지연 {args.latency}s, 오류율 {args.error_rate:.0%}, 동시 요청 상한 {args.cap}")
+    print(f"{'방식':<22}{'성공':>11}{'p50(s)':>9}{'p95(s)':>9}{'총(s)':>9}{'HTTP요청':>9}{'재시도':>8}{'TCP연결':>8}{'최대동시':>8}")
+
+    stub = StubLLMServer(latency=args.latency, error_rate=args.error_rate, retry_after=None).start()
+    try:
+        start = time.perf_counter()
+        results = run_threads(
+            lambda: ChatOpenAI(model=MODEL, base_url=stub.base_url, api_key="stub", max_retries=0).invoke(MESSAGES),
+            args.requests, args.threads,
+        )
+        report("기존 (호출마다 생성)", results, stub, time.perf_counter() - start)
+
+        config = {"base_url": stub.base_url, "api_key": "stub", "model_concurrency": {MODEL: args.cap},
+                  "backoff_base": 0.05, "backoff_max": 1.0}
+        gateway = LLMGateway(config)
+        llm = gateway.chat_model(MODEL)
+        stub.reset_counters()
+        start = time.perf_counter()
+        results = run_threads(lambda: llm.invoke(MESSAGES), args.requests, args.threads)
+        report("게이트웨이 (동기)", results, stub, time.perf_counter() - start, gateway)
+
+        gateway = LLMGateway(config)
+        llm = gateway.chat_model(MODEL)
+        stub.reset_counters()
+
+        async def run_async():
+            async def timed():
+                started = time.perf_counter()
+                try:
+                    await llm.ainvoke(MESSAGES)
+                    return True, time.perf_counter() - started
+                except Exception:
+                    return False, time.perf_counter() - started
+            return await asyncio.gather(*[timed() for _ in range(args.requests)])
+
+        start = time.perf_counter()
+        results = asyncio.run(run_async())
+        report("게이트웨이 (비동기)", results, stub, time.perf_counter() - start, gateway)
+
+        gateway = LLMGateway(config)
+        llm = gateway.chat_model(MODEL)
+        stub.reset_counters()
+        start = time.perf_counter()
+        results = run_threads(lambda: "".join(chunk.content for chunk in llm.stream(MESSAGES)), args.requests, args.threads)
+        report("게이트웨이 (스트리밍)", results, stub, time.perf_counter() - start, gateway)
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_ocr_preprocess.py
+# 전처리 단계 유무에 따른 OCR 지연 시간과 문자 오류율(CER)을 비교합니다. (paddleocr 설치 필요)
+# 픽스처 폴더에 답안 이미지(jpg/png)와 같은 이름의 정답 텍스트(.txt)를 넣어두면 CER도 함께 계산합니다.
+# 기본 픽스처 폴더(benchmarks/fixtures/ocr)가 없으면 run_suite.py처럼 image/image*.png로 지연 시간만 비교합니다.
+# 실행: python benchmarks/bench_ocr_preprocess.py [픽스처 폴더]
+
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from ocr_cache import OCRCache
+from ocr_processor import OCRProcessor
+
+DEFAULT_FIXTURE_DIR = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "ocr")
+FALLBACK_FIXTURE_DIR = os.path.join(ROOT_DIR, "image")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def character_error_rate(reference, hypothesis):
+    # 공백/줄바꿈 차이는 무시하고 글자 단위 편집 거리로 계산합니다.
+    reference = "".join(reference.split())
+    hypothesis = "".join(hypothesis.split())
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_char != hyp_char),
+            ))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def load_fixtures(fixture_dir):
+    fixtures = []
+    for filename in sorted(os.listdir(fixture_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() not in IMAGE_EXTENSIONS:
+            continue
+        if fixture_dir == FALLBACK_FIXTURE_DIR and not filename.startswith("image"):
+            continue  # image/ 폴더의 캐릭터 그림은 답안 사진이 아니므로 뺍니다.
+        with open(os.path.join(fixture_dir, filename), "rb") as f:
+            image_bytes = f.read()
+        truth_path = os.path.join(fixture_dir, f"{stem}.txt")
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, "r", encoding="utf-8") as f:
+                truth = f.read()
+        fixtures.append((filename, image_bytes, truth))
+    return fixtures
+
+
+def run(processor, fixtures):
+    processor.warm_up()  # 모델 로딩 시간은 제외합니다.
+    latencies, errors = [], []
+    for _, image_bytes, truth in fixtures:
+        start = time.perf_counter()
+        text = processor.process_image(image_bytes)
+        latencies.append(time.perf_counter() - start)
+        if truth is not None:
+            errors.append(character_error_rate(truth, text))
+    return latencies, errors
+
+
+def main():
+    if len(sys.argv) > 1:
+        fixture_dir = sys.argv[1]
+    else:
+        fixture_dir = DEFAULT_FIXTURE_DIR if os.path.isdir(DEFAULT_FIXTURE_DIR) else FALLBACK_FIXTURE_DIR
+    if not os.path.isdir(fixture_dir):
+        print(f"[오류] 픽스처 폴더 '{fixture_dir}'를 찾을 수 없습니다.")
+        return
+    fixtures = load_fixtures(fixture_dir)
+    print(f"픽스처 {len(fixtures)}장 (정답 텍스트 {sum(t is not None for _, _, t in fixtures)}개)")
+
+    for name, preprocess in (("전처리 없음", None), ("전처리 사용", {})):
+        # 매번 빈 메모리 캐시를 넘겨 캐시 적중 없이 측정합니다.
+        processor = OCRProcessor(cache=OCRCache(), use_angle_cls=True, preprocess=preprocess, max_workers=0)
+        latencies, errors = run(processor, fixtures)
+        mean_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        cer = f"{sum(errors) / len(errors):.3f}" if errors else "-"
+        print(f"{name}: 평균 {mean_latency:.2f}s / 최대 {max(latencies, default=0.0):.2f}s, CER {cer}")
+
+
+if __name__ == "__main__":
+    main()
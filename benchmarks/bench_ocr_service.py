@@ -0,0 +1,87 @@
+# benchmarks/bench_ocr_service.py
+# PaddleOCR 인스턴스를 두 개 띄우던 기존 방식과 공용 OCR 서비스(지연 로딩)의 시작 시간 / 상주 메모리를 비교합니다.
+# 상주 메모리에는 OCR 워커 프로세스(워커마다 모델 1개)도 합산합니다.
+# 시나리오마다 새 파이썬 프로세스에서 측정합니다. (paddleocr 설치 필요)
+# 실행: python benchmarks/bench_ocr_service.py
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE_PREFIX = """
+import glob, json, os, resource, time
+def _vm_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+def rss_mb():
+    # 현재 프로세스 + 자식(OCR 워커) 프로세스의 상주 메모리 합 (Linux). 다른 OS에서는 최대 상주 메모리로 대신합니다.
+    try:
+        children = set()
+        for path in glob.glob("/proc/self/task/*/children"):
+            with open(path) as f:
+                children.update(f.read().split())
+        return _vm_rss_mb("self") + sum(_vm_rss_mb(pid) for pid in children)
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+start = time.perf_counter()
+"""
+
+SCENARIOS = {
+    # 이전: app.py의 load_ocr()와 OCRProcessor가 각자 PaddleOCR을 만들던 구조
+    "before (PaddleOCR x2)": """
+from paddleocr import PaddleOCR
+import_done = time.perf_counter()
+app_ocr = PaddleOCR(use_angle_cls=True, lang='korean')
+processor_ocr = PaddleOCR(lang="korean")
+""",
+    # 이후: 앱 시작 시에는 서비스 객체만 만들고, 모델은 워커 프로세스마다 하나씩 로딩 (기본 OCR_MAX_WORKERS)
+    "after (ocr_service)": """
+from ocr_service import get_ocr_processor
+processor = get_ocr_processor()
+import_done = time.perf_counter()
+processor.warm_up()
+""",
+    # 워커 풀 없이 메인 프로세스 모델 하나만 쓰는 경우 (메모리 최소)
+    "after (workers=0)": """
+os.environ["OCR_MAX_WORKERS"] = "0"
+from ocr_service import get_ocr_processor
+processor = get_ocr_processor()
+import_done = time.perf_counter()
+processor.warm_up()
+""",
+}
+
+MEASURE_SUFFIX = """
+end = time.perf_counter()
+print(json.dumps({
+    "startup_s": round(import_done - start, 3),
+    "model_load_s": round(end - import_done, 3),
+    "rss_mb": round(rss_mb(), 1),
+}))
+"""
+
+
+def run_scenario(code):
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE_PREFIX + code + MEASURE_SUFFIX],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'시나리오':<24} | {'시작(s)':>8} | {'모델 로딩(s)':>11} | {'RSS(MB)':>8}")
+    for name, code in SCENARIOS.items():
+        result = run_scenario(code)
+        print(f"{name:<24} | {result['startup_s']:>8.3f} | {result['model_load_s']:>11.3f} | {result['rss_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_tracing.py
+# 단계별 측정(tracing)의 오버헤드와 출력 결과를 확인합니다.
+#   꺼짐        : GRADER_TRACE 미설정 (traced 데코레이터가 원래 함수를 그대로 돌려줌)
+#   켜짐(json)  : 요청마다 JSONL 기록 + 히스토그램/카운터 집계
+# 측정은 임포트 시점에 켜고 끄므로 각 설정을 자식 프로세스에서 따로 실행합니다.
+# 마지막으로 log/json/prometheus를 모두 켜고 요청 한 번의 기록과 /metrics 출력 일부를 보여줍니다.
+# 실행: python benchmarks/bench_tracing.py [--calls 2000] [--grades 200]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+QUESTION_ID = "ajou_2023_1"
+STUDENT_ANSWER = "정체성은 공동체를 유지하는 힘이다. 그러나 변화하지 않는 정체성은 발전을 막는다."
+
+
+def make_grader():
+    from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+    from essay_grader import EssayGrader
+    return EssayGrader(llm=SleepyChatModel(), embedding_model=make_fake_embeddings(), response_cache=False)
+
+
+def child(calls, grades):
+    # 표준 출력 마지막 줄에 결과 JSON을 남깁니다.
+    grader = make_grader()
+    from essay_grader import EssayGrader
+    start = time.perf_counter()
+    for _ in range(calls):
+        grader.get_document_content(QUESTION_ID, "채점기준")
+    lookup_us = (time.perf_counter() - start) / calls * 1e6
+    start = time.perf_counter()
+    for _ in range(grades):
+        grader.grade_essay(QUESTION_ID, STUDENT_ANSWER)
+    grade_ms = (time.perf_counter() - start) / grades * 1000
+    print(json.dumps({"lookup_us": lookup_us, "grade_ms": grade_ms, "wrapped": hasattr(EssayGrader.grade_essay, "__wrapped__")}))
+
+
+def run_child(sinks, calls, grades, json_path):
+    env = {**os.environ, "GRADER_TRACE": sinks, "GRADER_TRACE_JSON": json_path}
+    output = subprocess.run([sys.executable, __file__, "--child", "--calls", str(calls), "--grades", str(grades)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def demo(json_path):
+    os.environ.update({"GRADER_TRACE": "log,json,prometheus", "GRADER_TRACE_JSON": json_path, "GRADER_TRACE_PROMETHEUS_PORT": "0"})
+    from urllib.request import urlopen
+    from tracing import tracer
+    grader = make_grader()
+    with tracer.request("grading", question_id=QUESTION_ID):
+        docs = grader.get_question_documents(QUESTION_ID)
+        "".join(grader.stream_grade_essay(QUESTION_ID, STUDENT_ANSWER))
+    grader.mento_chat(docs["채점기준"], docs["모범답안"], STUDENT_ANSWER, "결론을 어떻게 보완할까요?")
+
+    prometheus = next(sink for sink in tracer.sinks if hasattr(sink, "_server"))
+    port = prometheus._server.server_address[1]
+    metrics = urlopen(f"http://127.0.0.1:{port}/metrics").read().decode("utf-8")
+    print("\n/metrics 일부:")
+    for line in metrics.splitlines():
+        if line.startswith(("grader_llm_tokens_total", "grader_requests_total")) or ('le="+Inf"' in line and "request." in line):
+            print("  " + line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--grades", type=int, default=200)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+    if args.child:
+        child(args.calls, args.grades)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "traces.jsonl")
+        results = {"꺼짐": run_child("", args.calls, args.grades, json_path),
+                   "켜짐(json)": run_child("json", args.calls, args.grades, json_path)}
+        with open(json_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+        print(f"\nget_document_content {args.calls}회, grade_essay(가짜 LLM, 지연 0) {args.grades}회")
+        print(f"{'측정':<12}{'조회(µs)':>10}{'첨삭(ms)':>10}{'함수 감쌈':>10}")
+        for name, r in results.items():
+            print(f"{name:<12}{r['lookup_us']:>10.2f}{r['grade_ms']:>10.3f}{str(r['wrapped']):>10}")
+        print(f"JSON 기록 {len(records)}줄, 예: {json.dumps(records[0], ensure_ascii=False)[:200]}...")
+
+        print("\nlog + json + prometheus로 첨삭 요청 1회 + 챗봇 질문 1회:")
+        demo(os.path.join(tmp_dir, "demo.jsonl"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/fakes.py
+# 벤치마크를 오프라인으로 돌리기 위한 가짜 LLM / 임베딩 모델
+
+import asyncio
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, FakeEmbeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+FAKE_CORRECTION = """---
+**[총평]**
+논지는 분명하지만 근거 제시가 부족합니다.
+
+**[잘한 점 (칭찬 포인트) 👍]**
+- 제시문의 핵심 개념을 정확히 요약했습니다.
+
+**[아쉬운 점 (개선 포인트) ✍️]**
+- 결론에서 주장을 다시 정리하지 않았습니다.
+
+**[이렇게 바꿔보세요 (대안 문장 제안) 💡]**
+학생 원문: "정체성은 중요한 것 같다."
+수정 제안: "공동체의 정체성은 구성원의 통합을 이끄는 핵심 동력이다."
+
+**[예상 점수 및 다음 학습 팁 🚀]**
+- 예상 점수: 70점. 제시문 간 비교 기준을 먼저 세우는 연습을 해보세요.
+---"""
+
+
+class SleepyChatModel(BaseChatModel):
+    """고정된 응답을 delay초 뒤에 돌려주는 가짜 채팅 모델 (API 지연 시간 흉내)."""
+
+    response: str = FAKE_CORRECTION
+    delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "sleepy-fake-chat"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+
+def make_fake_embeddings(size=768, deterministic=False):
+    # jhgan/ko-sbert-nli와 같은 768차원. deterministic=True이면 같은 텍스트에 항상 같은 벡터 (프롬프트 재현이 필요한 캐시 벤치마크용)
+    if deterministic:
+        return DeterministicFakeEmbedding(size=size)
+    return FakeEmbeddings(size=size)
+
+
+class FakeOCREngine:
+    """PaddleOCR 대신 쓰는 가짜 OCR 엔진. 이미지 크기와 상관없이 고정된 인식 결과를 돌려줍니다 (디코딩/전처리/캐시 경로 측정용)."""
+
+    def __init__(self, lines=None):
+        self.lines = lines or ["[문제 1]", "정체성은 공동체를 유지하는 힘이다.", "그러나 변화하지 않는 정체성은 발전을 막는다."]
+        self.calls = 0
+
+    def ocr(self, image):
+        self.calls += 1
+        return [{"rec_texts": list(self.lines)}]
@@ -0,0 +1,407 @@
+# benchmarks/run_suite.py
+# OCR → 검색 → 첨삭 핫패스를 네트워크 없이 한 번에 측정하고, 저장된 기준값(benchmarks/baseline.json)과 비교합니다.
+#   ocr        : OCRProcessor.process_image (가짜 OCR 엔진: 캐시 미스 / 전처리 포함 캐시 미스 / 캐시 적중)
+#   faiss      : 저장된 인덱스 로딩, 벡터 검색, 메타데이터 필터 검색
+#   lookup     : get_document_content (문항별 캐시 적중 / 캐시를 비운 뒤 조회)
+#   grade      : grade_essay / stream_grade_essay (가짜 LLM, 지연 0 → LLM을 뺀 체인 오버헤드)
+#   preprocess : data_preprocessor.process_json_data (기존 JSON을 1배/10배/100배로 복제한 합성 코퍼스)
+# 결과는 JSON(benchmarks/results/latest.json)으로 남기고, 기준값보다 median이 tolerance 넘게 느려진 항목이 있으면 종료 코드 1을 돌려줍니다.
+# 실행: python benchmarks/run_suite.py [--only ocr,faiss] [--quick] [--tolerance 0.5] [--update-baseline]
+#       --real-embeddings / --real-ocr : 실제 ko-sbert / PaddleOCR로 측정 (설정이 다른 기준값과는 비교하지 않음)
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+# 단계별 측정(tracing)은 임포트 시점에 켜지므로, 기본 설정(꺼짐) 그대로의 비용을 재도록 먼저 끕니다.
+os.environ["GRADER_TRACE"] = ""
+
+import numpy as np
+
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join(ROOT_DIR, "benchmarks", "results", "latest.json")
+# 답안 사진 픽스처 폴더가 있으면 그것을 (bench_ocr_preprocess와 공용), 없으면 저장소의 image/image*.png를 씁니다.
+OCR_FIXTURE_DIR = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "ocr")
+OCR_FALLBACK_DIR = os.path.join(ROOT_DIR, "image")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+QUESTION_ID = "ajou_2023_1"
+STUDENT_ANSWER = "정체성은 공동체를 유지하는 힘이다. 그러나 변화하지 않는 정체성은 발전을 막는다."
+CORPUS_SCALES = (1, 10, 100)
+SCHEMA_VERSION = 1
+DEFAULT_TOLERANCE = 0.5     # median이 기준값의 (1 + tolerance)배를 넘으면 회귀로 봅니다
+MIN_REGRESSION_MS = 0.002   # 이보다 작은 차이는 측정 잡음으로 보고 무시합니다
+
+
+@contextlib.contextmanager
+def quiet():
+    # 각 모듈의 진행 상황 print가 결과 표를 덮지 않도록 버립니다.
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@contextlib.contextmanager
+def patched(module, **values):
+    # 모듈 상수(경로 등)를 잠시 바꿨다가 되돌립니다.
+    originals = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+def measure(func, repeat, warmup=1, inner=1, setup=None, **extra):
+    """
+    func()의 지연 시간(ms) 요약. inner번 연속 실행한 평균을 한 표본으로 삼아 repeat개를 모읍니다.
+    setup은 표본마다 먼저 부르며 측정에서 제외합니다.
+    """
+    samples = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        elapsed = (time.perf_counter() - start) * 1000 / inner
+        if i >= warmup:
+            samples.append(elapsed)
+    return {
+        "unit": "ms",
+        "median": statistics.median(samples),
+        "p95": float(np.percentile(samples, 95)),
+        "min": min(samples),
+        "samples": len(samples),
+        **extra,
+    }
+
+
+def make_embeddings(real):
+    if real:
+        from essay_grader import load_embedding_model
+        return load_embedding_model()
+    from benchmarks.fakes import make_fake_embeddings
+    return make_fake_embeddings()
+
+
+def load_ocr_fixtures():
+    fixture_dir = OCR_FIXTURE_DIR if os.path.isdir(OCR_FIXTURE_DIR) else OCR_FALLBACK_DIR
+    fixtures = []
+    for filename in sorted(os.listdir(fixture_dir)):
+        if fixture_dir == OCR_FALLBACK_DIR and not filename.startswith("image"):
+            continue  # image/ 폴더의 캐릭터 그림은 답안 사진이 아니므로 뺍니다.
+        if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS:
+            with open(os.path.join(fixture_dir, filename), "rb") as f:
+                fixtures.append((filename, f.read()))
+    return fixtures
+
+
+def bench_ocr(ctx):
+    from image_preprocessor import _preprocess_cached
+    from ocr_cache import OCRCache
+    from ocr_processor import OCRProcessor
+    from benchmarks.fakes import FakeOCREngine
+
+    fixtures = load_ocr_fixtures()
+    ctx.setup["ocr_fixtures"] = [name for name, _ in fixtures]
+    repeat = ctx.repeat(20)
+
+    def make_processor(cache, preprocess=None):
+        # 워커 풀 없이 메인 프로세스에서 디코딩/전처리/캐시 경로만 잽니다.
+        processor = OCRProcessor(cache=cache, preprocess=preprocess, max_workers=0)
+        if not ctx.real_ocr:
+            processor._ocr = FakeOCREngine()
+        with quiet():
+            processor.warm_up()  # 모델 로딩 시간은 제외합니다.
+        return processor
+
+    def per_image(processor, setup=None):
+        def run():
+            for _, image_bytes in fixtures:
+                processor.process_image(image_bytes)
+        result = measure(run, repeat, setup=setup, images=len(fixtures))
+        # 픽스처 한 장당 시간으로 바꿔 기록합니다.
+        return {**result, **{key: result[key] / len(fixtures) for key in ("median", "p95", "min")}}
+
+    # 메모리 캐시 크기 0 → 매번 디코딩 + OCR
+    results = {"ocr.process_image.miss": per_image(make_processor(OCRCache(max_entries=0)))}
+    # 전처리 결과도 바이트 단위로 캐시되므로 표본마다 비웁니다.
+    results["ocr.process_image.miss_preprocess"] = per_image(
+        make_processor(OCRCache(max_entries=0), preprocess={}), setup=_preprocess_cached.cache_clear)
+    results["ocr.process_image.hit"] = per_image(make_processor(OCRCache()))
+    return results
+
+
+def bench_faiss(ctx):
+    from document_index import DocumentIndex
+    from document_store import load_vector_store
+    from essay_grader import FAISS_INDEX_DIR
+    from filtered_retrieval import FilteredSearcher
+    from index_factory import reconstruct_vectors
+
+    results = {"faiss.load": measure(lambda: load_vector_store(FAISS_INDEX_DIR, ctx.embeddings), ctx.repeat(20))}
+    vector_db = load_vector_store(FAISS_INDEX_DIR, ctx.embeddings)
+    searcher = FilteredSearcher(vector_db, DocumentIndex.from_docstore(vector_db.docstore))
+
+    # 저장된 문서 벡터에 잡음을 더한 질의 (임베딩 모델 호출은 빼고 인덱스 검색 + 문서 디코딩만 잽니다)
+    rng = np.random.default_rng(0)
+    base = reconstruct_vectors(vector_db.index)
+    queries = base[rng.integers(len(base), size=64)] + rng.normal(scale=0.05, size=(64, base.shape[1])).astype(np.float32)
+    queries = itertools.cycle(queries / np.linalg.norm(queries, axis=1, keepdims=True))
+    ctx.setup["faiss_vectors"] = int(vector_db.index.ntotal)
+
+    results["faiss.search"] = measure(
+        lambda: vector_db.similarity_search_with_score_by_vector(next(queries), k=4), ctx.repeat(30), inner=20)
+    results["faiss.search_filtered"] = measure(
+        lambda: searcher.search_by_vector(next(queries), k=4, source_type="채점기준"), ctx.repeat(30), inner=20)
+    return results
+
+
+def bench_lookup(ctx):
+    grader = ctx.grader()
+
+    def clear_context_cache():
+        with grader._context_lock:
+            grader._context_cache.clear()
+
+    with quiet():
+        return {
+            "lookup.get_document_content.hit": measure(
+                lambda: grader.get_document_content(QUESTION_ID, "채점기준"), ctx.repeat(30), inner=1000),
+            "lookup.get_document_content.cold": measure(
+                lambda: grader.get_document_content(QUESTION_ID, "채점기준"), ctx.repeat(200), setup=clear_context_cache),
+        }
+
+
+def bench_grade(ctx):
+    grader = ctx.grader()
+    with quiet():
+        return {
+            "grade.grade_essay": measure(lambda: grader.grade_essay(QUESTION_ID, STUDENT_ANSWER), ctx.repeat(50)),
+            "grade.stream_grade_essay": measure(
+                lambda: "".join(grader.stream_grade_essay(QUESTION_ID, STUDENT_ANSWER)), ctx.repeat(50)),
+        }
+
+
+def make_corpus(source_dir, target_dir, scale):
+    # 복제본마다 문항 번호에 접미사를 붙여 question_id(문서 ID)와 파일명이 겹치지 않게 합니다.
+    count = 0
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(source_dir, filename), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        stem = filename[:-len(".json")]
+        question_id = data.get("question_id") or stem
+        for copy in range(scale):
+            suffix = f"-{copy}" if copy else ""
+            with open(os.path.join(target_dir, f"{stem}{suffix}.json"), "w", encoding="utf-8") as f:
+                json.dump({**data, "question_id": f"{question_id}{suffix}"}, f, ensure_ascii=False)
+            count += 1
+    return count
+
+
+def bench_preprocess(ctx):
+    import data_preprocessor
+
+    results = {}
+    for scale in CORPUS_SCALES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_dir = os.path.join(tmp_dir, "json")
+            os.makedirs(json_dir)
+            files = make_corpus(data_preprocessor.JSON_DATA_DIR, json_dir, scale)
+            output_file = os.path.join(tmp_dir, "faiss", "preprocessed_documents.jsonl")
+            os.makedirs(os.path.dirname(output_file))
+            with patched(data_preprocessor, JSON_DATA_DIR=json_dir, OUTPUT_FILE=output_file), quiet():
+                result = measure(data_preprocessor.process_json_data, ctx.repeat(10 if scale < 100 else 3),
+                                 warmup=1 if scale < 100 else 0, files=files)
+        results[f"preprocess.process_json_data.x{scale}"] = result
+    return results
+
+
+CASES = {
+    "ocr": bench_ocr,
+    "faiss": bench_faiss,
+    "lookup": bench_lookup,
+    "grade": bench_grade,
+    "preprocess": bench_preprocess,
+}
+
+
+class SuiteContext:
+    """케이스들이 함께 쓰는 설정과 (필요할 때 한 번만 만드는) 임베딩 모델 / 첨삭기."""
+
+    def __init__(self, quick=False, real_embeddings=False, real_ocr=False):
+        self.quick = quick
+        self.real_ocr = real_ocr
+        self.setup = {
+            "llm": "fake (SleepyChatModel, delay 0)",
+            "embeddings": "ko-sbert" if real_embeddings else "fake",
+            "ocr": "paddleocr" if real_ocr else "fake",
+        }
+        with quiet():
+            self.embeddings = make_embeddings(real_embeddings)
+        self._grader = None
+
+    def repeat(self, n):
+        return max(3, n // 5) if self.quick else n
+
+    def grader(self):
+        if self._grader is None:
+            from benchmarks.fakes import SleepyChatModel
+            from essay_grader import EssayGrader
+            with quiet():
+                # 가짜 임베딩으로 저장된 인덱스를 다시 임베딩/저장하지 않도록 auto_sync_index를 끕니다.
+                self._grader = EssayGrader(llm=SleepyChatModel(), embedding_model=self.embeddings,
+                                           auto_sync_index=False, response_cache=False)
+        return self._grader
+
+
+def environment():
+    import faiss
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True, cwd=ROOT_DIR).stdout.strip()
+        # 커밋되지 않은 코드 변경이 있으면 기준 커밋과 측정한 코드가 다르므로 함께 기록합니다 (기준값 파일 자체는 제외).
+        changed = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True,
+                                 check=True, cwd=ROOT_DIR).stdout.splitlines()
+        dirty = any(not line.endswith(os.path.relpath(BASELINE_PATH, ROOT_DIR)) for line in changed)
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "faiss": faiss.__version__,
+        "git_commit": commit,
+        "git_dirty": dirty,
+    }
+
+
+def run_suite(groups, quick=False, real_embeddings=False, real_ocr=False):
+    ctx = SuiteContext(quick, real_embeddings, real_ocr)
+    results = {}
+    for group in groups:
+        print(f"[{group}] 측정 중...")
+        results.update(CASES[group](ctx))
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "setup": ctx.setup,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """기준값과 median을 비교합니다. 반환값: ([(이름, 현재, 기준, 배율, 상태)], 회귀 항목 이름 목록)"""
+    rows, regressions = [], []
+    for name, current in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append((name, current["median"], None, None, "새 항목"))
+            continue
+        ratio = current["median"] / base["median"] if base["median"] else float("inf")
+        status = "OK"
+        if ratio > 1 + tolerance and current["median"] - base["median"] > MIN_REGRESSION_MS:
+            status = "회귀"
+            regressions.append(name)
+        elif ratio < 1 / (1 + tolerance):
+            status = "개선"
+        rows.append((name, current["median"], base["median"], ratio, status))
+    return rows, regressions
+
+
+def print_table(rows):
+    print(f"\n{'항목':<40}{'median(ms)':>14}{'기준(ms)':>14}{'배율':>8}  상태")
+    for name, current, base, ratio, status in rows:
+        base_text = f"{base:>14.4f}" if base is not None else f"{'-':>14}"
+        ratio_text = f"{ratio:>7.2f}x" if ratio is not None else f"{'-':>8}"
+        print(f"{name:<40}{current:>14.4f}{base_text}{ratio_text}  {status}")
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 OCR → 검색 → 첨삭 벤치마크 모음")
+    parser.add_argument("--only", default=",".join(CASES), help=f"쉼표로 구분한 측정 그룹 ({', '.join(CASES)})")
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄여 빠르게 확인")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과로 기준값을 갱신 (--only로 고른 항목만 덮어씀)")
+    parser.add_argument("--real-embeddings", action="store_true")
+    parser.add_argument("--real-ocr", action="store_true")
+    args = parser.parse_args()
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = [group for group in groups if group not in CASES]
+    if unknown:
+        parser.error(f"알 수 없는 측정 그룹: {', '.join(unknown)}")
+
+    report = run_suite(groups, args.quick, args.real_embeddings, args.real_ocr)
+    write_json(args.output, report)
+    print(f"\n결과 저장: {os.path.relpath(args.output, ROOT_DIR)}")
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        # 모든 그룹을 다시 쟀으면 예전 항목을 남기지 않고 통째로 바꿉니다.
+        keep = baseline["results"] if baseline and set(groups) != set(CASES) else {}
+        merged = {**report, "results": {**keep, **report["results"]}}
+        write_json(args.baseline, merged)
+        print(f"기준값 갱신: {os.path.relpath(args.baseline, ROOT_DIR)} ({len(report['results'])}개 항목)")
+        print_table([(name, r["median"], None, None, "기준값") for name, r in report["results"].items()])
+        return
+
+    if baseline is None:
+        print("기준값 파일이 없습니다. --update-baseline으로 먼저 만드세요.")
+        print_table([(name, r["median"], None, None, "-") for name, r in report["results"].items()])
+        return
+    if baseline.get("setup", {}).get("embeddings") != report["setup"]["embeddings"] or \
+            baseline.get("setup", {}).get("ocr") != report["setup"]["ocr"]:
+        print("기준값과 측정 설정(임베딩/OCR)이 달라 비교하지 않습니다.")
+        print_table([(name, r["median"], None, None, "-") for name, r in report["results"].items()])
+        return
+
+    base_env, env = baseline.get("environment", {}), report["environment"]
+    if (base_env.get("cpu_count"), base_env.get("platform")) != (env["cpu_count"], env["platform"]):
+        # 절대 시간 비교이므로 다른 기계에서 잰 기준값과는 배율이 크게 달라질 수 있습니다.
+        print(f"⚠️ 기준값은 다른 환경에서 측정되었습니다 (CPU {base_env.get('cpu_count')}개, {base_env.get('platform')}). "
+              "이 기계에서 --update-baseline으로 기준값을 새로 만든 뒤 비교하세요.")
+
+    rows, regressions = compare(report, baseline, args.tolerance)
+    print_table(rows)
+    if regressions:
+        print(f"\n❌ 기준값보다 {1 + args.tolerance:.2f}배 넘게 느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ 회귀 없음 (허용 배율 {1 + args.tolerance:.2f}x, 기준 커밋 {baseline['environment'].get('git_commit')})")
+
+
+if __name__ == "__main__":
+    main()
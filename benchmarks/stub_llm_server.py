@@ -0,0 +1,141 @@
+# benchmarks/stub_llm_server.py
+# OpenAI Chat Completions API를 흉내 내는 로컬 HTTP 서버. 지연 시간과 오류(429/5xx)를 주입해
+# llm_gateway의 연결 풀/재시도/동시 요청 제한을 네트워크 없이 확인할 때 씁니다.
+# 단독 실행: python benchmarks/stub_llm_server.py [--port 8765] [--latency 0.2] [--error-rate 0.2]
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_RESPONSE = "스텁 서버의 첨삭 응답입니다. 논지는 분명하지만 근거가 부족합니다."
+
+
+class StubLLMServer:
+    """
+    latency      : 응답 전 대기(초)
+    error_rate   : 이 확률로 error_statuses 중 하나를 돌려줍니다 (429이면 Retry-After 헤더 포함)
+    요청 수, 동시에 처리 중인 요청의 최대치, 클라이언트가 연 TCP 연결 수를 기록합니다.
+    """
+
+    def __init__(self, port=0, latency=0.2, error_rate=0.0, error_statuses=(429, 500, 503), retry_after=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections = set()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = self.errors = self.peak_in_flight = 0
+            self.connections = set()
+
+    def _pick_error(self):
+        with self._lock:
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                return self._random.choice(self.error_statuses)
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive를 지원해야 클라이언트 연결 풀 재사용 여부를 확인할 수 있습니다.
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, body, headers=()):
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    server.connections.add(self.client_address)
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency)
+                    status = server._pick_error()
+                    if status is not None:
+                        headers = [("Retry-After", str(server.retry_after))] if status == 429 and server.retry_after is not None else []
+                        self._send_json(status, {"error": {"message": f"stub error {status}", "type": "stub", "code": status}}, headers)
+                    elif self.path.endswith("/chat/completions"):
+                        self._send_completion(request)
+                    else:
+                        self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _send_completion(self, request):
+                model = request.get("model", "stub")
+                if not request.get("stream"):
+                    self._send_json(200, {
+                        "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": STUB_RESPONSE}, "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+                    })
+                    return
+                events = []
+                for token in STUB_RESPONSE.split(" "):
+                    chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                             "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}]}
+                    events.append(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+                events.append("data: [DONE]\n\n")
+                payload = "".join(events).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+    stub = StubLLMServer(args.port, args.latency, args.error_rate).start()
+    print(f"스텁 LLM 서버 실행 중: {stub.base_url} (OPENAI_BASE_URL로 지정하세요, Ctrl+C로 종료)")
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
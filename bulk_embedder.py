@@ -0,0 +1,136 @@
+# bulk_embedder.py (대용량 인덱스 생성을 위한 배치/멀티프로세스 임베딩)
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from embedding_cache import CachedEmbeddings
+
+BULK_BATCH_SIZE = 64
+BULK_CHUNK_SIZE = 2048  # 이 개수만큼 임베딩이 모이면 FAISS에 넣고 메모리에서 버립니다.
+
+
+def load_sbert_model(model_name, normalize, batch_size):
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={'device': 'cpu'},
+        encode_kwargs={'normalize_embeddings': normalize, 'batch_size': batch_size},
+    )
+
+
+# --- 프로세스 풀 워커 ---
+# 워커마다 임베딩 모델을 하나씩 로딩해 두고 배치 단위로 인코딩합니다.
+_worker_model = None
+
+
+def _init_embed_worker(model_factory, factory_args, torch_threads):
+    global _worker_model
+    try:
+        # 여러 프로세스가 각자 모든 코어를 쓰려고 경쟁하지 않도록 스레드 수를 나눠 줍니다.
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    _worker_model = model_factory(*factory_args)
+
+
+def _embed_batch_in_worker(texts):
+    return np.asarray(_worker_model.embed_documents(texts), dtype=np.float32)
+
+
+def _batches(items, batch_size):
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def _make_embed_pool(n_workers, model_factory, factory_args):
+    return ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_embed_worker,
+        initargs=(model_factory, factory_args, max(1, (os.cpu_count() or 1) // n_workers)),
+    )
+
+
+def iter_embedding_chunks(texts, embedding_model=None, n_workers=1, batch_size=BULK_BATCH_SIZE,
+                          chunk_size=BULK_CHUNK_SIZE, model_factory=None, factory_args=()):
+    """
+    텍스트를 길이순으로 정렬해 패딩을 줄인 뒤 batch_size씩 임베딩하고,
+    chunk_size개 단위로 (원래 인덱스 목록, float32 벡터 배열)을 내보냅니다.
+    n_workers가 1이면 embedding_model로 현재 프로세스에서, 2 이상이면 model_factory(*factory_args)로
+    모델을 하나씩 띄운 워커 프로세스들에서 나눠 임베딩합니다.
+    워커는 캐시 없는 원래 모델을 쓰므로, embedding_model이 CachedEmbeddings이면 부모 프로세스에서 캐시를 먼저 보고
+    없는 텍스트만 워커에 보낸 뒤 결과를 캐시에 저장합니다. (모두 캐시에 있으면 워커를 띄우지 않음)
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    cache = embedding_model.cache if n_workers > 1 and isinstance(embedding_model, CachedEmbeddings) else None
+    if n_workers > 1 and model_factory is None:
+        raise ValueError("n_workers가 2 이상이면 워커에서 모델을 만들 model_factory가 필요합니다.")
+
+    pool = None
+    try:
+        for chunk_order in _batches(order, chunk_size):
+            if n_workers <= 1:
+                batch_texts = [[texts[i] for i in batch] for batch in _batches(chunk_order, batch_size)]
+                vectors = [np.asarray(embedding_model.embed_documents(batch), dtype=np.float32) for batch in batch_texts]
+                yield chunk_order, np.concatenate(vectors)
+                continue
+
+            chunk_texts = [texts[i] for i in chunk_order]
+            keys = [cache.text_key(text) for text in chunk_texts] if cache is not None else None
+            found = cache.get_many(keys) if cache is not None else {}
+            missing = [j for j in range(len(chunk_texts)) if keys is None or keys[j] not in found]
+            missing_vectors = None
+            if missing:
+                if pool is None:
+                    pool = _make_embed_pool(n_workers, model_factory, factory_args)
+                batch_texts = [[chunk_texts[j] for j in batch] for batch in _batches(missing, batch_size)]
+                missing_vectors = np.concatenate(list(pool.map(_embed_batch_in_worker, batch_texts)))
+                if cache is not None:
+                    cache.put_many([keys[j] for j in missing], missing_vectors)
+            if cache is None or not found:
+                yield chunk_order, missing_vectors
+                continue
+            vectors = np.empty((len(chunk_texts), next(iter(found.values())).shape[0]), dtype=np.float32)
+            for j, key in enumerate(keys):
+                if key in found:
+                    vectors[j] = found[key]
+            if missing:
+                vectors[missing] = missing_vectors
+            yield chunk_order, vectors
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def build_faiss_index_bulk(documents, embedding_model, ids=None, **embed_kwargs):
+    """
+    문서 목록으로 FAISS 인덱스를 만듭니다. 임베딩은 청크 단위로 만들어 바로 인덱스에 추가하므로
+    전체 임베딩 행렬을 한꺼번에 메모리에 올리지 않습니다. (embed_kwargs는 iter_embedding_chunks 참고)
+    """
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    if not documents:
+        raise ValueError("인덱스를 만들 문서가 없습니다.")
+    texts = [doc.page_content for doc in documents]
+    vector_db = None
+    for chunk_order, vectors in iter_embedding_chunks(texts, embedding_model, **embed_kwargs):
+        if vector_db is None:
+            vector_db = FAISS(
+                embedding_function=embedding_model,
+                index=faiss.IndexFlatL2(vectors.shape[1]),
+                docstore=InMemoryDocstore(),
+                index_to_docstore_id={},
+            )
+        vector_db.add_embeddings(
+            [(texts[i], vector) for i, vector in zip(chunk_order, vectors)],
+            metadatas=[documents[i].metadata for i in chunk_order],
+            ids=[ids[i] for i in chunk_order] if ids is not None else None,
+        )
+        print(f"📌 임베딩 {len(vector_db.index_to_docstore_id)}/{len(texts)}개 인덱스에 추가")
+    return vector_db
@@ -0,0 +1,148 @@
+# chat_memory.py (멘토 챗봇용 토큰 예산 대화 기억)
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+CHAT_MODEL_NAME = "gpt-4o-mini"
+CHAT_RECENT_TURNS = 4        # 그대로 보내는 최근 대화 턴 수
+CHAT_TOKEN_BUDGET = 3000     # 요약 + 최근 대화에 쓸 수 있는 최대 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4  # 메시지 하나당 역할/구분자 토큰 (OpenAI 채팅 형식 기준 근사값)
+
+SUMMARY_INSTRUCTION = """다음은 논술 첨삭 멘토와 학생의 이전 대화입니다.
+[기존 요약]과 [새 대화]를 합쳐, 학생이 무엇을 물었고 멘토가 어떤 조언을 했는지 핵심만 한국어로 요약하세요.
+학생 답안의 약점, 합의한 개선 방향, 아직 해결되지 않은 질문은 반드시 남기고 10문장을 넘기지 마세요.
+
+[기존 요약]
+{summary}
+
+[새 대화]
+{turns}"""
+
+
+@lru_cache(maxsize=4)
+def _encoding(model_name):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # 인코딩 파일은 처음 쓸 때 내려받으므로, 오프라인이면 어림값으로 대신합니다.
+        print(f"[경고] tiktoken 인코딩을 불러오지 못해 토큰 수를 어림합니다: {e}")
+        return None
+
+
+def count_tokens(text, model_name=CHAT_MODEL_NAME):
+    encoding = _encoding(model_name)
+    if encoding is None:
+        # tiktoken이 없으면 한국어 기준 대략 2자당 1토큰으로 어림합니다.
+        return len(text) // 2 + 1
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages, model_name=CHAT_MODEL_NAME):
+    return sum(count_tokens(m["content"], model_name) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def truncate_tokens(text, max_tokens, model_name=CHAT_MODEL_NAME):
+    """text의 앞부분을 max_tokens 토큰 이내로 자릅니다."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return text if count_tokens(text, model_name) <= max_tokens else text[:(max_tokens - 1) * 2]
+    tokens = encoding.encode(text)
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def _format_turns(turns):
+    return "\n".join(f"학생: {turn['user']}\n멘토: {turn['assistant']}" for turn in turns)
+
+
+class ConversationMemory:
+    """
+    채팅 세션 하나의 기억.
+    - 최근 recent_turns 턴은 원문 그대로 보냅니다.
+    - 그보다 오래된 턴은 백그라운드 스레드에서 요약문 하나로 접어 둡니다 (응답을 기다리게 하지 않음).
+    - 요약 + 최근 대화가 token_budget을 넘으면 오래된 턴부터 뺍니다.
+    대화 기록(history)은 지금처럼 호출하는 쪽(st.session_state.chat_history)이 들고 있고,
+    이 객체는 요약문과 '요약에 반영된 턴 수'만 기억합니다.
+    """
+
+    def __init__(self, llm, executor, recent_turns=CHAT_RECENT_TURNS, token_budget=CHAT_TOKEN_BUDGET):
+        self.llm = llm
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary = ""
+        self.summarized_turns = 0
+        self._executor = executor
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def update(self, history):
+        """최근 턴 밖으로 밀려난 턴이 있으면 요약 작업을 백그라운드에 맡깁니다. (이미 요약 중이면 다음 호출 때)"""
+        cutoff = len(history) - self.recent_turns
+        with self._lock:
+            if cutoff <= self.summarized_turns or (self._pending is not None and not self._pending.done()):
+                return
+            turns = list(history[self.summarized_turns:cutoff])
+            self._pending = self._executor.submit(self._summarize, self.summary, turns, cutoff)
+
+    def _summarize(self, summary, turns, covered):
+        prompt = SUMMARY_INSTRUCTION.format(summary=summary or "(없음)", turns=_format_turns(turns))
+        try:
+            new_summary = self.llm.invoke([{"role": "user", "content": prompt}]).content.strip()
+        except Exception as e:
+            # 요약에 실패해도 대화는 계속됩니다. 다음 update 때 같은 턴을 다시 요약합니다.
+            print(f"[경고] 대화 요약 실패: {e}")
+            return
+        with self._lock:
+            self.summary = new_summary
+            self.summarized_turns = covered
+
+    def wait(self, timeout=None):
+        """진행 중인 요약이 끝날 때까지 기다립니다. (벤치마크/테스트용)"""
+        pending = self._pending
+        if pending is not None:
+            pending.result(timeout)
+
+    def history_messages(self, history, reserved_tokens=0):
+        """
+        요약문과 최근 대화를 채팅 메시지 목록으로 만듭니다.
+        reserved_tokens는 같은 요청에 들어갈 나머지 프롬프트 토큰 수로, 예산에서 먼저 뺍니다.
+        """
+        with self._lock:
+            summary, covered = self.summary, self.summarized_turns
+
+        budget = self.token_budget - reserved_tokens
+        summary_message = None
+        if summary:
+            # 모델이 지시보다 긴 요약을 돌려줘도 예산을 넘지 않도록 요약문을 자릅니다.
+            header = "[이전 대화 요약]\n"
+            summary = truncate_tokens(summary, budget - MESSAGE_OVERHEAD_TOKENS - count_tokens(header))
+            summary_message = {"role": "system", "content": header + summary}
+            if not summary or count_message_tokens([summary_message]) > budget:
+                summary_message = None
+            else:
+                budget -= count_message_tokens([summary_message])
+
+        # 아직 요약에 반영되지 않은 턴은 예산이 허용하는 만큼 최신 턴부터 원문으로 넣습니다.
+        selected = []
+        for turn in reversed(history[covered:]):
+            turn_messages = [{"role": "user", "content": turn["user"]}, {"role": "assistant", "content": turn["assistant"]}]
+            cost = count_message_tokens(turn_messages)
+            if cost > budget:
+                break
+            selected[:0] = turn_messages
+            budget -= cost
+        return ([summary_message] if summary_message else []) + selected
+
+
+def make_summary_executor():
+    # 요약은 순서대로 하나씩만 돌면 되므로 워커 하나짜리 스레드 풀을 씁니다.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-summary")
@@ -2,11 +2,71 @@
 
 import os
 import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from langchain_core.documents import Document
-import pickle
+from document_store import DocumentStore, write_documents
 
 JSON_DATA_DIR = "./01_data_preprocessing/json"
-OUTPUT_FILE = "./01_data_preprocessing/faiss/preprocessed_documents.pkl"
+OUTPUT_FILE = "./01_data_preprocessing/faiss/preprocessed_documents.jsonl"
+MANIFEST_FILE = "./01_data_preprocessing/faiss/ingest_manifest.json"
+# 변경된 파일이 이 개수 이상일 때만 프로세스 풀로 나눠서 파싱합니다 (적으면 풀 생성 비용이 더 큼)
+PARALLEL_THRESHOLD = 8
+
+
+def make_document_id(question_id, source_type):
+    # 문서의 안정적인 ID. 같은 문항/유형이면 몇 번을 다시 전처리해도 같은 ID가 나옵니다.
+    return f"{question_id}::{source_type}"
+
+
+def document_id_of(doc):
+    return make_document_id(doc.metadata.get("question_id"), doc.metadata.get("source_type"))
+
+
+def parse_json_file(filepath):
+    filename = os.path.basename(filepath)
+    documents = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # [핵심 수정] question_id는 JSON 파일 안의 값을 최우선으로 사용합니다.
+    question_id = data.get("question_id")
+    if not question_id:
+        print(f"[경고] {filename}에 'question_id'가 없습니다. 파일명을 기반으로 생성합니다.")
+        question_id = filename.replace(".json", "")
+
+    # [핵심 수정] 메타데이터는 파일명이 아닌, question_id를 기준으로 파싱합니다.
+    # 예: "2023_서강대_1" -> parts = ['2023', '서강대', '1']
+    parts = filename.replace(".json", "").split('_')
+
+    # 메타데이터 생성 시, 예외 상황에 대한 방어 코드를 추가합니다.
+    # 파일명 구조에 따라 유연하게 대처
+    university = parts[0] if len(parts) > 0 else "알수없음"
+    year = parts[1] if len(parts) > 1 else "알수없음"
+    number = parts[2] if len(parts) > 2 else "기타"
+
+    base_metadata = {
+        "question_id": question_id,
+        "university": university,
+        "year": year,
+        "number": number
+    }
+
+    content_map = {
+        "출제의도": data.get("intended_purpose"),
+        "채점기준": data.get("grading_criteria"),
+        "모범답안": data.get("sample_answer")
+    }
+
+    for content_type, content in content_map.items():
+        if content:
+            doc_metadata = base_metadata.copy()
+            doc_metadata["source_type"] = content_type
+            documents.append(Document(page_content=content, metadata=doc_metadata))
+    print(f"✅ {filename} 처리 완료. (ID: {question_id})")
+    return documents
+
 
 def process_json_data():
     all_documents = []
@@ -17,58 +77,126 @@ def process_json_data():
 
     for filename in os.listdir(JSON_DATA_DIR):
         if filename.endswith(".json"):
-            filepath = os.path.join(JSON_DATA_DIR, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # [핵심 수정] question_id는 JSON 파일 안의 값을 최우선으로 사용합니다.
-            question_id = data.get("question_id")
-            if not question_id:
-                print(f"[경고] {filename}에 'question_id'가 없습니다. 파일명을 기반으로 생성합니다.")
-                question_id = filename.replace(".json", "")
-
-            # [핵심 수정] 메타데이터는 파일명이 아닌, question_id를 기준으로 파싱합니다.
-            # 예: "2023_서강대_1" -> parts = ['2023', '서강대', '1']
-            parts = filename.replace(".json", "").split('_')
-            
-            # 메타데이터 생성 시, 예외 상황에 대한 방어 코드를 추가합니다.
-            # 파일명 구조에 따라 유연하게 대처
-            university = parts[0] if len(parts) > 0 else "알수없음"
-            year = parts[1] if len(parts) > 1 else "알수없음"
-            number = parts[2] if len(parts) > 2 else "기타"
-
-            base_metadata = {
-                "question_id": question_id,
-                "university": university,
-                "year": year,
-                "number": number
-            }
-
-            content_map = {
-                "출제의도": data.get("intended_purpose"),
-                "채점기준": data.get("grading_criteria"),
-                "모범답안": data.get("sample_answer")
-            }
-            
-            for content_type, content in content_map.items():
-                if content:
-                    doc_metadata = base_metadata.copy()
-                    doc_metadata["source_type"] = content_type
-                    all_documents.append(Document(page_content=content, metadata=doc_metadata))
-            print(f"✅ {filename} 처리 완료. (ID: {question_id})")
+            all_documents.extend(parse_json_file(os.path.join(JSON_DATA_DIR, filename)))
 
     if not all_documents:
         print("[경고] 처리할 문서가 하나도 없습니다.")
         return None
 
-    with open(OUTPUT_FILE, 'wb') as f:
-        pickle.dump(all_documents, f)
+    write_documents(OUTPUT_FILE, [(document_id_of(doc), doc) for doc in all_documents])
     print(f"\n🎉 데이터 전처리 완료! 총 {len(all_documents)}개의 문서 조각이 생성되었습니다.")
     return all_documents
 
+
+def _file_sha256(filepath):
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_manifest():
+    if not os.path.exists(MANIFEST_FILE) or not os.path.exists(OUTPUT_FILE):
+        return {}
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest):
+    tmp_path = f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+
+def ingest_incremental(max_workers=None):
+    """
+    JSON 폴더를 증분 전처리합니다.
+    - 파일별 내용 해시를 manifest에 기록해 두고, 새로 생기거나 바뀐 파일만 다시 파싱합니다.
+    - 삭제된 파일의 문서는 결과에서 제거합니다.
+    - 바뀐 파일이 하나도 없으면 기존 전처리 결과를 읽지 않고 바로 끝냅니다.
+    - 변경분(delta)을 반환하므로 index_maintenance.sync_index(delta=...)로 바뀐 문서만 다시 임베딩할 수 있습니다.
+    반환값: {"upserted": {문서ID: Document}, "deleted": [문서ID]}
+    """
+    print(f"--- '{JSON_DATA_DIR}' 폴더를 증분 전처리합니다. ---")
+    if not os.path.exists(JSON_DATA_DIR):
+        print(f"[오류] '{JSON_DATA_DIR}' 폴더를 찾을 수 없습니다.")
+        return None
+
+    manifest = _load_manifest()
+    new_manifest = {}
+    changed_files = []
+    for filename in sorted(os.listdir(JSON_DATA_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        filepath = os.path.join(JSON_DATA_DIR, filename)
+        stat = os.stat(filepath)
+        entry = manifest.get(filename)
+        # 크기/수정 시각이 그대로면 해시 계산도 건너뜁니다.
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            new_manifest[filename] = entry
+            continue
+        sha256 = _file_sha256(filepath)
+        if entry and entry["sha256"] == sha256:
+            new_manifest[filename] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            continue
+        new_manifest[filename] = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "doc_ids": []}
+        changed_files.append(filename)
+
+    removed_files = [filename for filename in manifest if filename not in new_manifest]
+    if not changed_files and not removed_files:
+        # 전처리 결과(문서 본문)는 바뀐 파일이 있을 때만 읽습니다.
+        print("✅ 변경된 파일이 없습니다. (전처리 생략)")
+        _save_manifest(new_manifest)
+        return {"upserted": {}, "deleted": []}
+
+    documents_by_id = {}
+    if manifest:
+        store = DocumentStore(OUTPUT_FILE)
+        documents_by_id = dict(store.items())
+        # 같은 파일을 아래에서 바꿔 끼우므로 memory-map을 먼저 닫습니다 (Windows에서는 열린 파일을 바꿀 수 없음).
+        store.close()
+
+    filepaths = [os.path.join(JSON_DATA_DIR, filename) for filename in changed_files]
+    if len(filepaths) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = list(pool.map(parse_json_file, filepaths))
+    else:
+        parsed = [parse_json_file(filepath) for filepath in filepaths]
+
+    # 바뀐 파일과 삭제된 파일이 예전에 만들었던 문서를 먼저 지우고, 새로 파싱한 문서를 넣습니다.
+    stale_ids = set()
+    for filename, entry in manifest.items():
+        if filename not in new_manifest or filename in changed_files:
+            stale_ids.update(entry["doc_ids"])
+    for doc_id in stale_ids:
+        documents_by_id.pop(doc_id, None)
+
+    upserted = {}
+    for filename, documents in zip(changed_files, parsed):
+        for doc in documents:
+            doc_id = document_id_of(doc)
+            documents_by_id[doc_id] = doc
+            upserted[doc_id] = doc
+            new_manifest[filename]["doc_ids"].append(doc_id)
+    deleted = sorted(stale_ids - set(upserted))
+
+    write_documents(OUTPUT_FILE, documents_by_id.items())
+    print(f"\n🎉 증분 전처리 완료! 변경 파일 {len(changed_files)}개, 갱신 문서 {len(upserted)}개, 삭제 문서 {len(deleted)}개 (전체 {len(documents_by_id)}개)")
+    _save_manifest(new_manifest)
+
+    return {"upserted": upserted, "deleted": deleted}
+
+
 if __name__ == '__main__':
-    processed_data = process_json_data()
+    parser = argparse.ArgumentParser(description="논술 JSON 데이터를 LangChain 문서로 전처리합니다.")
+    parser.add_argument("--incremental", action="store_true", help="새로 생기거나 바뀐 JSON 파일만 다시 처리합니다.")
+    args = parser.parse_args()
+
+    if args.incremental:
+        delta = ingest_incremental()
+        processed_data = list(delta["upserted"].values()) if delta else None
+    else:
+        processed_data = process_json_data()
     if processed_data:
         print("\n[샘플 데이터 확인]")
         for doc in processed_data[:5]:
-            print(doc, "\n" + "-"*30)
\ No newline at end of file
+            print(doc, "\n" + "-"*30)
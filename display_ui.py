@@ -1,8 +1,15 @@
 import streamlit as st
 import re
 import difflib
+from tracing import tracer
 
-def display_correction_with_diff(student_answer, model_answer, correction_result):
+SUGGESTION_HEADER = "**[이렇게 바꿔보세요"
+SUGGESTION_PATTERN = r"학생 원문:\s*(.*?)\s*수정 제안:\s*(.*?)(?=\n\*\*\[|학생 원문:|\Z)"
+# 스트리밍 중에는 뒤에 다음 제안이나 다음 섹션이 이어져야 '완성된' 제안으로 봅니다 (\Z 제외)
+COMPLETED_SUGGESTION_PATTERN = r"학생 원문:\s*(.*?)\s*수정 제안:\s*(.*?)(?=\n\*\*\[|학생 원문:)"
+
+
+def _display_answer_columns(student_answer, model_answer):
     st.subheader("🤖 AI 멘토 첨삭 결과", divider='rainbow')
     col1, col2 = st.columns(2)
     with col1:
@@ -13,30 +20,83 @@ def display_correction_with_diff(student_answer, model_answer, correction_result
         st.text_area("모범 답안 내용", value=model_answer, height=400, disabled=True, key="model_answer_area")
     st.markdown("---")
     st.info("✨ 논리왕 김멘토's 코멘트")
-    pattern = r"학생 원문:\s*(.*?)\s*수정 제안:\s*(.*?)(?=\n\*\*\[|학생 원문:|\Z)"
-    suggestions = re.findall(pattern, correction_result, re.DOTALL)
+
+
+def _display_suggestion(i, original, suggestion):
+    original = original.strip().strip('"')
+    suggestion = suggestion.strip().strip('"')
+    with st.expander(f'수정 제안 #{i+1}: "{original}"', expanded=True):
+        st.markdown(f'**- 원본:** {original}')
+        d = difflib.Differ()
+        diff_words = list(d.compare(original.split(), suggestion.split()))
+        diff_html = ""
+        for word in diff_words:
+            if word.startswith('+ '):
+                diff_html += f' <span style="background-color: #d4edda; padding: 2px 0; border-radius: 3px;">{word[2:]}</span>'
+            elif word.startswith('- '):
+                diff_html += f' <span style="background-color: #f8d7da; padding: 2px 0; border-radius: 3px; text-decoration: line-through;">{word[2:]}</span>'
+            else:
+                diff_html += f' {word[2:]}'
+        st.markdown(f'**- 제안:**{diff_html.strip()}', unsafe_allow_html=True)
+        st.markdown('---')
+        st.markdown(f'**- 수정된 문장:**')
+        st.success(suggestion)
+
+
+@tracer.traced("display")
+def display_correction_with_diff(student_answer, model_answer, correction_result):
+    _display_answer_columns(student_answer, model_answer)
+    suggestions = re.findall(SUGGESTION_PATTERN, correction_result, re.DOTALL)
     main_correction = re.split(r'(\*\*\[이렇게 바꿔보세요)', correction_result)[0]
     st.markdown(main_correction)
     if suggestions:
         st.markdown("#### 💡 이렇게 바꿔보세요")
         for i, (original, suggestion) in enumerate(suggestions):
-            original = original.strip().strip('"')
-            suggestion = suggestion.strip().strip('"')
-            with st.expander(f'수정 제안 #{i+1}: "{original}"', expanded=True):
-                st.markdown(f'**- 원본:** {original}')
-                d = difflib.Differ()
-                diff_words = list(d.compare(original.split(), suggestion.split()))
-                diff_html = ""
-                for word in diff_words:
-                    if word.startswith('+ '):
-                        diff_html += f' <span style="background-color: #d4edda; padding: 2px 0; border-radius: 3px;">{word[2:]}</span>'
-                    elif word.startswith('- '):
-                        diff_html += f' <span style="background-color: #f8d7da; padding: 2px 0; border-radius: 3px; text-decoration: line-through;">{word[2:]}</span>'
-                    else:
-                        diff_html += f' {word[2:]}'
-                st.markdown(f'**- 제안:**{diff_html.strip()}', unsafe_allow_html=True)
-                st.markdown('---')
-                st.markdown(f'**- 수정된 문장:**')
-                st.success(suggestion)
-    elif "**[이렇게 바꿔보세요" in correction_result:
+            _display_suggestion(i, original, suggestion)
+    elif SUGGESTION_HEADER in correction_result:
          st.warning("AI가 수정 제안을 생성했지만, 형식이 맞지 않아 표시할 수 없습니다. 프롬프트를 확인해주세요.")
+
+
+# 토큰 스트림을 소비하면서 그리므로 LLM 스트리밍 시간(chain.stream)이 이 단계 안에 포함됩니다.
+@tracer.traced("display.stream")
+def display_correction_stream(student_answer, model_answer, token_stream):
+    """
+    첨삭 결과를 토큰 단위로 받아 [총평]/[잘한 점] 등 본문 섹션을 도착하는 대로 보여주고,
+    '학생 원문/수정 제안' 쌍은 하나가 완성될 때마다 diff로 표시합니다.
+    스트림이 끝나면 전체 첨삭문을 반환합니다.
+    """
+    _display_answer_columns(student_answer, model_answer)
+    main_placeholder = st.empty()
+    suggestion_area = st.container()
+
+    correction_result = ""
+    main_correction = ""
+    rendered = 0
+    for token in token_stream:
+        correction_result += token
+
+        current_main = correction_result.split(SUGGESTION_HEADER, 1)[0]
+        if current_main != main_correction:
+            main_correction = current_main
+            main_placeholder.markdown(main_correction)
+
+        if SUGGESTION_HEADER in correction_result:
+            completed = re.findall(COMPLETED_SUGGESTION_PATTERN, correction_result, re.DOTALL)
+            rendered = _display_new_suggestions(suggestion_area, completed, rendered)
+
+    # 마지막 제안은 뒤에 이어지는 내용 없이 끝날 수 있으므로 전체 패턴으로 한 번 더 확인합니다.
+    suggestions = re.findall(SUGGESTION_PATTERN, correction_result, re.DOTALL)
+    rendered = _display_new_suggestions(suggestion_area, suggestions, rendered)
+    if not suggestions and SUGGESTION_HEADER in correction_result:
+        st.warning("AI가 수정 제안을 생성했지만, 형식이 맞지 않아 표시할 수 없습니다. 프롬프트를 확인해주세요.")
+    return correction_result
+
+
+def _display_new_suggestions(container, suggestions, rendered):
+    with container:
+        for i in range(rendered, len(suggestions)):
+            if i == 0:
+                st.markdown("#### 💡 이렇게 바꿔보세요")
+            original, suggestion = suggestions[i]
+            _display_suggestion(i, original, suggestion)
+    return max(rendered, len(suggestions))
@@ -0,0 +1,83 @@
+# document_index.py (docstore 메타데이터 인덱스)
+
+from collections import defaultdict
+
+INDEXED_FIELDS = ("question_id", "source_type", "university", "year")
+
+
+class DocumentIndex:
+    """
+    FAISS docstore의 문서들을 메타데이터 기준으로 미리 색인해 둡니다.
+    - (question_id, source_type) -> 문서 : O(1) 정확 조회
+    - 필드별 역색인(question_id / source_type / university / year) : 조건 검색
+    문서 수가 늘어나도 조회 시간은 일정하게 유지됩니다.
+    """
+
+    def __init__(self, items=(), fetch=None):
+        # fetch(doc_id)를 넘기면 문서 본문은 조회될 때 가져옵니다 (LazyDocstore처럼 지연 디코딩하는 docstore용)
+        self._documents = {}
+        self._fetch = fetch or self._documents.__getitem__
+        self._doc_ids = {}
+        self._by_key = {}
+        self._by_question = defaultdict(dict)
+        self._postings = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        for doc_id, doc in items:
+            self.add(doc_id, doc)
+
+    @classmethod
+    def from_docstore(cls, docstore):
+        if hasattr(docstore, "metadata_items"):
+            # 메타데이터만으로 색인하고 본문은 디코딩하지 않습니다.
+            index = cls(fetch=docstore.search)
+            for doc_id, metadata in docstore.metadata_items():
+                index.add_metadata(doc_id, metadata)
+            return index
+        return cls(docstore._dict.items())
+
+    def add(self, doc_id, doc):
+        self._documents[doc_id] = doc
+        self.add_metadata(doc_id, doc.metadata)
+
+    def add_metadata(self, doc_id, metadata):
+        self._doc_ids[doc_id] = None
+        key = (metadata.get("question_id"), metadata.get("source_type"))
+        # 같은 키가 여러 번 나오면 처음 문서를 유지합니다 (기존 선형 탐색과 동일한 동작)
+        if key not in self._by_key:
+            self._by_key[key] = doc_id
+            self._by_question[key[0]][key[1]] = doc_id
+        for field in INDEXED_FIELDS:
+            self._postings[field][metadata.get(field)].append(doc_id)
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def get(self, question_id, source_type):
+        doc_id = self._by_key.get((question_id, source_type))
+        return None if doc_id is None else self._fetch(doc_id)
+
+    def get_question(self, question_id):
+        """한 문항의 모든 source_type 문서를 {source_type: 문서} 형태로 한 번에 반환합니다."""
+        return {source_type: self._fetch(doc_id) for source_type, doc_id in self._by_question.get(question_id, {}).items()}
+
+    def filter_ids(self, **conditions):
+        """메타데이터 조건(AND)에 맞는 문서 ID 목록을 반환합니다. 예: filter_ids(university="ajou", year="2024")"""
+        postings = []
+        for field, value in conditions.items():
+            if value is None:
+                continue
+            if field not in self._postings:
+                raise ValueError(f"색인되지 않은 메타데이터 필드입니다: {field}")
+            postings.append(self._postings[field].get(value, []))
+        if not postings:
+            return list(self._doc_ids)
+
+        # 가장 짧은 역색인 목록을 기준으로 교집합을 구합니다 (문서 순서 유지)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            id_set = set(ids)
+            candidates = [doc_id for doc_id in candidates if doc_id in id_set]
+        return list(candidates)
+
+    def filter(self, **conditions):
+        return [self._fetch(doc_id) for doc_id in self.filter_ids(**conditions)]
@@ -0,0 +1,288 @@
+# document_store.py (pickle 대신 쓰는 JSONL + 오프셋 색인 문서 저장 형식)
+
+import argparse
+import json
+import mmap
+import os
+import threading
+import weakref
+from collections.abc import MutableMapping
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
+
+OFFSETS_SUFFIX = ".idx"
+FORMAT_VERSION = 1
+# FAISS 벡터 스토어 저장 파일 (index.pkl 대신 docstore.jsonl + 행 번호 매핑 JSON)
+FAISS_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.jsonl"
+INDEX_IDS_FILE = "index_to_docstore_id.json"
+VECTOR_STORE_FILES = (FAISS_FILE, DOCSTORE_FILE, DOCSTORE_FILE + OFFSETS_SUFFIX, INDEX_IDS_FILE)
+
+
+# memory-map으로 파일을 열어 둔 DocumentStore들. 파일을 바꿔 끼우기 전에 닫습니다 (Windows는 열린 파일을 os.replace할 수 없음).
+_open_stores = weakref.WeakSet()
+_open_stores_lock = threading.Lock()
+
+
+def _file_identity(path):
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def replace_file(tmp_path, path):
+    """
+    tmp_path를 path로 바꿔 끼웁니다. path를 열어 둔 DocumentStore는 먼저 닫으며,
+    닫힌 저장소는 예전 오프셋으로 새 파일을 읽지 않도록 다음 조회 때 오류를 냅니다 (새로 불러와야 함).
+    """
+    target = os.path.abspath(path)
+    with _open_stores_lock:
+        stores = [store for store in _open_stores if os.path.abspath(store.path) == target]
+    for store in stores:
+        store.close()
+    os.replace(tmp_path, path)
+
+
+def write_documents(path, items):
+    """
+    (문서 ID, Document) 목록을 JSONL로 저장하고, 옆에 오프셋 색인(path + '.idx')을 만듭니다.
+    - path      : 한 줄에 문서 하나 {"id", "page_content", "metadata"}
+    - path.idx  : {"ids", "offsets", "lengths", "metadata", "size"} (JSON)
+    임시 파일에 쓴 뒤 os.replace로 바꾸며, 색인을 마지막에 바꿔 끼웁니다.
+    """
+    ids, offsets, lengths, metadata = [], [], [], []
+    offset = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for doc_id, doc in items:
+            line = json.dumps({"id": doc_id, "page_content": doc.page_content, "metadata": doc.metadata},
+                              ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            ids.append(doc_id)
+            offsets.append(offset)
+            lengths.append(len(line))
+            metadata.append(doc.metadata)
+            offset += len(line)
+
+    tmp_offsets_path = f"{path}{OFFSETS_SUFFIX}.tmp"
+    with open(tmp_offsets_path, "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "size": offset, "ids": ids, "offsets": offsets,
+                   "lengths": lengths, "metadata": metadata}, f, ensure_ascii=False)
+    replace_file(tmp_path, path)
+    replace_file(tmp_offsets_path, f"{path}{OFFSETS_SUFFIX}")
+
+
+class DocumentStore:
+    """
+    write_documents로 저장한 파일을 읽습니다. 색인(ID, 오프셋, 메타데이터)만 먼저 읽고,
+    본문은 memory-mapped 파일에서 요청받은 문서의 줄만 잘라 그때그때 디코딩합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(f"{path}{OFFSETS_SUFFIX}", "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 문서 저장 형식입니다: {path} (format={index.get('format')})")
+        self._identity = _file_identity(path)
+        if self._identity[1] != index["size"]:
+            raise ValueError(f"'{path}'와 오프셋 색인이 맞지 않습니다. 전처리를 다시 실행하세요.")
+        self._ids = index["ids"]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._offsets = index["offsets"]
+        self._lengths = index["lengths"]
+        self._metadata = index["metadata"]
+        self._file = None
+        self._mmap = None
+
+    def _buffer(self):
+        if self._mmap is None:
+            # 색인을 읽은 뒤 파일이 다시 저장됐다면 오프셋이 맞지 않으므로 열지 않습니다.
+            if _file_identity(self.path) != self._identity:
+                raise RuntimeError(f"'{self.path}'이(가) 다시 저장되었습니다. 문서 저장소를 새로 불러오세요.")
+            self._file = open(self.path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            with _open_stores_lock:
+                _open_stores.add(self)
+        return self._mmap
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._positions
+
+    def ids(self):
+        return list(self._ids)
+
+    def metadata(self, doc_id):
+        return self._metadata[self._positions[doc_id]]
+
+    def get(self, doc_id):
+        """문서 하나만 디코딩해 반환합니다. 없는 ID면 KeyError."""
+        i = self._positions[doc_id]
+        record = json.loads(self._buffer()[self._offsets[i]:self._offsets[i] + self._lengths[i]])
+        return Document(page_content=record["page_content"], metadata=record["metadata"])
+
+    def items(self):
+        for doc_id in self._ids:
+            yield doc_id, self.get(doc_id)
+
+    def documents(self):
+        return [doc for _, doc in self.items()]
+
+    def close(self):
+        if self._mmap is not None:
+            with _open_stores_lock:
+                _open_stores.discard(self)
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+
+class LazyDocumentDict(MutableMapping):
+    """
+    DocumentStore 위에 추가/삭제 내역만 따로 들고 있는 dict. 값은 꺼낼 때 디코딩합니다.
+    InMemoryDocstore._dict 자리에 넣어 기존 코드(docstore._dict 순회 등)를 그대로 쓸 수 있게 합니다.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._added = {}
+        self._deleted = set()
+
+    def __getitem__(self, doc_id):
+        if doc_id in self._added:
+            return self._added[doc_id]
+        if doc_id in self._deleted or doc_id not in self._store:
+            raise KeyError(doc_id)
+        return self._store.get(doc_id)
+
+    def __setitem__(self, doc_id, doc):
+        self._added[doc_id] = doc
+
+    def __delitem__(self, doc_id):
+        if doc_id not in self:
+            raise KeyError(doc_id)
+        self._added.pop(doc_id, None)
+        if doc_id in self._store:
+            self._deleted.add(doc_id)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._added or (doc_id in self._store and doc_id not in self._deleted)
+
+    def __iter__(self):
+        for doc_id in self._store.ids():
+            if doc_id not in self._deleted and doc_id not in self._added:
+                yield doc_id
+        yield from list(self._added)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def metadata_items(self):
+        """본문을 디코딩하지 않고 (문서 ID, 메타데이터)를 순회합니다."""
+        for doc_id in self:
+            if doc_id in self._added:
+                yield doc_id, self._added[doc_id].metadata
+            else:
+                yield doc_id, self._store.metadata(doc_id)
+
+
+class LazyDocstore(InMemoryDocstore):
+    """DocumentStore 기반 docstore. 검색 결과로 필요한 문서만 디코딩합니다."""
+
+    def __init__(self, store):
+        super().__init__(LazyDocumentDict(store))
+
+    def add(self, texts):
+        overlapping = set(texts).intersection(self._dict)
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        # 부모 클래스처럼 {**self._dict, **texts}로 합치면 모든 문서를 디코딩하므로 제자리에서 갱신합니다.
+        self._dict.update(texts)
+
+    @property
+    def path(self):
+        return self._dict._store.path
+
+    def metadata_items(self):
+        return self._dict.metadata_items()
+
+
+def reopen_docstore(vector_db, path):
+    """vector_db의 docstore가 path를 읽고 있었다면 (방금 다시 저장한) 새 파일로 다시 엽니다."""
+    docstore = vector_db.docstore
+    if isinstance(docstore, LazyDocstore) and os.path.abspath(docstore.path) == os.path.abspath(path):
+        vector_db.docstore = LazyDocstore(DocumentStore(path))
+
+
+def save_vector_store(vector_db, directory):
+    """LangChain FAISS 벡터 스토어를 pickle 없이 저장합니다. (index.faiss + docstore.jsonl + 행 번호 매핑)"""
+    import faiss
+    os.makedirs(directory, exist_ok=True)
+    faiss.write_index(vector_db.index, os.path.join(directory, FAISS_FILE))
+    docstore_path = os.path.join(directory, DOCSTORE_FILE)
+    write_documents(docstore_path, vector_db.docstore._dict.items())
+    # 자기 자신이 읽던 파일에 덮어쓴 경우 닫힌 저장소 대신 새 파일을 읽도록 바꿉니다.
+    reopen_docstore(vector_db, docstore_path)
+    ids = [vector_db.index_to_docstore_id[pos] for pos in range(len(vector_db.index_to_docstore_id))]
+    with open(os.path.join(directory, INDEX_IDS_FILE), "w", encoding="utf-8") as f:
+        json.dump(ids, f, ensure_ascii=False)
+
+
+def load_vector_store(directory, embeddings):
+    """save_vector_store로 저장한 벡터 스토어를 불러옵니다. 문서 본문은 검색될 때 디코딩됩니다."""
+    import faiss
+    from langchain_community.vectorstores import FAISS
+
+    if not os.path.exists(os.path.join(directory, DOCSTORE_FILE)):
+        if os.path.exists(os.path.join(directory, "index.pkl")):
+            raise FileNotFoundError(
+                f"'{directory}'에 예전 pickle 형식(index.pkl) 인덱스만 있습니다. "
+                "'python document_store.py --migrate'로 변환하세요."
+            )
+        raise FileNotFoundError(f"'{directory}'에 {DOCSTORE_FILE}이 없습니다.")
+    with open(os.path.join(directory, INDEX_IDS_FILE), "r", encoding="utf-8") as f:
+        ids = json.load(f)
+    return FAISS(
+        embedding_function=embeddings,
+        index=faiss.read_index(os.path.join(directory, FAISS_FILE)),
+        docstore=LazyDocstore(DocumentStore(os.path.join(directory, DOCSTORE_FILE))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def migrate_legacy_files(index_dir, legacy_documents_path, documents_path):
+    """
+    예전 pickle 파일(preprocessed_documents.pkl, index.pkl)을 새 형식으로 변환합니다.
+    pickle을 읽으므로 직접 만든(신뢰할 수 있는) 파일에만 사용하세요.
+    """
+    import pickle
+    from langchain_community.vectorstores import FAISS
+    from data_preprocessor import document_id_of
+
+    if os.path.exists(legacy_documents_path):
+        with open(legacy_documents_path, "rb") as f:
+            documents = pickle.load(f)
+        write_documents(documents_path, [(document_id_of(doc), doc) for doc in documents])
+        print(f"✅ {legacy_documents_path} -> {documents_path} ({len(documents)}개 문서)")
+    if os.path.exists(os.path.join(index_dir, "index.pkl")):
+        # 임베딩 없이 docstore/매핑만 옮기므로 embeddings 자리는 비워 둡니다.
+        vector_db = FAISS.load_local(index_dir, None, allow_dangerous_deserialization=True)
+        save_vector_store(vector_db, index_dir)
+        print(f"✅ {index_dir}/index.pkl -> {DOCSTORE_FILE}, {INDEX_IDS_FILE} ({len(vector_db.index_to_docstore_id)}개 벡터)")
+
+
+if __name__ == "__main__":
+    from essay_grader import FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH
+
+    parser = argparse.ArgumentParser(description="pickle 문서/인덱스 파일을 JSONL + 오프셋 색인 형식으로 변환합니다.")
+    parser.add_argument("--migrate", action="store_true", help="예전 .pkl 파일을 새 형식으로 변환합니다.")
+    args = parser.parse_args()
+
+    if args.migrate:
+        migrate_legacy_files(FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH.replace(".jsonl", ".pkl"), DOCUMENT_CACHE_PATH)
+    else:
+        store = DocumentStore(DOCUMENT_CACHE_PATH)
+        print(f"{DOCUMENT_CACHE_PATH}: {len(store)}개 문서")
@@ -0,0 +1,182 @@
+# embedding_cache.py (디스크 기반 임베딩 캐시)
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_DIR = "./.cache/embeddings"
+VECTORS_FILE = "vectors.f32"
+KEYS_FILE = "keys.txt"
+# 캐시 항목 수 상한 (768차원 기준 약 150MB). 넘으면 최근에 쓴 항목 COMPACT_RATIO만큼만 남기고 파일을 다시 씁니다.
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+COMPACT_RATIO = 0.8
+
+
+class EmbeddingCache:
+    """
+    (모델 이름, 정규화 여부, 텍스트 해시) -> float32 벡터를 디스크에 저장합니다.
+    - vectors.f32 : 벡터를 행 단위로 이어 붙인 파일 (numpy memmap으로 읽음)
+    - keys.txt    : 각 행의 텍스트 해시를 한 줄씩 기록한 오프셋 색인 (n번째 줄 = n번째 행)
+    두 파일 모두 덧붙이기만 하므로 저장 비용은 새 벡터 수에만 비례합니다.
+    항목이 max_entries를 넘으면 최근에 조회/저장한 항목만 남기도록 두 파일을 다시 씁니다.
+    한 프로세스 안에서의 동시 접근만 보호합니다.
+    """
+
+    def __init__(self, cache_dir, model_name, normalize, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        namespace = hashlib.sha256(f"{model_name}|normalize={normalize}".encode("utf-8")).hexdigest()[:16]
+        self.dir = os.path.join(cache_dir, namespace)
+        os.makedirs(self.dir, exist_ok=True)
+        self._vectors_path = os.path.join(self.dir, VECTORS_FILE)
+        self._keys_path = os.path.join(self.dir, KEYS_FILE)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # 키 -> 행 번호 (최근 사용 순). 중복 키가 있을 수 있으므로 파일의 행 수는 _n_rows로 따로 셉니다.
+        self._rows = OrderedDict()
+        self._n_rows = 0
+        self._dim = None
+        self._memmap = None
+        self.hits = 0
+        self.misses = 0
+        self._load_keys()
+
+    @staticmethod
+    def text_key(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _load_keys(self):
+        if not os.path.exists(self._keys_path):
+            # 키 파일 없이 남은 벡터는 어느 텍스트의 것인지 알 수 없으므로 버립니다 (압축 도중 중단된 경우 등).
+            self._remove_files()
+            return
+        with open(self._keys_path, "r", encoding="ascii") as f:
+            lines = f.read().split("\n")
+        if len(lines) < 2 or not lines[0]:
+            self._remove_files()
+            return
+        # 마지막 줄이 줄바꿈으로 끝나지 않았다면 기록 도중 중단된 키이므로 버립니다.
+        keys = lines[1:-1]
+        self._dim = int(lines[0])
+        row_bytes = 4 * self._dim
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        n_rows = min(len(keys), size // row_bytes)
+        # 벡터/키 기록 사이에 중단됐다면 짝이 맞는 행까지만 남기고 두 파일을 모두 잘라냅니다.
+        # (한쪽에 남은 행이 있으면 이후 덧붙이는 벡터와 키의 행 번호가 어긋납니다)
+        if size != n_rows * row_bytes:
+            os.truncate(self._vectors_path, n_rows * row_bytes)
+        if len(keys) != n_rows or lines[-1]:
+            self._write_keys(keys[:n_rows])
+        self._n_rows = n_rows
+        for row, key in enumerate(keys[:n_rows]):
+            self._rows[key] = row
+
+    def _remove_files(self):
+        for path in (self._vectors_path, self._keys_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _write_keys(self, keys):
+        tmp_path = f"{self._keys_path}.tmp"
+        with open(tmp_path, "w", encoding="ascii") as f:
+            f.write(f"{self._dim}\n" + "".join(f"{key}\n" for key in keys))
+        os.replace(tmp_path, self._keys_path)
+
+    def _vectors(self):
+        if self._memmap is None or self._memmap.shape[0] < self._n_rows:
+            self._memmap = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._n_rows, self._dim))
+        return self._memmap
+
+    def _compact(self):
+        """최근에 쓴 항목만 남기고 두 파일을 다시 씁니다. 중간에 중단되면 다음 로딩 때 캐시가 비워질 뿐 어긋나지는 않습니다."""
+        items = list(self._rows.items())
+        keep = items[len(items) - int(self.max_entries * COMPACT_RATIO):]
+        vectors = np.array(self._vectors()[[row for _, row in keep]], dtype=np.float32)
+        # 열어 둔 memmap을 먼저 놓아야 (Windows에서도) 파일을 바꿔 끼울 수 있습니다.
+        self._memmap = None
+        tmp_vectors = f"{self._vectors_path}.tmp"
+        with open(tmp_vectors, "wb") as f:
+            f.write(vectors.tobytes())
+        # 키 파일을 먼저 지워, 벡터만 바뀐 상태로 중단되면 로딩 시 캐시 전체를 버리게 합니다.
+        os.remove(self._keys_path)
+        os.replace(tmp_vectors, self._vectors_path)
+        self._write_keys([key for key, _ in keep])
+        self._rows = OrderedDict((key, row) for row, (key, _) in enumerate(keep))
+        self._n_rows = len(keep)
+        print(f"[임베딩 캐시] 항목이 {self.max_entries}개를 넘어 최근 {len(keep)}개만 남겼습니다.")
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get_many(self, keys):
+        """캐시에 있는 키만 {키: 벡터(np.ndarray)}로 반환합니다."""
+        with self._lock:
+            found = {}
+            rows = [(key, self._rows[key]) for key in keys if key in self._rows]
+            if rows:
+                vectors = self._vectors()
+                for key, row in rows:
+                    found[key] = np.array(vectors[row])
+                    self._rows.move_to_end(key)
+            self.hits += len(rows)
+            self.misses += len(keys) - len(rows)
+            return found
+
+    def put_many(self, keys, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            new_rows = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._rows]
+            if not new_rows:
+                return
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                with open(self._keys_path, "w", encoding="ascii") as f:
+                    f.write(f"{self._dim}\n")
+            # 벡터를 먼저 기록하고 키를 나중에 기록해, 키가 있으면 벡터도 반드시 있도록 합니다.
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.stack([vector for _, vector in new_rows]).tobytes())
+            with open(self._keys_path, "a", encoding="ascii") as f:
+                f.write("".join(f"{key}\n" for key, _ in new_rows))
+            for offset, (key, _) in enumerate(new_rows):
+                self._rows[key] = self._n_rows + offset
+            self._n_rows += len(new_rows)
+            if len(self._rows) > self.max_entries:
+                self._compact()
+
+    def stats(self):
+        return {"entries": len(self._rows), "hits": self.hits, "misses": self.misses}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    기존 임베딩 모델(HuggingFaceEmbeddings 등)을 감싸, 이미 임베딩한 텍스트는 디스크 캐시에서 바로 돌려줍니다.
+    질의(embed_query)도 같은 캐시를 조회하지만(ko-sbert는 문서/질의를 같은 방식으로 인코딩하므로 같은 키 사용),
+    질의는 매번 달라 다시 쓰일 일이 드물므로 새로 임베딩한 질의 벡터는 저장하지 않습니다.
+    """
+
+    def __init__(self, embeddings, cache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts):
+        keys = [self.cache.text_key(text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            self.cache.put_many(list(missing), new_vectors)
+            found.update(zip(missing, np.asarray(new_vectors, dtype=np.float32)))
+        return [found[key].tolist() for key in keys]
+
+    def embed_query(self, text):
+        key = self.cache.text_key(text)
+        found = self.cache.get_many([key])
+        if key in found:
+            return found[key].tolist()
+        return list(self.embeddings.embed_query(text))
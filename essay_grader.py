@@ -1,55 +1,137 @@
 # essay_grader.py (단순화된 최종 버전)
 
+import asyncio
 import os
+import threading
 from dotenv import load_dotenv
-import pickle
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
-from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from answer_index import ANSWER_TOP_K, CRITERIA_TOP_K, SentenceIndex, format_excerpt
+from chat_memory import ConversationMemory, count_message_tokens, make_summary_executor
+from document_index import DocumentIndex
+from document_store import load_vector_store
+from startup import startup_timer
+from tracing import tracer
+from filtered_retrieval import FilteredRetriever, FilteredSearcher
+from llm_gateway import get_chat_model
+from llm_cache import cached_chat_model, get_default_llm_cache
+from embedding_cache import EMBEDDING_CACHE_DIR, CachedEmbeddings, EmbeddingCache
+from bulk_embedder import BULK_BATCH_SIZE, load_sbert_model
+from index_factory import DEFAULT_INDEX_CONFIG, convert_vector_store, matches_config, set_search_params
+from index_maintenance import (build_index, corpus_fingerprint, index_matches_source, is_index_stale, load_documents, read_fingerprint,
+                               read_source_stamp, record_source_stamp, refresh_index, save_index_atomically, source_stamp)
 
 FAISS_INDEX_DIR = './01_data_preprocessing/faiss'
-DOCUMENT_CACHE_PATH = "./01_data_preprocessing/faiss/preprocessed_documents.pkl"
-
-def safe_retriever_invoke(retriever, query, source_type):
-    docs = retriever.get_relevant_documents(query)
-    # if docs:
-    #     return "\n".join([doc.page_content for doc in docs])
-    for doc in docs:
-        if doc.metadata.get("source_type") == source_type:
-            return doc.page_content
+DOCUMENT_CACHE_PATH = "./01_data_preprocessing/faiss/preprocessed_documents.jsonl"
+SOURCE_TYPES = ("출제의도", "채점기준", "모범답안")
+EMBEDDING_MODEL_NAME = "jhgan/ko-sbert-nli"
+NORMALIZE_EMBEDDINGS = True
+# 인덱스를 처음부터 만들 때 쓸 임베딩 워커 프로세스 수 (1이면 현재 프로세스의 모델 사용)
+BULK_EMBED_WORKERS = int(os.getenv("BULK_EMBED_WORKERS", "1"))
+# FAISS 인덱스 종류(flat / ivf_flat / ivf_pq / hnsw)와 검색 파라미터. 세부 설정은 index_factory.DEFAULT_INDEX_CONFIG
+INDEX_CONFIG = {
+    "index_type": os.getenv("FAISS_INDEX_TYPE", DEFAULT_INDEX_CONFIG["index_type"]),
+    "nprobe": int(os.getenv("FAISS_NPROBE", DEFAULT_INDEX_CONFIG["nprobe"])),
+    "ef_search": int(os.getenv("FAISS_EF_SEARCH", DEFAULT_INDEX_CONFIG["ef_search"])),
+}
+
+def load_embedding_model(use_cache=True):
+    print("임베딩 모델을 로딩합니다... (시간이 좀 걸릴 수 있어요)")
+    model = HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL_NAME,
+        model_kwargs={'device': 'cpu'},
+        encode_kwargs={'normalize_embeddings': NORMALIZE_EMBEDDINGS},
+    )
+    print("✅ 임베딩 모델 로딩 완료.")
+    if use_cache:
+        # 이미 임베딩한 텍스트는 인덱스 재생성/검색 모두 디스크 캐시에서 바로 가져옵니다.
+        model = CachedEmbeddings(model, EmbeddingCache(EMBEDDING_CACHE_DIR, EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS))
+    return model
+
+def bulk_embed_options(n_workers=None):
+    return {
+        "n_workers": n_workers or BULK_EMBED_WORKERS,
+        "batch_size": BULK_BATCH_SIZE,
+        "model_factory": load_sbert_model,
+        "factory_args": (EMBEDDING_MODEL_NAME, NORMALIZE_EMBEDDINGS, BULK_BATCH_SIZE),
+    }
+
+@tracer.traced("retrieval.semantic")
+def safe_retriever_invoke(searcher, query, source_type, **filters):
+    # 의미 기반 질의 전용 (문항 ID 조회는 EssayGrader.lookup_document 사용)
+    # source_type 등 메타데이터로 후보를 먼저 좁히므로, 조건에 맞는 문서가 있으면 항상 찾습니다.
+    results = searcher.search(query, k=1, source_type=source_type, **filters)
+    if results:
+        return results[0][0].page_content
     return "관련 정보를 찾을 수 없습니다."
 
 class EssayGrader:
-    def __init__(self):
+    def __init__(self, llm=None, embedding_model=None, auto_sync_index=True, index_config=None, response_cache=None):
+        # llm / embedding_model을 넘기면 그대로 사용합니다 (오프라인 실행 시 가짜 모델 주입용)
+        # response_cache를 넘기지 않으면 프로세스 공용 LLM 응답 캐시(llm_cache.LLM_CACHE_BACKEND)를, False면 캐시 없이 사용합니다.
         print("논술 첨삭기 초기화를 시작합니다...")
-        self._setup_api_key()
-        self.embedding_model = self._initialize_embedding_model()
-        self.llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.7)
-        
-        if os.path.exists(FAISS_INDEX_DIR):
-            print(f"\n📂 기존 FAISS 인덱스를 '{FAISS_INDEX_DIR}'에서 불러옵니다...")
-            self.vector_db = FAISS.load_local(FAISS_INDEX_DIR, self.embedding_model, allow_dangerous_deserialization=True)
-        else:
-            print(f"\n📄 전처리된 pickle 파일에서 문서를 불러와 FAISS 인덱스를 새로 생성합니다...")
-            with open(DOCUMENT_CACHE_PATH, 'rb') as f:
-                all_documents = pickle.load(f)
-            print(f"✅ 총 {len(all_documents)}개의 문서 조각 로딩 완료!")
-            
-            print("📌 벡터 인덱스 생성 중...")
-            self.vector_db = FAISS.from_documents(all_documents, self.embedding_model)
-            self.vector_db.save_local(FAISS_INDEX_DIR)
-            print(f"✅ FAISS 인덱스를 '{FAISS_INDEX_DIR}'에 저장 완료!")
-
+        # 문항별 검색 결과(채점기준/모범답안/출제의도) 캐시. 인덱스가 바뀌면 _build_document_index에서 비웁니다.
+        self._context_cache = {}
+        self._context_lock = threading.Lock()
+        self._index_version = 0
+        # 멘토 챗봇 대화 요약을 백그라운드에서 처리하는 스레드 (모든 세션이 공유)
+        self._summary_executor = make_summary_executor()
+        # 채점 기준 문장 임베딩 캐시 (채점 기준 원문 -> SentenceIndex). 문항 수만큼만 쌓입니다.
+        self._criteria_indexes = {}
+        self.response_cache = get_default_llm_cache() if response_cache is None else (response_cache or None)
+        self.index_config = {**DEFAULT_INDEX_CONFIG, **INDEX_CONFIG, **(index_config or {})}
+        if llm is None:
+            self._setup_api_key()
+        with startup_timer.measure("ko-sbert", "load"):
+            self.embedding_model = embedding_model or self._initialize_embedding_model()
+        # 학생 답안 문장처럼 한 번 쓰고 마는 텍스트는 디스크 임베딩 캐시에 쌓지 않도록 원래 모델로 임베딩합니다.
+        self._transient_embedding_model = self.embedding_model.embeddings if isinstance(self.embedding_model, CachedEmbeddings) else self.embedding_model
+        with startup_timer.measure("openai client", "load"):
+            # 공용 게이트웨이(연결 풀, 타임아웃, 재시도, 모델별 동시 요청 제한)를 거치는 클라이언트
+            self.llm = llm or get_chat_model("gpt-4o-mini", temperature=0.7)
+        # 측정(GRADER_TRACE)을 켠 경우 LLM 호출마다 토큰 수를 집계합니다.
+        tracer.instrument_llm(self.llm)
+
+        with startup_timer.measure("faiss index", "load"):
+            self._load_vector_db(auto_sync_index)
+            self._apply_index_config()
         self.retriever = self.vector_db.as_retriever()
         print("✅ 벡터 검색기 설정 완료!")
 
+        self._build_document_index()
+
         self.correction_chain = self._build_rag_chain()
         print("✅ AI 논술 첨삭 RAG 체인 완성!")
         print("\n--- 모든 준비 완료! 이제 첨삭을 시작할 수 있습니다. ---")
     
+    def _load_vector_db(self, auto_sync_index):
+        if os.path.exists(os.path.join(FAISS_INDEX_DIR, "index.faiss")):
+            print(f"\n📂 기존 FAISS 인덱스를 '{FAISS_INDEX_DIR}'에서 불러옵니다...")
+            self.vector_db = load_vector_store(FAISS_INDEX_DIR, self.embedding_model)
+            # 전처리 문서 파일의 크기/수정 시각이 저장 때와 같으면 문서를 디코딩하지 않고 넘어갑니다.
+            # 다를 때만 문서를 읽어 코퍼스 지문을 비교하고, 오래된 인덱스이면 변경분만 반영합니다.
+            if os.path.exists(DOCUMENT_CACHE_PATH) and not index_matches_source(FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH):
+                source = source_stamp(DOCUMENT_CACHE_PATH)
+                all_documents = load_documents(DOCUMENT_CACHE_PATH)
+                if is_index_stale(FAISS_INDEX_DIR, all_documents):
+                    if auto_sync_index:
+                        print("⚠️ 전처리 문서가 인덱스와 다릅니다. 변경된 문서만 다시 임베딩합니다...")
+                        refresh_index(self.vector_db, FAISS_INDEX_DIR, all_documents, force=True, source=source)
+                    else:
+                        print("⚠️ FAISS 인덱스가 전처리 문서보다 오래되었습니다. 'python index_maintenance.py'로 갱신하세요.")
+                elif auto_sync_index:
+                    record_source_stamp(FAISS_INDEX_DIR, source)
+        else:
+            print(f"\n📄 전처리된 문서 파일에서 문서를 불러와 FAISS 인덱스를 새로 생성합니다...")
+            source = source_stamp(DOCUMENT_CACHE_PATH)
+            all_documents = load_documents(DOCUMENT_CACHE_PATH)
+            print(f"✅ 총 {len(all_documents)}개의 문서 조각 로딩 완료!")
+
+            self.vector_db = build_index(all_documents, self.embedding_model, self.index_config, **bulk_embed_options())
+            save_index_atomically(self.vector_db, FAISS_INDEX_DIR, corpus_fingerprint(all_documents), source=source)
+
     def _setup_api_key(self):
         load_dotenv()
         if not os.getenv("OPENAI_API_KEY"):
@@ -57,14 +139,84 @@ class EssayGrader:
         print("✅ API 키 로딩 완료.")
 
     def _initialize_embedding_model(self):
-        print("임베딩 모델을 로딩합니다... (시간이 좀 걸릴 수 있어요)")
-        model = HuggingFaceEmbeddings(
-            model_name="jhgan/ko-sbert-nli",
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True},
-        )
-        print("✅ 임베딩 모델 로딩 완료.")
-        return model
+        return load_embedding_model()
+
+    def _apply_index_config(self):
+        # 저장된 인덱스 종류가 설정과 다르면 저장된 벡터로 다시 학습해 바꾸고 저장합니다.
+        if not matches_config(self.vector_db.index, self.index_config):
+            convert_vector_store(self.vector_db, self.index_config)
+            # 코퍼스가 작아 flat으로 대체된 경우에는 저장하지 않습니다 (시작할 때마다 다시 확인).
+            if matches_config(self.vector_db.index, self.index_config):
+                save_index_atomically(self.vector_db, FAISS_INDEX_DIR, read_fingerprint(FAISS_INDEX_DIR), source=read_source_stamp(FAISS_INDEX_DIR))
+        self.set_search_params(self.index_config["nprobe"], self.index_config["ef_search"])
+
+    def set_search_params(self, nprobe=None, ef_search=None):
+        """근사 인덱스의 검색 정확도/속도를 조절합니다. (IVF: nprobe, HNSW: efSearch)"""
+        set_search_params(self.vector_db.index, nprobe=nprobe, ef_search=ef_search)
+
+    def _build_document_index(self):
+        self.document_index = DocumentIndex.from_docstore(self.vector_db.docstore)
+        self.searcher = FilteredSearcher(self.vector_db, self.document_index)
+        with self._context_lock:
+            self._index_version += 1
+            self._context_cache.clear()
+        print(f"✅ 문서 메타데이터 인덱스 생성 완료! ({len(self.document_index)}개 문서)")
+
+    def refresh_index(self, force=False):
+        """
+        전처리 문서(preprocessed_documents.jsonl)와 FAISS 인덱스를 동기화합니다.
+        바뀐 문서만 다시 임베딩하고, 메타데이터 인덱스도 새로 만듭니다.
+        """
+        source = source_stamp(DOCUMENT_CACHE_PATH)
+        all_documents = load_documents(DOCUMENT_CACHE_PATH)
+        stats = refresh_index(self.vector_db, FAISS_INDEX_DIR, all_documents, force=force, source=source)
+        if stats is not None:
+            self._build_document_index()
+        return stats
+
+    def search_documents(self, query, k=4, **filters):
+        """
+        메타데이터 조건(university / year / source_type / question_id)에 맞는 문서 중에서만 의미 검색합니다.
+        예: search_documents("시장 실패", university="ajou", year="2024")
+        """
+        return [doc for doc, _ in self.searcher.search(query, k=k, **filters)]
+
+    def as_filtered_retriever(self, k=4, **filters):
+        return FilteredRetriever(searcher=self.searcher, k=k, filters=filters)
+
+    def lookup_document(self, question_id: str, source_type: str) -> str:
+        doc = self.document_index.get(question_id, source_type)
+        if doc is None:
+            return "관련 정보를 찾을 수 없습니다."
+        return doc.page_content
+
+    @tracer.traced("retrieval.question_context")
+    def get_question_context(self, question_id: str) -> dict:
+        """
+        한 문항의 검색 결과를 캐시에서 반환합니다. 학생이 바뀌어도 같은 문항이면 다시 조회하지 않습니다.
+        - "retrieved_scoring_criteria" / "retrieved_model_answer" : 첨삭 체인 입력
+        - "documents" : {source_type: 본문} (화면 표시용, 없으면 안내 문구)
+        """
+        with self._context_lock:
+            context = self._context_cache.get(question_id)
+            version = self._index_version
+        if context is not None:
+            return context
+
+        docs = self.document_index.get_question(question_id)
+        context = {
+            "retrieved_scoring_criteria": docs["채점기준"].page_content if "채점기준" in docs else "관련 정보를 찾을 수 없습니다.",
+            "retrieved_model_answer": docs["모범답안"].page_content if "모범답안" in docs else "관련 정보를 찾을 수 없습니다.",
+            "documents": {
+                source_type: docs[source_type].page_content if source_type in docs else f"{source_type}을(를) 찾을 수 없습니다."
+                for source_type in SOURCE_TYPES
+            },
+        }
+        with self._context_lock:
+            # 조회하는 동안 인덱스가 갱신됐다면 예전 결과는 캐시에 넣지 않습니다.
+            if version == self._index_version:
+                self._context_cache[question_id] = context
+        return context
 
     def _build_rag_chain(self):
         output_parser = StrOutputParser()
@@ -107,19 +259,32 @@ class EssayGrader:
         ---
         """
         prompt = ChatPromptTemplate.from_template(prompt_template)
+        # 검색 결과가 이미 채워진 입력으로 첨삭문만 생성하는 체인
+        # 같은 문항에 같은 답안이면 LLM을 다시 부르지 않고 캐시된 첨삭문을 돌려줍니다.
+        self.grading_chain = prompt | cached_chat_model(self.llm, self.response_cache) | output_parser
         chain = (
-            {
-                "retrieved_model_answer": RunnableLambda(lambda x: safe_retriever_invoke(self.retriever, x["question_id"], "모범답안")),
-                "retrieved_scoring_criteria": RunnableLambda(lambda x: safe_retriever_invoke(self.retriever, x["question_id"], "채점기준")),
-                "user_ocr_answer": lambda x: x["user_ocr_answer"],
-                "question_id": lambda x: x["question_id"]
-            }
-            | prompt
-            | self.llm
-            | output_parser
+            # 문항 ID는 의미 검색 대상이 아니므로 문항별 캐시(없으면 키 인덱스)에서 바로 가져옵니다 (임베딩 호출 없음)
+            self._context_runnable()
+            | self.grading_chain
         )
         return chain
 
+    def _context_runnable(self):
+        # 캐시 조회는 블로킹이 없으므로 async 경로에서도 스레드 풀을 거치지 않고 바로 실행합니다.
+        def with_context(x):
+            context = self.get_question_context(x["question_id"])
+            return {
+                **x,
+                "retrieved_model_answer": context["retrieved_model_answer"],
+                "retrieved_scoring_criteria": context["retrieved_scoring_criteria"],
+            }
+
+        async def awith_context(x):
+            return with_context(x)
+
+        return RunnableLambda(with_context, afunc=awith_context)
+
+    @tracer.traced("chain.invoke", request="grade")
     def grade_essay(self, question_id: str, student_answer: str) -> str:
         print(f"'{question_id}'에 대한 첨삭을 시작합니다...")
         return self.correction_chain.invoke({
@@ -127,11 +292,69 @@ class EssayGrader:
             "user_ocr_answer": student_answer
         })
 
+    @tracer.traced("chain.stream", request="grade")
+    def stream_grade_essay(self, question_id: str, student_answer: str):
+        # 첨삭문을 토큰 단위로 내보내는 제너레이터 (첫 글자가 나오기까지의 대기 시간을 줄이기 위함)
+        print(f"'{question_id}'에 대한 스트리밍 첨삭을 시작합니다...")
+        yield from self.correction_chain.stream({
+            "question_id": question_id,
+            "user_ocr_answer": student_answer
+        })
+
+    @tracer.traced("chain.astream", request="grade")
+    async def astream_grade_essay(self, question_id: str, student_answer: str):
+        print(f"'{question_id}'에 대한 비동기 스트리밍 첨삭을 시작합니다...")
+        async for token in self.correction_chain.astream({
+            "question_id": question_id,
+            "user_ocr_answer": student_answer
+        }):
+            yield token
+
+    @tracer.traced("chain.ainvoke", request="grade")
+    async def agrade_essay(self, question_id: str, student_answer: str) -> str:
+        # grade_essay의 비동기 버전 (호출 스레드를 막지 않으므로 비동기 서버에서 여러 첨삭을 동시에 처리할 수 있습니다)
+        print(f"'{question_id}'에 대한 비동기 첨삭을 시작합니다...")
+        return await self.correction_chain.ainvoke({
+            "question_id": question_id,
+            "user_ocr_answer": student_answer
+        })
+
+    @tracer.traced("chain.batch", request="grade_batch")
+    def grade_essays_batch(self, question_id: str, answers: list, max_concurrency: int = 8) -> list:
+        """
+        한 문항에 대한 여러 학생 답안을 동시에 첨삭합니다.
+        검색(채점기준/모범답안)은 문항당 한 번만 수행하고, LLM 호출은 max_concurrency개씩 병렬로 보냅니다.
+        결과는 입력 순서대로 {"index", "result", "error"} 딕셔너리 목록으로 반환합니다.
+        """
+        print(f"'{question_id}'에 대한 일괄 첨삭을 시작합니다... (답안 {len(answers)}개, 동시 요청 {max_concurrency}개)")
+        inputs = [{"question_id": question_id, "user_ocr_answer": answer} for answer in answers]
+        outputs = self.correction_chain.batch(
+            inputs,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+
+        results = []
+        for index, output in enumerate(outputs):
+            if isinstance(output, Exception):
+                print(f"[BATCH-ERROR] {index}번 답안 첨삭 실패: {output}")
+                results.append({"index": index, "result": None, "error": str(output)})
+            else:
+                results.append({"index": index, "result": output, "error": None})
+        return results
+
+    @tracer.traced("get_document_content")
     def get_document_content(self, question_id: str, source_type: str) -> str:
-        for doc in self.vector_db.docstore._dict.values():
-            if doc.metadata.get("question_id") == question_id and doc.metadata.get("source_type") == source_type:
-                return doc.page_content
-        return f"{source_type}을(를) 찾을 수 없습니다."
+        if source_type in SOURCE_TYPES:
+            return self.get_question_context(question_id)["documents"][source_type]
+        doc = self.document_index.get(question_id, source_type)
+        if doc is None:
+            return f"{source_type}을(를) 찾을 수 없습니다."
+        return doc.page_content
+
+    def get_question_documents(self, question_id: str) -> dict:
+        # 한 문항의 채점기준/모범답안/출제의도를 한 번에 가져옵니다 (문항별 캐시 사용).
+        return dict(self.get_question_context(question_id)["documents"])
     
     # Documents 검색 출력용
     # def get_document_content(self, question_id: str, source_type: str) -> str:
@@ -150,7 +373,26 @@ class EssayGrader:
 
     #     return f"{source_type}을(를) 찾을 수 없습니다."
 
-    def mento_chat(self, grading_criteria: str, sample_answer: str, user_answer: str, followup_question: str, history=[]) -> str:
+    def new_chat_memory(self, **kwargs) -> ConversationMemory:
+        """채팅 세션마다 하나씩 만들어 mento_chat(memory=...)에 넘깁니다. (예: st.session_state.chat_memory)"""
+        return ConversationMemory(self.llm, self._summary_executor, **kwargs)
+
+    @tracer.traced("answer_index.build")
+    def build_answer_index(self, user_answer: str) -> SentenceIndex:
+        """학생 답안을 문장 단위로 임베딩합니다. OCR 직후 한 번 만들어 extracted_text와 함께 보관하세요."""
+        return SentenceIndex.build(user_answer, self._transient_embedding_model)
+
+    def _criteria_index(self, grading_criteria: str) -> SentenceIndex:
+        with self._context_lock:
+            cached = self._criteria_indexes.get(grading_criteria)
+        if cached is None:
+            cached = SentenceIndex.build(grading_criteria, self.embedding_model)
+            with self._context_lock:
+                self._criteria_indexes[grading_criteria] = cached
+        return cached
+
+    @tracer.traced("prompt_build.chat")
+    def _build_mento_messages(self, grading_criteria: str, sample_answer: str, user_answer: str, followup_question: str, history=[], memory=None, answer_index=None) -> list:
     #     prompt = f"""
     # [역할]
     # 당신은 대치동에서 10년간 논술을 가르친, 냉철하지만 애정 어린 조언을 아끼지 않는 스타강사 '논리왕 김멘토'입니다.
@@ -195,6 +437,9 @@ class EssayGrader:
 
 {user_answer}
 
+[채점 기준 발췌]
+{criteria_excerpt}
+
 [학생 질문]
 {followup_question}
 
@@ -219,12 +464,55 @@ class EssayGrader:
 
 [답변]
 """
-        messages = [{"role": "system", "content": "당신은 10년 이상 수능 및 대학 논술을 전문적으로 가르쳐온 첨삭 전문가입니다. 학생의 질문에 대해 학생이 작성한 논술 문장을 바탕으로 명확하고 구체적인 피드백을 제공합니다."}]
-        messages.append({"role": "user", "content": prompt})
-        for h in history:
-            messages.append({"role": "user", "content": h["user"]})
-            messages.append({"role": "assistant", "content": h["assistant"]})
-
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.7)
-        return llm.invoke(messages).content.strip()
+        # 답안 전체 대신 질문과 관련된 답안 문장 / 채점 기준 문장만 넣어 프롬프트 크기를 일정하게 유지합니다.
+        if answer_index is None or not answer_index.matches(user_answer):
+            answer_index = self.build_answer_index(user_answer)
+        query_vector = self.embedding_model.embed_query(followup_question)
+        prompt = prompt.format(
+            user_answer=format_excerpt(answer_index.top_k(query_vector, ANSWER_TOP_K), "(인식된 학생 답안이 없습니다.)"),
+            criteria_excerpt=format_excerpt(self._criteria_index(grading_criteria or "").top_k(query_vector, CRITERIA_TOP_K), "(채점 기준 없음)"),
+            followup_question=followup_question,
+        )
+        system_message = {"role": "system", "content": "당신은 10년 이상 수능 및 대학 논술을 전문적으로 가르쳐온 첨삭 전문가입니다. 학생의 질문에 대해 학생이 작성한 논술 문장을 바탕으로 명확하고 구체적인 피드백을 제공합니다."}
+        request_message = {"role": "user", "content": prompt}
+        # 이전 대화는 토큰 예산 안에서 (요약 + 최근 턴)으로 넣습니다. memory가 없으면 요약 없이 최근 턴만 넣습니다.
+        memory = memory or ConversationMemory(self.llm, None)
+        reserved = count_message_tokens([system_message, request_message])
+        return [system_message, *memory.history_messages(history, reserved_tokens=reserved), request_message]
+
+    def _invoke_llm(self, messages) -> str:
+        if self.response_cache is None:
+            return self.llm.invoke(messages).content
+        return self.response_cache.invoke(self.llm, messages)
+
+    async def _ainvoke_llm(self, messages) -> str:
+        if self.response_cache is None:
+            return (await self.llm.ainvoke(messages)).content
+        return await self.response_cache.ainvoke(self.llm, messages)
+
+    def response_cache_stats(self) -> dict:
+        """LLM 응답 캐시 적중률 (캐시를 끈 경우 빈 딕셔너리)"""
+        return self.response_cache.stats() if self.response_cache is not None else {}
+
+    @tracer.traced("llm.chat", request="chat")
+    def mento_chat(self, grading_criteria: str, sample_answer: str, user_answer: str, followup_question: str, history=[], memory=None, answer_index=None) -> str:
+        # 요청마다 클라이언트를 새로 만들지 않고 첨삭용 LLM(동일 모델/temperature)을 공유합니다.
+        # answer_index: build_answer_index(user_answer) 결과. 없거나 다른 답안의 것이면 여기서 새로 만듭니다.
+        messages = self._build_mento_messages(grading_criteria, sample_answer, user_answer, followup_question, history, memory, answer_index)
+        answer = self._invoke_llm(messages).strip()
+        if memory is not None:
+            # 학생이 답변을 읽는 동안 최근 턴 밖으로 밀려난 대화를 백그라운드에서 요약해 둡니다.
+            memory.update([*history, {"user": followup_question, "assistant": answer}])
+        return answer
+
+    @tracer.traced("llm.achat", request="chat")
+    async def amento_chat(self, grading_criteria: str, sample_answer: str, user_answer: str, followup_question: str, history=[], memory=None, answer_index=None) -> str:
+        # mento_chat의 비동기 버전
+        # 메시지 구성(답안 문장/질문 임베딩)은 CPU를 오래 쓰므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        messages = await asyncio.to_thread(self._build_mento_messages, grading_criteria, sample_answer, user_answer, followup_question, history, memory, answer_index)
+        answer = (await self._ainvoke_llm(messages)).strip()
+        if memory is not None:
+            memory.update([*history, {"user": followup_question, "assistant": answer}])
+        return answer
+
 
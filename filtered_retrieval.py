@@ -0,0 +1,77 @@
+# filtered_retrieval.py (메타데이터로 후보를 먼저 좁힌 뒤 벡터 검색)
+
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from index_factory import reconstruct_rows, selector_search_params
+
+# 후보가 이 수 이하이면 후보 벡터만 꺼내 직접 거리를 계산합니다 (IVF/HNSW여도 빠짐없이 정확하게).
+# 더 많으면 faiss ID 선택자로 인덱스 검색 중에 후보 밖의 벡터를 건너뜁니다.
+EXACT_RESCORE_LIMIT = 4096
+
+
+class FilteredSearcher:
+    """
+    DocumentIndex의 메타데이터 역색인(university / year / source_type / question_id)으로
+    후보 문서를 먼저 고른 뒤, 그 후보들만 벡터 점수를 매깁니다.
+    전체 top-k를 뽑은 뒤 파이썬에서 거르는 방식과 달리 조건에 맞는 문서가 있으면 항상 k개를 채웁니다.
+    """
+
+    def __init__(self, vector_db, document_index):
+        self.vector_db = vector_db
+        self.document_index = document_index
+        self._positions = {docstore_id: pos for pos, docstore_id in vector_db.index_to_docstore_id.items()}
+
+    def candidate_positions(self, **filters):
+        doc_ids = self.document_index.filter_ids(**filters)
+        return np.array(sorted(self._positions[doc_id] for doc_id in doc_ids), dtype=np.int64)
+
+    def search(self, query, k=4, **filters):
+        """질의문으로 검색합니다. 반환값: [(문서, L2 거리)] (가까운 순)"""
+        query_vector = self.vector_db.embeddings.embed_query(query)
+        return self.search_by_vector(query_vector, k=k, **filters)
+
+    def search_by_vector(self, query_vector, k=4, **filters):
+        index = self.vector_db.index
+        query = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+        if not any(value is not None for value in filters.values()):
+            distances, positions = index.search(query, k)
+            return self._to_documents(positions[0], distances[0])
+
+        candidates = self.candidate_positions(**filters)
+        if len(candidates) == 0:
+            return []
+        if len(candidates) <= EXACT_RESCORE_LIMIT:
+            distances = ((reconstruct_rows(index, candidates) - query) ** 2).sum(axis=1)
+            top = np.argsort(distances)[:k] if len(candidates) <= k else np.argpartition(distances, k)[:k]
+            top = top[np.argsort(distances[top])]
+            return self._to_documents(candidates[top], distances[top])
+
+        selector = faiss.IDSelectorBatch(candidates)
+        distances, positions = index.search(query, k, params=selector_search_params(index, selector))
+        return self._to_documents(positions[0], distances[0])
+
+    def _to_documents(self, positions, distances):
+        results = []
+        for pos, distance in zip(positions, distances):
+            if pos < 0:  # faiss는 결과가 k개보다 적으면 -1로 채웁니다.
+                continue
+            doc = self.vector_db.docstore.search(self.vector_db.index_to_docstore_id[int(pos)])
+            results.append((doc, float(distance)))
+        return results
+
+
+class FilteredRetriever(BaseRetriever):
+    """FilteredSearcher를 LangChain 체인에서 쓰기 위한 검색기. 예: grader.as_filtered_retriever(university="ajou")"""
+
+    searcher: Any
+    k: int = 4
+    filters: Dict[str, Any] = {}
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return [doc for doc, _ in self.searcher.search(query, k=self.k, **self.filters)]
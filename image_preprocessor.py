@@ -0,0 +1,145 @@
+# image_preprocessor.py (OCR 전 이미지 전처리)
+
+import io
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# 휴대폰으로 찍은 12MP 이상 답안 사진을 OCR에 적당한 크기/형태로 줄이기 위한 기본 설정
+DEFAULT_PREPROCESS_CONFIG = {
+    "target_long_edge": 2048,   # 긴 변 기준 최대 픽셀 수 (0이면 리사이즈 안 함)
+    "grayscale": True,
+    "binarize": False,          # 적응형 이진화 결과를 그대로 OCR에 넘길지 여부 (기울기/여백 계산에는 항상 사용)
+    "block_size": 31,           # 적응형 임계값 계산 창 크기 (홀수)
+    "threshold_offset": 10,     # 지역 평균보다 이 값 이상 어두우면 글자로 판단
+    "deskew": True,
+    "max_skew_angle": 5.0,
+    "skew_angle_step": 0.5,
+    "crop_margins": True,
+    "margin_padding": 20,
+}
+_DESKEW_LONG_EDGE = 800
+_PREPROCESS_CACHE_SIZE = 8
+
+
+def _resize(image, target_long_edge):
+    long_edge = max(image.size)
+    if not target_long_edge or long_edge <= target_long_edge:
+        return image
+    scale = target_long_edge / long_edge
+    new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(new_size, Image.LANCZOS)
+
+
+def _to_gray(rgb):
+    return rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+
+
+def _adaptive_ink_mask(gray, block_size, offset):
+    # 적분 영상으로 block_size x block_size 지역 평균을 한 번에 계산합니다.
+    block_size = block_size | 1
+    pad = block_size // 2
+    padded = np.pad(gray, pad, mode="edge")
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.float64)
+    integral[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+    window_sum = (
+        integral[block_size:, block_size:]
+        - integral[:-block_size, block_size:]
+        - integral[block_size:, :-block_size]
+        + integral[:-block_size, :-block_size]
+    )
+    local_mean = window_sum / (block_size * block_size)
+    return gray < local_mean - offset
+
+
+def _estimate_skew(mask, max_angle, step):
+    # 글자 줄이 수평일 때 행 방향 투영(row profile)의 굴곡이 가장 커지는 각도를 찾습니다.
+    if not mask.any():
+        return 0.0
+    small = _resize(Image.fromarray(mask.astype(np.uint8) * 255), _DESKEW_LONG_EDGE)
+
+    def profile_score(angle):
+        rotated = np.asarray(small.rotate(angle, resample=Image.NEAREST, fillcolor=0), dtype=np.float32)
+        return float(np.square(np.diff(rotated.sum(axis=1))).sum())
+
+    # 0도보다 확실히 나은 각도가 있을 때만 회전합니다.
+    best_angle, best_score = 0.0, profile_score(0.0)
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        score = profile_score(float(angle))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def _crop_box(mask, padding):
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return None
+    top = max(0, rows[0] - padding)
+    bottom = min(mask.shape[0], rows[-1] + 1 + padding)
+    left = max(0, cols[0] - padding)
+    right = min(mask.shape[1], cols[-1] + 1 + padding)
+    return top, bottom, left, right
+
+
+def preprocess_image(image, config=None):
+    """
+    PIL 이미지를 OCR에 넘길 RGB numpy 배열로 전처리합니다.
+    리사이즈 -> 그레이스케일 -> 적응형 이진화 -> 기울기 보정 -> 여백 자르기 순서로 진행합니다.
+    """
+    config = {**DEFAULT_PREPROCESS_CONFIG, **(config or {})}
+
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    image = _resize(image, config["target_long_edge"])
+    rgb = np.asarray(image, dtype=np.float32)
+    if not (config["grayscale"] or config["binarize"] or config["deskew"] or config["crop_margins"]):
+        return rgb.astype(np.uint8)
+
+    gray = _to_gray(rgb)
+    mask = _adaptive_ink_mask(gray, config["block_size"], config["threshold_offset"])
+
+    if config["deskew"]:
+        angle = _estimate_skew(mask, config["max_skew_angle"], config["skew_angle_step"])
+        if abs(angle) >= config["skew_angle_step"] / 2:
+            gray = np.asarray(
+                Image.fromarray(gray.astype(np.uint8)).rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255),
+                dtype=np.float32,
+            )
+            mask = np.asarray(
+                Image.fromarray(mask.astype(np.uint8) * 255).rotate(angle, resample=Image.NEAREST, expand=True, fillcolor=0)
+            ) > 0
+            if not config["grayscale"]:
+                rgb = np.asarray(
+                    Image.fromarray(rgb.astype(np.uint8)).rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=(255, 255, 255)),
+                    dtype=np.float32,
+                )
+
+    if config["crop_margins"]:
+        box = _crop_box(mask, config["margin_padding"])
+        if box is not None:
+            top, bottom, left, right = box
+            gray, mask, rgb = gray[top:bottom, left:right], mask[top:bottom, left:right], rgb[top:bottom, left:right]
+
+    if config["binarize"]:
+        out = np.where(mask, 0, 255).astype(np.uint8)
+    elif config["grayscale"]:
+        out = np.clip(gray, 0, 255).astype(np.uint8)
+    else:
+        return np.ascontiguousarray(rgb.astype(np.uint8))
+    # PaddleOCR은 3채널 입력을 기대하므로 회색조를 RGB로 복제합니다.
+    return np.repeat(out[..., None], 3, axis=2)
+
+
+def preprocess_image_bytes(image_bytes, config=None):
+    """이미지 바이트를 전처리합니다. 같은 이미지 + 설정 조합은 최근 몇 개까지 결과를 재사용합니다."""
+    config_items = tuple(sorted({**DEFAULT_PREPROCESS_CONFIG, **(config or {})}.items()))
+    return _preprocess_cached(image_bytes, config_items)
+
+
+@lru_cache(maxsize=_PREPROCESS_CACHE_SIZE)
+def _preprocess_cached(image_bytes, config_items):
+    array = preprocess_image(Image.open(io.BytesIO(image_bytes)), dict(config_items))
+    array.setflags(write=False)  # 캐시된 배열을 여러 호출이 공유하므로 읽기 전용으로 둡니다.
+    return array
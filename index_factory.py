@@ -0,0 +1,164 @@
+# index_factory.py (FAISS 인덱스 종류 선택: flat / IVF-Flat / IVF-PQ / HNSW)
+
+import math
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+# 코퍼스가 커졌을 때 메모리/검색 시간을 줄이기 위한 근사 인덱스 설정. 기본은 지금처럼 정확한(flat) 검색입니다.
+DEFAULT_INDEX_CONFIG = {
+    "index_type": "flat",
+    "nlist": None,       # IVF 클러스터 수 (None이면 4*sqrt(벡터 수))
+    "nprobe": 8,         # IVF 검색 시 살펴볼 클러스터 수 (클수록 정확하고 느림)
+    "pq_m": 16,          # PQ 부분 벡터 수 (임베딩 차원의 약수여야 함)
+    "pq_nbits": 8,       # 부분 벡터당 코드 비트 수
+    "hnsw_m": 32,        # HNSW 노드당 이웃 수
+    "ef_search": 64,     # HNSW 검색 시 후보 목록 크기 (클수록 정확하고 느림)
+}
+# faiss k-means는 클러스터(중심) 하나당 최소 39개의 학습 벡터를 요구합니다.
+MIN_POINTS_PER_CENTROID = 39
+
+
+def effective_nlist(config, n_vectors):
+    """실제로 쓰일 IVF 클러스터 수. 벡터가 적으면 클러스터당 MIN_POINTS_PER_CENTROID개가 되도록 줄입니다."""
+    nlist = config["nlist"] or max(1, int(4 * math.sqrt(n_vectors)))
+    return min(nlist, n_vectors // MIN_POINTS_PER_CENTROID)
+
+
+def _factory_string(config, dim, n_vectors):
+    index_type = config["index_type"]
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{config['hnsw_m']}"
+
+    nlist = effective_nlist(config, n_vectors)
+    if index_type == "ivf_pq":
+        if dim % config["pq_m"]:
+            raise ValueError(f"pq_m({config['pq_m']})은 임베딩 차원({dim})의 약수여야 합니다.")
+        if n_vectors < MIN_POINTS_PER_CENTROID * 2 ** config["pq_nbits"]:
+            return None
+    if nlist < 1:
+        return None
+    return f"IVF{nlist},Flat" if index_type == "ivf_flat" else f"IVF{nlist},PQ{config['pq_m']}x{config['pq_nbits']}"
+
+
+def build_ann_index(vectors, config=None):
+    """
+    벡터 행렬(n x dim)로 설정에 맞는 FAISS 인덱스를 만들어 학습/추가까지 마칩니다.
+    학습에 필요한 벡터 수보다 코퍼스가 작으면 flat 인덱스로 대신 만듭니다.
+    """
+    config = {**DEFAULT_INDEX_CONFIG, **(config or {})}
+    if config["index_type"] not in INDEX_TYPES:
+        raise ValueError(f"알 수 없는 인덱스 종류입니다: {config['index_type']} (가능: {', '.join(INDEX_TYPES)})")
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n_vectors, dim = vectors.shape
+
+    factory_string = _factory_string(config, dim, n_vectors)
+    if factory_string is None:
+        print(f"⚠️ 벡터 {n_vectors}개로는 {config['index_type']} 인덱스를 학습하기에 부족해 flat 인덱스를 사용합니다.")
+        factory_string = "Flat"
+    elif config["index_type"] in ("ivf_flat", "ivf_pq") and config["nlist"] and effective_nlist(config, n_vectors) < config["nlist"]:
+        print(f"⚠️ 벡터 {n_vectors}개로는 nlist={config['nlist']}을 학습할 수 없어 {effective_nlist(config, n_vectors)}개 클러스터로 줄입니다.")
+    index = faiss.index_factory(dim, factory_string, faiss.METRIC_L2)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    set_search_params(index, nprobe=config["nprobe"], ef_search=config["ef_search"])
+    return index
+
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """IVF의 nprobe / HNSW의 efSearch를 바꿉니다. 해당하지 않는 값은 무시합니다."""
+    index = faiss.downcast_index(index)
+    if nprobe is not None and isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(nprobe, index.nlist)
+    if ef_search is not None and isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+
+
+def index_config_of(index):
+    """저장된 인덱스에서 설정을 거꾸로 읽어옵니다. (불러온 인덱스 종류가 설정과 같은지 비교할 때 사용)"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return {"index_type": "ivf_pq", "nlist": index.nlist, "nprobe": index.nprobe,
+                "pq_m": index.pq.M, "pq_nbits": index.pq.nbits}
+    if isinstance(index, faiss.IndexIVFFlat):
+        return {"index_type": "ivf_flat", "nlist": index.nlist, "nprobe": index.nprobe}
+    if isinstance(index, faiss.IndexHNSW):
+        return {"index_type": "hnsw", "hnsw_m": index.hnsw.nb_neighbors(1), "ef_search": index.hnsw.efSearch}
+    return {"index_type": "flat"}
+
+
+def matches_config(index, config):
+    """인덱스 구조가 설정과 같으면 True. (nprobe/efSearch처럼 검색 시점 값은 비교하지 않습니다)"""
+    config = {**DEFAULT_INDEX_CONFIG, **(config or {})}
+    current = index_config_of(index)
+    if current["index_type"] != config["index_type"]:
+        return False
+    structural = {"ivf_flat": ("nlist",), "ivf_pq": ("nlist", "pq_m", "pq_nbits"), "hnsw": ("hnsw_m",)}
+    # nlist는 벡터 수에 맞춰 줄여 만들었을 수 있으므로 실제로 쓰였을 값과 비교합니다 (안 그러면 시작할 때마다 다시 학습).
+    expected = {**config, "nlist": config["nlist"] and effective_nlist(config, index.ntotal)}
+    return all(expected[key] is None or current[key] == expected[key] for key in structural.get(config["index_type"], ()))
+
+
+def _ensure_direct_map(index):
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and ivf.direct_map.type == faiss.DirectMap.NoMap:
+        # Array 대신 Hashtable 방식으로 만들어야 remove_ids(증분 삭제)도 계속 쓸 수 있습니다.
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+
+
+def reconstruct_vectors(index):
+    """인덱스에 저장된 벡터를 행 순서대로 꺼냅니다. (PQ 인덱스는 압축된 근사값)"""
+    _ensure_direct_map(index)
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def reconstruct_rows(index, positions):
+    """지정한 행 번호들의 벡터만 꺼냅니다."""
+    _ensure_direct_map(index)
+    return index.reconstruct_batch(np.asarray(positions, dtype=np.int64))
+
+
+def selector_search_params(index, selector):
+    """ID 선택자(selector)를 인덱스 종류에 맞는 검색 파라미터에 담아 돌려줍니다. (현재 nprobe/efSearch 유지)"""
+    downcast = faiss.downcast_index(index)
+    if isinstance(downcast, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=downcast.nprobe)
+    if isinstance(downcast, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=downcast.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def convert_vector_store(vector_db, config):
+    """LangChain FAISS 벡터 스토어의 인덱스를 설정한 종류로 바꿉니다. 행 순서가 그대로라 docstore 매핑은 유지됩니다."""
+    vector_db.index = build_ann_index(reconstruct_vectors(vector_db.index), config)
+    print(f"✅ FAISS 인덱스를 {index_config_of(vector_db.index)['index_type']} 형식으로 변환 완료! ({vector_db.index.ntotal}개 벡터)")
+
+
+def remove_from_store(vector_db, docstore_ids):
+    """
+    벡터 스토어에서 문서를 지우고 행 번호 매핑(index_to_docstore_id)을 0..n-1로 다시 맞춥니다.
+    Flat만 faiss remove_ids(뒤 행이 앞으로 당겨짐)가 LangChain FAISS.delete의 행 번호 재배치와 맞습니다.
+    IVF는 remove_ids 후에도 원래 행 번호(label)를 그대로 두고, HNSW는 삭제를 지원하지 않으므로
+    남은 벡터로 인덱스를 다시 채웁니다. (IVF는 학습된 클러스터를 그대로 써서 다시 학습하지 않습니다)
+    """
+    if isinstance(faiss.downcast_index(vector_db.index), faiss.IndexFlat):
+        vector_db.delete(docstore_ids)
+        return
+    removed = set(docstore_ids)
+    keep = [pos for pos in range(vector_db.index.ntotal) if vector_db.index_to_docstore_id[pos] not in removed]
+    vectors = reconstruct_vectors(vector_db.index)[keep]
+    ivf = faiss.try_extract_index_ivf(vector_db.index)
+    if ivf is not None:
+        index = faiss.clone_index(vector_db.index)
+        index.reset()
+        index.add(vectors)
+        set_search_params(index, nprobe=ivf.nprobe)
+    else:
+        index = build_ann_index(vectors, index_config_of(vector_db.index))
+    vector_db.index = index
+    vector_db.docstore.delete(list(removed))
+    vector_db.index_to_docstore_id = {new: vector_db.index_to_docstore_id[old] for new, old in enumerate(keep)}
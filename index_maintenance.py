@@ -0,0 +1,239 @@
+# index_maintenance.py (FAISS 인덱스 증분 갱신)
+
+import os
+import json
+import hashlib
+import argparse
+from data_preprocessor import document_id_of, make_document_id
+from bulk_embedder import build_faiss_index_bulk
+from document_store import DOCSTORE_FILE, VECTOR_STORE_FILES, DocumentStore, load_vector_store, reopen_docstore, replace_file, save_vector_store
+from index_factory import convert_vector_store, matches_config, remove_from_store
+
+FINGERPRINT_FILE = "corpus_fingerprint.json"
+
+
+def corpus_fingerprint(documents):
+    """전처리된 문서 전체(ID, 본문, 메타데이터)에 대한 해시. 문서가 하나라도 바뀌면 값이 달라집니다."""
+    digest = hashlib.sha256()
+    for doc in sorted(documents, key=document_id_of):
+        digest.update(document_id_of(doc).encode("utf-8"))
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(json.dumps(doc.metadata, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def source_stamp(document_path):
+    """전처리 문서 파일의 [크기, 수정 시각(ns)]. 문서를 디코딩하지 않고 코퍼스 파일이 바뀌었는지 확인하는 데 씁니다."""
+    stat = os.stat(document_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_fingerprint_file(index_dir):
+    path = os.path.join(index_dir, FINGERPRINT_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_fingerprint_file(index_dir, data):
+    tmp_path = os.path.join(index_dir, f"{FINGERPRINT_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, os.path.join(index_dir, FINGERPRINT_FILE))
+
+
+def read_fingerprint(index_dir):
+    return _read_fingerprint_file(index_dir).get("fingerprint")
+
+
+def read_source_stamp(index_dir):
+    return _read_fingerprint_file(index_dir).get("source")
+
+
+def record_source_stamp(index_dir, stamp):
+    """내용은 같은데 파일만 다시 쓰인 경우, 다음부터 빠른 확인이 통과하도록 지문 파일의 파일 정보만 갱신합니다."""
+    data = _read_fingerprint_file(index_dir)
+    if data.get("fingerprint") is not None and data.get("source") != stamp:
+        _write_fingerprint_file(index_dir, {**data, "source": stamp})
+
+
+def index_matches_source(index_dir, document_path):
+    """
+    인덱스를 저장할 때 기록한 전처리 문서 파일의 크기/수정 시각이 지금과 같으면 True.
+    False는 '바뀌었을 수 있음'이므로 문서를 읽어 is_index_stale로 다시 확인해야 합니다.
+    """
+    stamp = read_source_stamp(index_dir)
+    return stamp is not None and os.path.exists(document_path) and stamp == source_stamp(document_path)
+
+
+def is_index_stale(index_dir, documents):
+    return read_fingerprint(index_dir) != corpus_fingerprint(documents)
+
+
+def _indexed_document_ids(vector_db):
+    """안정 문서 ID -> docstore ID. 가능하면 본문을 디코딩하지 않고 메타데이터만 읽습니다."""
+    docstore = vector_db.docstore
+    if hasattr(docstore, "metadata_items"):
+        items = docstore.metadata_items()
+    else:
+        items = ((docstore_id, doc.metadata) for docstore_id, doc in docstore._dict.items())
+    return {make_document_id(metadata.get("question_id"), metadata.get("source_type")): docstore_id
+            for docstore_id, metadata in items}
+
+
+def apply_delta(vector_db, delta):
+    """
+    ingest_incremental이 돌려준 변경분만 인덱스에 반영합니다. (docstore 전체를 비교하지 않음)
+    인덱스가 변경 전 문서와 맞는 상태였을 때만 써야 합니다.
+    """
+    indexed = _indexed_document_ids(vector_db)
+    upserted, deleted = delta["upserted"], delta["deleted"]
+    stats = {
+        "added": sum(1 for doc_id in upserted if doc_id not in indexed),
+        "updated": sum(1 for doc_id in upserted if doc_id in indexed),
+        "deleted": sum(1 for doc_id in deleted if doc_id in indexed),
+    }
+    to_delete = [indexed[doc_id] for doc_id in [*deleted, *upserted] if doc_id in indexed]
+    stats["unchanged"] = len(indexed) - len(to_delete)
+    if to_delete:
+        remove_from_store(vector_db, to_delete)
+    if upserted:
+        vector_db.add_documents(list(upserted.values()), ids=list(upserted))
+    print(f"✅ 인덱스 변경분 반영 완료: 추가 {stats['added']}, 변경 {stats['updated']}, 삭제 {stats['deleted']}, 유지 {stats['unchanged']}")
+    return stats
+
+
+def sync_index(vector_db, documents, delta=None):
+    """
+    docstore와 전처리 문서를 안정적인 문서 ID(question_id::source_type)로 비교해
+    추가/변경된 문서만 임베딩해 넣고, 사라진 문서는 인덱스에서 지웁니다.
+    delta(ingest_incremental 반환값)를 넘기면 전체 비교 없이 변경분만 반영합니다 (apply_delta).
+    반환값: {"added": n, "updated": n, "deleted": n, "unchanged": n}
+    """
+    if delta is not None:
+        return apply_delta(vector_db, delta)
+    # 예전 인덱스는 docstore 키가 UUID일 수 있으므로 메타데이터로 안정 ID를 계산해 대응시킵니다.
+    indexed = {}
+    for docstore_id, doc in vector_db.docstore._dict.items():
+        indexed[document_id_of(doc)] = (docstore_id, doc)
+
+    wanted = {document_id_of(doc): doc for doc in documents}
+
+    to_delete, to_add = [], []
+    stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    for doc_id, (docstore_id, old_doc) in indexed.items():
+        new_doc = wanted.get(doc_id)
+        if new_doc is None:
+            to_delete.append(docstore_id)
+            stats["deleted"] += 1
+        elif new_doc.page_content != old_doc.page_content or new_doc.metadata != old_doc.metadata:
+            to_delete.append(docstore_id)
+            to_add.append((doc_id, new_doc))
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+    for doc_id, doc in wanted.items():
+        if doc_id not in indexed:
+            to_add.append((doc_id, doc))
+            stats["added"] += 1
+
+    if to_delete:
+        remove_from_store(vector_db, to_delete)
+    if to_add:
+        # 추가/변경된 문서만 임베딩합니다.
+        vector_db.add_documents([doc for _, doc in to_add], ids=[doc_id for doc_id, _ in to_add])
+    print(f"✅ 인덱스 동기화 완료: 추가 {stats['added']}, 변경 {stats['updated']}, 삭제 {stats['deleted']}, 유지 {stats['unchanged']}")
+    return stats
+
+
+def save_index_atomically(vector_db, index_dir, fingerprint, source=None):
+    """
+    임시 폴더에 저장한 뒤 파일을 os.replace로 바꿔 끼웁니다.
+    지문 파일은 마지막에 바꾸므로, 도중에 실패하면 다음 시작 때 인덱스가 오래된 것으로 감지됩니다.
+    source는 문서를 읽기 직전에 잰 source_stamp입니다 (없으면 다음 시작 때 한 번 전체 확인).
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    tmp_dir = os.path.join(index_dir, ".tmp_index")
+    save_vector_store(vector_db, tmp_dir)
+    for filename in VECTOR_STORE_FILES:
+        # 열려 있는 docstore(memory-map)를 닫은 뒤 바꿔 끼우고, vector_db는 새 파일을 읽도록 다시 엽니다.
+        replace_file(os.path.join(tmp_dir, filename), os.path.join(index_dir, filename))
+    os.rmdir(tmp_dir)
+    reopen_docstore(vector_db, os.path.join(index_dir, DOCSTORE_FILE))
+
+    data = {"fingerprint": fingerprint, "documents": len(vector_db.docstore._dict)}
+    if source is not None:
+        data["source"] = source
+    _write_fingerprint_file(index_dir, data)
+    print(f"✅ FAISS 인덱스를 '{index_dir}'에 저장 완료!")
+
+
+def build_index(documents, embedding_model, index_config=None, **embed_kwargs):
+    # 길이순 배치 임베딩 + 청크 단위 추가 (embed_kwargs로 워커 수/배치 크기 지정, bulk_embedder 참고)
+    # index_config가 flat이 아니면 만들어진 벡터로 IVF/PQ/HNSW 인덱스를 학습해 바꿔 끼웁니다 (index_factory 참고)
+    print("📌 벡터 인덱스 생성 중...")
+    vector_db = build_faiss_index_bulk(documents, embedding_model, ids=[document_id_of(doc) for doc in documents], **embed_kwargs)
+    if not matches_config(vector_db.index, index_config):
+        convert_vector_store(vector_db, index_config)
+    return vector_db
+
+
+def load_documents(document_path):
+    store = DocumentStore(document_path)
+    try:
+        return store.documents()
+    finally:
+        store.close()
+
+
+def refresh_index(vector_db, index_dir, documents, force=False, delta=None, source=None):
+    """
+    지문이 다를 때만(또는 force) 동기화 후 저장합니다. 동기화했으면 통계를, 아니면 None을 반환합니다.
+    delta를 넘기면 변경분만 반영합니다 (force이면 무시하고 전체 비교).
+    source(source_stamp)를 넘기면 지문 파일에 함께 기록해 다음 시작 때 문서를 읽지 않고 확인합니다.
+    """
+    fingerprint = corpus_fingerprint(documents)
+    if not force and read_fingerprint(index_dir) == fingerprint:
+        if source is not None:
+            record_source_stamp(index_dir, source)
+        print("✅ FAISS 인덱스가 최신 상태입니다.")
+        return None
+    stats = sync_index(vector_db, documents, delta=None if force else delta)
+    save_index_atomically(vector_db, index_dir, fingerprint, source=source)
+    return stats
+
+
+if __name__ == "__main__":
+    from data_preprocessor import ingest_incremental
+    from essay_grader import FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH, INDEX_CONFIG, bulk_embed_options, load_embedding_model
+
+    parser = argparse.ArgumentParser(description="FAISS 인덱스를 전처리된 문서와 증분 동기화합니다.")
+    parser.add_argument("--check", action="store_true", help="인덱스가 최신인지 확인만 합니다.")
+    parser.add_argument("--ingest", action="store_true", help="동기화 전에 JSON 증분 전처리를 먼저 실행합니다.")
+    parser.add_argument("--force", action="store_true", help="지문이 같아도 docstore와 전체 비교를 수행합니다.")
+    parser.add_argument("--workers", type=int, default=None, help="인덱스를 새로 만들 때 사용할 임베딩 워커 프로세스 수")
+    args = parser.parse_args()
+
+    delta = None
+    if args.ingest:
+        # 변경분만 반영하려면 전처리 전 문서와 인덱스가 맞아야 합니다. 아니면 전체 비교로 동기화합니다.
+        index_was_fresh = (os.path.exists(os.path.join(FAISS_INDEX_DIR, "index.faiss")) and os.path.exists(DOCUMENT_CACHE_PATH)
+                           and (index_matches_source(FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH)
+                                or not is_index_stale(FAISS_INDEX_DIR, load_documents(DOCUMENT_CACHE_PATH))))
+        delta = ingest_incremental()
+        if not index_was_fresh:
+            delta = None
+    if args.check:
+        fresh = index_matches_source(FAISS_INDEX_DIR, DOCUMENT_CACHE_PATH) or not is_index_stale(FAISS_INDEX_DIR, load_documents(DOCUMENT_CACHE_PATH))
+        print("✅ 인덱스가 최신 상태입니다." if fresh else "⚠️ 인덱스가 오래되었습니다.")
+    elif not os.path.exists(os.path.join(FAISS_INDEX_DIR, "index.faiss")):
+        source = source_stamp(DOCUMENT_CACHE_PATH)
+        documents = load_documents(DOCUMENT_CACHE_PATH)
+        vector_db = build_index(documents, load_embedding_model(), INDEX_CONFIG, **bulk_embed_options(args.workers))
+        save_index_atomically(vector_db, FAISS_INDEX_DIR, corpus_fingerprint(documents), source=source)
+    else:
+        source = source_stamp(DOCUMENT_CACHE_PATH)
+        documents = load_documents(DOCUMENT_CACHE_PATH)
+        vector_db = load_vector_store(FAISS_INDEX_DIR, load_embedding_model())
+        refresh_index(vector_db, FAISS_INDEX_DIR, documents, force=args.force, delta=delta, source=source)
@@ -0,0 +1,217 @@
+# llm_cache.py (모델/temperature/메시지 해시 기반 LLM 응답 캐시)
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessageChunk, convert_to_messages
+from langchain_core.runnables import RunnableGenerator
+
+# memory: 프로세스 안에서만 공유 (Streamlit 세션끼리는 공유됨), sqlite: 재시작/여러 프로세스 간에도 공유, off: 사용 안 함
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_PATH = "./.cache/llm/responses.sqlite3"
+LLM_CACHE_MAX_ENTRIES = 512
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+
+
+def _normalize_messages(messages):
+    # dict / (role, content) / BaseMessage 어느 형식이든 같은 대화면 같은 키가 되도록 (역할, 공백 정리한 본문)으로 바꿉니다.
+    normalized = []
+    for message in convert_to_messages(messages):
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content, sort_keys=True, ensure_ascii=False)
+        normalized.append([message.type, " ".join(content.split())])
+    return normalized
+
+
+def llm_identity(llm):
+    """캐시 키에 들어갈 (모델 이름, temperature). 모델 이름이 없는 가짜 모델은 _llm_type을 씁니다."""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or llm._llm_type
+    return model, getattr(llm, "temperature", None)
+
+
+class MemoryResponseStore:
+    """최근 max_entries개 응답을 메모리에 LRU로 보관합니다."""
+
+    def __init__(self, max_entries=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, response = entry
+            if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteResponseStore:
+    """응답을 SQLite 파일에 보관합니다. ttl_seconds가 지난 항목은 조회 시 무시하고 저장할 때 정리합니다."""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _expiry_cutoff(self):
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?", (key, self._expiry_cutoff())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, response):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)", (key, response, time.time())
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (self._expiry_cutoff(),))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class LLMResponseCache:
+    """
+    (모델, temperature, 전체 메시지 목록)의 해시를 키로 LLM 응답 텍스트를 저장합니다.
+    저장소는 MemoryResponseStore / SQLiteResponseStore 중에서 고릅니다 (get/put만 있으면 무엇이든 가능).
+    같은 답안에 같은 질문(자주 묻는 질문 버튼 등)을 다시 보내면 LLM을 호출하지 않고 바로 돌려줍니다.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else MemoryResponseStore()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model, temperature, messages):
+        payload = json.dumps([model, temperature, _normalize_messages(messages)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        response = self.store.get(key)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def put(self, key, response):
+        self.store.put(key, response)
+
+    def invoke(self, llm, messages):
+        """캐시에 있으면 바로, 없으면 llm.invoke 후 저장해 응답 텍스트를 돌려줍니다."""
+        key = self.make_key(*llm_identity(llm), messages)
+        response = self.get(key)
+        if response is None:
+            response = llm.invoke(messages).content
+            self.put(key, response)
+        return response
+
+    async def ainvoke(self, llm, messages):
+        key = self.make_key(*llm_identity(llm), messages)
+        response = self.get(key)
+        if response is None:
+            response = (await llm.ainvoke(messages)).content
+            self.put(key, response)
+        return response
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.store),
+        }
+
+
+def cached_chat_model(llm, cache):
+    """
+    체인에서 llm 자리에 넣는 Runnable. (prompt | cached_chat_model(llm, cache) | StrOutputParser())
+    invoke/batch/stream과 async 버전 모두 캐시를 거치며, 스트리밍 중에는 토큰을 그대로 흘려보내고 끝나면 저장합니다.
+    cache가 None이면 llm을 그대로 돌려줍니다.
+    """
+    if cache is None:
+        return llm
+
+    def transform(inputs):
+        prompt = None
+        for prompt in inputs:  # 앞 단계(프롬프트 템플릿)는 스트리밍하지 않으므로 값이 하나뿐입니다.
+            pass
+        messages = prompt.to_messages()
+        key = cache.make_key(*llm_identity(llm), messages)
+        response = cache.get(key)
+        if response is not None:
+            yield AIMessageChunk(content=response)
+            return
+        parts = []
+        for chunk in llm.stream(messages):
+            parts.append(chunk.content)
+            yield chunk
+        cache.put(key, "".join(parts))
+
+    async def atransform(inputs):
+        prompt = None
+        async for prompt in inputs:
+            pass
+        messages = prompt.to_messages()
+        key = cache.make_key(*llm_identity(llm), messages)
+        response = cache.get(key)
+        if response is not None:
+            yield AIMessageChunk(content=response)
+            return
+        parts = []
+        async for chunk in llm.astream(messages):
+            parts.append(chunk.content)
+            yield chunk
+        cache.put(key, "".join(parts))
+
+    return RunnableGenerator(transform, atransform, name="cached_chat_model")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_llm_cache():
+    # 첨삭 엔진이 함께 쓰는 프로세스 공용 캐시. LLM_CACHE_BACKEND=off이면 None.
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None and LLM_CACHE_BACKEND != "off":
+            store = SQLiteResponseStore() if LLM_CACHE_BACKEND == "sqlite" else MemoryResponseStore()
+            _default_cache = LLMResponseCache(store)
+        return _default_cache
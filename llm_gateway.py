@@ -0,0 +1,331 @@
+# llm_gateway.py (두 앱이 함께 쓰는 OpenAI 클라이언트: 연결 풀, 타임아웃, 재시도, 모델별 동시 요청 제한)
+
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+import openai
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+LLM_GATEWAY_CONFIG = {
+    "base_url": os.getenv("OPENAI_BASE_URL"),   # 로컬 스텁 서버 등으로 바꿀 때만 지정 (None이면 OpenAI 기본값)
+    "api_key": None,                            # None이면 OPENAI_API_KEY 환경변수
+    "connect_timeout": 5.0,
+    "read_timeout": float(os.getenv("LLM_READ_TIMEOUT", "60")),
+    "max_connections": 20,                      # 프로세스 전체 HTTP 연결 풀 크기
+    "max_keepalive_connections": 10,
+    "max_retries": int(os.getenv("LLM_MAX_RETRIES", "4")),
+    "backoff_base": 0.5,                        # 재시도 대기: uniform(0, min(backoff_max, backoff_base * 2^시도))
+    "backoff_max": 8.0,
+    "model_concurrency": {"gpt-4o-mini": 8},    # 모델별 동시 요청 수 상한 (요금 한도/429 방지)
+    "default_concurrency": 4,
+}
+
+# 일시적인 오류만 다시 시도합니다. (인증/잘못된 요청 등 4xx는 바로 실패)
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APITimeoutError, openai.APIConnectionError)
+
+# 같은 호출 안에서 다시 게이트웨이를 거칠 때(_generate가 내부적으로 _stream을 부르는 경우 등) 중복 제한/재시도를 막습니다.
+_inside_call = contextvars.ContextVar("llm_gateway_inside_call", default=False)
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """
+    실행 중인 이벤트 루프마다 별도의 httpx.AsyncClient(연결 풀)로 요청을 보내는 클라이언트.
+    asyncio.run을 여러 번 부르거나 Streamlit처럼 rerun마다 새 루프를 쓰면, 처음 루프에서 연 연결을
+    다음 루프에서 재사용하다 'Event loop is closed'로 실패하기 때문입니다.
+    닫힌 루프의 클라이언트는 다음 요청 때 정리합니다.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client_kwargs = kwargs
+        self._loop_clients = {}
+        self._loop_lock = threading.Lock()
+
+    def _loop_client(self):
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            for closed_loop in [other for other in self._loop_clients if other.is_closed()]:
+                # 루프가 닫혀 aclose도 할 수 없으므로 참조만 끊습니다 (소켓은 GC 때 닫힘).
+                del self._loop_clients[closed_loop]
+            client = self._loop_clients.get(loop)
+            if client is None:
+                client = self._loop_clients[loop] = httpx.AsyncClient(**self._client_kwargs)
+            return client
+
+    @property
+    def loop_count(self):
+        with self._loop_lock:
+            return len(self._loop_clients)
+
+    async def send(self, request, **kwargs):
+        return await self._loop_client().send(request, **kwargs)
+
+    async def aclose(self):
+        """현재 루프의 연결 풀을 닫습니다."""
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            client = self._loop_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+
+
+class LLMGateway:
+    """
+    OpenAI 호출을 한곳에서 관리합니다.
+    - httpx 클라이언트(동기/비동기)를 하나씩 만들어 모든 모델이 연결 풀을 공유
+    - 연결/읽기 타임아웃
+    - 429/5xx/타임아웃/연결 오류는 지터를 준 지수 백오프로 재시도 (Retry-After 헤더가 있으면 우선)
+    - 모델별 동시 요청 수 제한
+    chat_model()/embeddings()로 LangChain 모델을 만들어 쓰면 됩니다.
+    """
+
+    def __init__(self, config=None):
+        self.config = {**LLM_GATEWAY_CONFIG, **(config or {})}
+        timeout = httpx.Timeout(self.config["read_timeout"], connect=self.config["connect_timeout"])
+        limits = httpx.Limits(
+            max_connections=self.config["max_connections"],
+            max_keepalive_connections=self.config["max_keepalive_connections"],
+        )
+        self.timeout = timeout
+        self.http_client = httpx.Client(timeout=timeout, limits=limits)
+        # httpx 비동기 연결은 만든 이벤트 루프에 묶이므로 루프마다 따로 연결 풀을 둡니다.
+        self.http_async_client = LoopLocalAsyncClient(timeout=timeout, limits=limits)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        # asyncio.Semaphore는 이벤트 루프에 묶이므로 루프마다 따로 둡니다.
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "in_flight": {}, "peak_in_flight": {}}
+
+    def concurrency_limit(self, model):
+        return self.config["model_concurrency"].get(model, self.config["default_concurrency"])
+
+    def _semaphore(self, model):
+        with self._lock:
+            if model not in self._semaphores:
+                self._semaphores[model] = threading.BoundedSemaphore(self.concurrency_limit(model))
+            return self._semaphores[model]
+
+    def _async_semaphore(self, model):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._async_semaphores.setdefault(loop, {})
+            if model not in semaphores:
+                semaphores[model] = asyncio.Semaphore(self.concurrency_limit(model))
+            return semaphores[model]
+
+    def _track(self, model, delta):
+        with self._lock:
+            in_flight = self._stats["in_flight"].get(model, 0) + delta
+            self._stats["in_flight"][model] = in_flight
+            if delta > 0:
+                self._stats["requests"] += 1
+                self._stats["peak_in_flight"][model] = max(self._stats["peak_in_flight"].get(model, 0), in_flight)
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def backoff_delay(self, attempt, error=None):
+        """attempt번째 재시도 전 대기 시간(초). 서버가 Retry-After를 주면 그 값을 따릅니다."""
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = None
+        if retry_after is not None:
+            return min(retry_after, self.config["backoff_max"])
+        # 'full jitter': 여러 요청이 동시에 실패해도 같은 순간에 다시 몰리지 않게 합니다.
+        return random.uniform(0, min(self.config["backoff_max"], self.config["backoff_base"] * 2 ** attempt))
+
+    def _should_retry(self, error, attempt):
+        if isinstance(error, RETRYABLE_ERRORS) and attempt < self.config["max_retries"]:
+            return True
+        self._count("failures")
+        return False
+
+    @contextmanager
+    def _slot(self, model):
+        semaphore = self._semaphore(model)
+        with semaphore:
+            self._track(model, 1)
+            try:
+                yield
+            finally:
+                self._track(model, -1)
+
+    @asynccontextmanager
+    async def _async_slot(self, model):
+        async with self._async_semaphore(model):
+            self._track(model, 1)
+            try:
+                yield
+            finally:
+                self._track(model, -1)
+
+    def _retry_wait(self, model, attempt, error):
+        delay = self.backoff_delay(attempt, error)
+        print(f"[재시도] {model} 호출 실패({type(error).__name__}), {delay:.2f}초 후 다시 시도합니다. ({attempt + 1}/{self.config['max_retries']})")
+        self._count("retries")
+        return delay
+
+    def call(self, model, func):
+        """func()를 모델별 동시 요청 제한 안에서 실행하고, 일시적 오류면 재시도합니다."""
+        if _inside_call.get():
+            return func()
+        token = _inside_call.set(True)
+        try:
+            for attempt in range(self.config["max_retries"] + 1):
+                try:
+                    with self._slot(model):
+                        return func()
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                    # 슬롯을 반납한 뒤 기다리므로 대기 중에도 다른 요청이 슬롯을 쓸 수 있습니다.
+                    time.sleep(self._retry_wait(model, attempt, e))
+        finally:
+            _inside_call.reset(token)
+
+    async def acall(self, model, func):
+        """call의 비동기 버전. func는 코루틴을 돌려주는 함수입니다."""
+        if _inside_call.get():
+            return await func()
+        token = _inside_call.set(True)
+        try:
+            for attempt in range(self.config["max_retries"] + 1):
+                try:
+                    async with self._async_slot(model):
+                        return await func()
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                    await asyncio.sleep(self._retry_wait(model, attempt, e))
+        finally:
+            _inside_call.reset(token)
+
+    def stream(self, model, make_iterator):
+        """스트리밍 호출. 첫 청크를 받기 전에 실패한 경우에만 재시도합니다 (이미 보낸 토큰은 되돌릴 수 없으므로)."""
+        if _inside_call.get():
+            yield from make_iterator()
+            return
+        for attempt in range(self.config["max_retries"] + 1):
+            started = False
+            try:
+                with self._slot(model):
+                    for chunk in make_iterator():
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self._retry_wait(model, attempt, e))
+
+    async def astream(self, model, make_iterator):
+        if _inside_call.get():
+            async for chunk in make_iterator():
+                yield chunk
+            return
+        for attempt in range(self.config["max_retries"] + 1):
+            started = False
+            try:
+                async with self._async_slot(model):
+                    async for chunk in make_iterator():
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not self._should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(self._retry_wait(model, attempt, e))
+
+    def chat_model(self, model="gpt-4o-mini", temperature=0.7, **kwargs):
+        """게이트웨이를 거치는 ChatOpenAI. SDK 자체 재시도는 끄고 게이트웨이 재시도만 사용합니다."""
+        return GatewayChatOpenAI(
+            gateway=self,
+            model=model,
+            temperature=temperature,
+            base_url=self.config["base_url"],
+            api_key=self.config["api_key"],
+            timeout=self.timeout,
+            max_retries=0,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+            **kwargs,
+        )
+
+    def embeddings(self, model="text-embedding-3-small", **kwargs):
+        # 임베딩은 LangChain이 내부에서 여러 번 나눠 호출하므로 연결 풀/타임아웃만 공유하고 재시도는 SDK에 맡깁니다.
+        return OpenAIEmbeddings(
+            model=model,
+            base_url=self.config["base_url"],
+            api_key=self.config["api_key"],
+            timeout=self.timeout,
+            max_retries=self.config["max_retries"],
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+            **kwargs,
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self._stats["requests"],
+                "retries": self._stats["retries"],
+                "failures": self._stats["failures"],
+                "in_flight": dict(self._stats["in_flight"]),
+                "peak_in_flight": dict(self._stats["peak_in_flight"]),
+            }
+
+    def close(self):
+        self.http_client.close()
+
+
+class GatewayChatOpenAI(ChatOpenAI):
+    """ChatOpenAI와 같지만 모든 요청이 LLMGateway의 동시 요청 제한과 재시도를 거칩니다."""
+
+    gateway: LLMGateway
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self.gateway.call(self.model_name, lambda: super(GatewayChatOpenAI, self)._generate(messages, stop, run_manager, **kwargs))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self.gateway.acall(self.model_name, lambda: super(GatewayChatOpenAI, self)._agenerate(messages, stop, run_manager, **kwargs))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        yield from self.gateway.stream(self.model_name, lambda: super(GatewayChatOpenAI, self)._stream(messages, stop, run_manager, **kwargs))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self.gateway.astream(self.model_name, lambda: super(GatewayChatOpenAI, self)._astream(messages, stop, run_manager, **kwargs)):
+            yield chunk
+
+
+_default_gateway = None
+_default_gateway_lock = threading.Lock()
+
+
+def get_default_gateway():
+    # 첨삭 앱과 공고문 챗봇이 함께 쓰는 프로세스 공용 게이트웨이
+    global _default_gateway
+    with _default_gateway_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway()
+        return _default_gateway
+
+
+def get_chat_model(model="gpt-4o-mini", temperature=0.7, **kwargs):
+    return get_default_gateway().chat_model(model, temperature, **kwargs)
+
+
+def get_embeddings(model="text-embedding-3-small", **kwargs):
+    return get_default_gateway().embeddings(model, **kwargs)
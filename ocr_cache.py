@@ -0,0 +1,125 @@
+# ocr_cache.py (이미지 해시 기반 OCR 결과 캐시)
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+OCR_CACHE_DIR = "./.cache/ocr"
+OCR_CACHE_MAX_ENTRIES = 256
+OCR_CACHE_MAX_DISK_BYTES = 50 * 1024 * 1024
+
+
+class OCRCache:
+    """
+    이미지 바이트 + OCR 설정(lang, angle classifier 등)의 해시를 키로 OCR 결과 텍스트를 저장합니다.
+    - 메모리 LRU 계층: 최근 max_entries개
+    - 디스크 계층(선택): cache_dir 아래 파일로 저장, 전체 크기가 max_disk_bytes를 넘으면 오래된 것부터 삭제
+    같은 이미지를 다시 첨삭할 때 PaddleOCR을 다시 돌리지 않도록 하기 위함입니다.
+    """
+
+    def __init__(self, max_entries=OCR_CACHE_MAX_ENTRIES, cache_dir=None, max_disk_bytes=OCR_CACHE_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_bytes, **ocr_config):
+        digest = hashlib.sha256(image_bytes)
+        digest.update(json.dumps(ocr_config, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                os.utime(path)  # 디스크 계층도 최근 사용 순으로 정리되도록 갱신
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, text)
+                return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        if self.cache_dir:
+            tmp_path = f"{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._disk_path(key))
+            self._evict_disk()
+
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".txt"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+        if total_bytes <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total_bytes -= size
+            if total_bytes <= self.max_disk_bytes:
+                break
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_ocr_cache():
+    # 앱과 OCRProcessor가 함께 쓰는 프로세스 공용 캐시 (디스크 계층 포함)
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = OCRCache(cache_dir=OCR_CACHE_DIR)
+        return _default_cache
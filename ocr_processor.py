@@ -1,54 +1,254 @@
 # ocr_processor.py (사용자 성공 버전 기반 최종 완성본)
 
-from paddleocr import PaddleOCR
 import numpy as np
 from PIL import Image
 import io
+import os
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ocr_cache import get_default_ocr_cache
+from startup import startup_timer
+from tracing import tracer
+from image_preprocessor import DEFAULT_PREPROCESS_CONFIG, preprocess_image_bytes
+
+# OCR 워커 프로세스 수. 워커마다 PaddleOCR 모델을 하나씩 올리므로 상주 메모리는 대략 (워커 수 × 모델 크기)입니다.
+# 워커를 쓰면 메인 프로세스에는 모델을 올리지 않고 한 장짜리 요청도 풀의 모델로 처리합니다.
+# 0이면 풀 없이 메인 프로세스의 모델 하나로 순서대로 처리합니다 (메모리가 가장 적음).
+OCR_MAX_WORKERS = min(int(os.getenv("OCR_MAX_WORKERS", "2")), os.cpu_count() or 1)
+PAGE_HEADER = "[{page}페이지]"
+
+
+def extract_text(ocr, image_source, preprocess=None):
+    """
+    PaddleOCR 인스턴스로 이미지 바이트에서 텍스트를 추출합니다.
+    preprocess 설정이 있으면 리사이즈/기울기 보정 등 전처리를 거친 이미지를 OCR합니다.
+    인식된 텍스트가 없으면 빈 문자열을 반환하고, OCR 오류는 호출한 쪽으로 그대로 전달합니다.
+    """
+    # 1. 흑백/알파채널 문제를 방지하기 위해 이미지를 RGB로 강제 변환합니다.
+    #    (이건 나중에 다른 이미지에서 생길 문제를 예방하는 좋은 습관입니다.)
+    with tracer.span("ocr.decode"):
+        if preprocess is not None:
+            np_array = preprocess_image_bytes(image_source, preprocess)
+        else:
+            image_file = io.BytesIO(image_source)
+            image = Image.open(image_file).convert('RGB')
+            np_array = np.array(image)
+
+    # 2. OCR 실행
+    #    사용자의 성공 코드처럼, ocr() 함수는 이미지 경로뿐만 아니라
+    #    numpy 배열도 처리할 수 있습니다.
+    with tracer.span("ocr.paddle"):
+        result = ocr.ocr(np_array)
+
+    # 3. 결과 처리
+    #    결과가 없거나 비어있는 경우를 방어합니다.
+    if not result or not result[0]:
+        return ""
+
+    # line_info는 [좌표, ('텍스트', 정확도)] 형태일 것입니다.
+    # text_lines = [line_info[1][0] for line_info in result[0]]
+    ocr_output_dict = result[0]
+    text_lines = ocr_output_dict.get('rec_texts', []) # .get()을 사용하면 'rec_texts' 키가 없어도 오류 없이 안전하게 빈 리스트를 반환합니다.
+
+    # ocr_result = result[0]
+    # print('\n'.join(ocr_result['rec_texts']))
+
+    # 성공적으로 추출된 텍스트들을 하나의 문자열로 합쳐 반환합니다.
+    return "\n".join(text_lines)
+
+
+# --- 프로세스 풀 워커 ---
+# PaddleOCR은 스레드 안전하지 않으므로, 워커 프로세스마다 자기 모델을 하나씩 들고 페이지를 처리합니다.
+_worker_ocr = None
+
+
+def _load_paddle_ocr(ocr_kwargs):
+    # paddleocr 임포트 자체가 무거우므로 실제로 모델이 필요할 때 가져옵니다.
+    with startup_timer.measure("paddleocr", "import"):
+        from paddleocr import PaddleOCR
+    with startup_timer.measure("paddleocr", "load"):
+        return PaddleOCR(**ocr_kwargs)
+
+
+def _init_ocr_worker(ocr_kwargs):
+    global _worker_ocr
+    _worker_ocr = _load_paddle_ocr(ocr_kwargs)
+
+
+def _warm_up_worker():
+    # 모델은 워커 초기화 함수에서 로딩되므로, 작업을 하나 받아 끝낸 워커는 모델이 준비된 상태입니다.
+    return _worker_ocr is not None
+
+
+def _ocr_page_in_worker(image_source, preprocess):
+    # 워커에서 잰 단계별 시간(ocr.decode / ocr.paddle)은 워커의 registry에만 남으므로 결과와 함께 부모로 돌려줍니다.
+    with tracer.collect() as stages:
+        text = extract_text(_worker_ocr, image_source, preprocess)
+    return text, stages
+
 
 class OCRProcessor:
-    def __init__(self):
+    def __init__(self, cache=None, use_angle_cls=False, preprocess=None, max_workers=None):
         """
         사용자가 성공한 가장 단순하고 안정적인 방식으로 PaddleOCR 모델을 초기화합니다.
+        모델은 생성 시점이 아니라 처음 OCR을 실행할 때(또는 warm_up) 로딩합니다.
+        cache를 넘기지 않으면 프로세스 공용 OCR 캐시를 사용합니다.
+        preprocess는 image_preprocessor 설정 딕셔너리입니다 (None이면 전처리 없이 원본 사용).
+        max_workers를 넘기지 않으면 OCR_MAX_WORKERS를 쓰며, 0이면 워커 풀 없이 메인 프로세스 모델로 처리합니다.
         """
-        print("PaddleOCR 모델을 로딩합니다... (사용자 성공 버전 기반)")
         # 사용자가 성공한 가장 단순한 초기화 방식을 그대로 적용합니다.
         # 모든 부가 옵션을 제거한 것이 안정성의 핵심이었습니다.
-        self.ocr = PaddleOCR(lang="korean")
-        print("✅ PaddleOCR 모델 로딩 완료!")
+        self.ocr_kwargs = {"lang": "korean"}
+        if use_angle_cls:
+            self.ocr_kwargs["use_angle_cls"] = True
+        self.preprocess = {**DEFAULT_PREPROCESS_CONFIG, **preprocess} if preprocess is not None else None
+        # 전처리 설정이 다르면 OCR 결과도 달라지므로 캐시 키에 함께 넣습니다.
+        self.ocr_config = {"lang": "korean", "use_angle_cls": use_angle_cls, "preprocess": self.preprocess}
+        self.cache = cache or get_default_ocr_cache()
+        self._ocr = None
+        # PaddleOCR은 스레드 안전하지 않으므로 (Streamlit 세션 스레드 간) 메인 프로세스 모델 사용을 직렬화합니다.
+        self._ocr_lock = threading.Lock()
+        self.max_workers = OCR_MAX_WORKERS if max_workers is None else max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._workers_ready = False
 
-    def process_image(self, image_source):
+    @property
+    def uses_pool(self):
+        return self.max_workers > 0
+
+    @property
+    def is_loaded(self):
+        return self._workers_ready if self.uses_pool else self._ocr is not None
+
+    def warm_up(self):
         """
-        이미지 바이트를 입력받아, 안정적인 RGB 포맷으로 변환 후 텍스트를 추출합니다.
+        첫 요청이 모델 로딩을 기다리지 않도록 미리 로딩합니다.
+        워커 풀을 쓰면 워커 수만큼 프로세스를 띄워 각자 모델을 올리고, 아니면 메인 프로세스 모델을 올립니다.
         """
+        if not self.uses_pool:
+            self.ocr
+            return
+        pool = self._get_pool()
+        # 작업을 한꺼번에 넣으면 쉬는 워커가 없으므로 max_workers개까지 프로세스가 모두 뜹니다.
+        futures = [pool.submit(_warm_up_worker) for _ in range(self.max_workers)]
         try:
-            # 1. 흑백/알파채널 문제를 방지하기 위해 이미지를 RGB로 강제 변환합니다.
-            #    (이건 나중에 다른 이미지에서 생길 문제를 예방하는 좋은 습관입니다.)
-            image_file = io.BytesIO(image_source)
-            image = Image.open(image_file).convert('RGB')
-            np_array = np.array(image)
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            self.close()
+            raise
+        self._workers_ready = True
 
-            # 2. OCR 실행
-            #    사용자의 성공 코드처럼, ocr() 함수는 이미지 경로뿐만 아니라
-            #    numpy 배열도 처리할 수 있습니다.
-            result = self.ocr.ocr(np_array)
+    @property
+    def ocr(self):
+        if self._ocr is None:
+            with self._ocr_lock:
+                if self._ocr is None:
+                    print("PaddleOCR 모델을 로딩합니다... (사용자 성공 버전 기반)")
+                    self._ocr = _load_paddle_ocr(self.ocr_kwargs)
+                    print("✅ PaddleOCR 모델 로딩 완료!")
+        return self._ocr
 
-            # 3. 결과 처리
-            #    결과가 없거나 비어있는 경우를 방어합니다.
-            if not result or not result[0]:
-                return "이미지에서 텍스트를 추출하지 못했습니다."
+    def _extract_text(self, image_source):
+        ocr = self.ocr
+        with self._ocr_lock:
+            return extract_text(ocr, image_source, self.preprocess)
+
+    def _extract_texts(self, image_sources):
+        """
+        이미지마다 텍스트를 추출해 같은 순서로 돌려줍니다.
+        워커 풀을 쓰면 한 장이어도 풀의 모델로 처리해, 메인 프로세스에 모델을 따로 올리지 않습니다.
+        """
+        if not self.uses_pool:
+            return [self._extract_text(source) for source in image_sources]
+        pool = self._get_pool()
+        futures = [pool.submit(_ocr_page_in_worker, source, self.preprocess) for source in image_sources]
+        texts = []
+        try:
+            for future in futures:
+                text, stages = future.result()
+                tracer.record_stages(stages)
+                texts.append(text)
+        except BrokenProcessPool:
+            # 워커가 죽었거나 모델 로딩에 실패한 풀은 버리고, 다음 호출 때 새로 만듭니다.
+            self.close()
+            raise
+        return texts
+
+    @tracer.traced("ocr")
+    def process_image(self, image_source):
+        """
+        이미지 바이트를 입력받아, 안정적인 RGB 포맷으로 변환 후 텍스트를 추출합니다.
+        """
+        cache_key = self.cache.make_key(image_source, **self.ocr_config)
+        cached_text = self.cache.get(cache_key)
+        if cached_text is not None:
+            return cached_text
 
-            # line_info는 [좌표, ('텍스트', 정확도)] 형태일 것입니다.
-            # text_lines = [line_info[1][0] for line_info in result[0]]
-            ocr_output_dict = result[0]
-            text_lines = ocr_output_dict.get('rec_texts', []) # .get()을 사용하면 'rec_texts' 키가 없어도 오류 없이 안전하게 빈 리스트를 반환합니다.
-            
-            # ocr_result = result[0]
-            # print('\n'.join(ocr_result['rec_texts']))
+        try:
+            text = self._extract_texts([image_source])[0]
+            if not text:
+                return "이미지에서 텍스트를 추출하지 못했습니다."
 
-            # 성공적으로 추출된 텍스트들을 하나의 문자열로 합쳐 반환합니다.
-            return "\n".join(text_lines)
-            # return "\n".join(ocr_result)
+            # (실패 메시지는 캐시하지 않고, 정상 추출된 결과만 저장합니다)
+            self.cache.put(cache_key, text)
+            return text
 
         except Exception as e:
             print(f"[OCR-ERROR] 처리 중 예상치 못한 오류 발생: {e}")
-            return f"OCR 처리 중 문제가 발생했습니다. 관리자에게 문의하세요."
\ No newline at end of file
+            return f"OCR 처리 중 문제가 발생했습니다. 관리자에게 문의하세요."
+
+    @tracer.traced("ocr")
+    def process_pages(self, image_sources):
+        """
+        여러 장의 답안지 이미지를 워커 프로세스 풀에서 동시에 OCR한 뒤,
+        페이지 순서대로 '[n페이지]' 경계를 붙여 하나의 답안으로 합쳐 반환합니다.
+        캐시에 있는 페이지는 다시 OCR하지 않으며, 모든 페이지에서 텍스트가 없으면 빈 문자열을 반환합니다.
+        OCR 중 오류가 나면 예외를 그대로 전달합니다.
+        """
+        cache_keys = [self.cache.make_key(source, **self.ocr_config) for source in image_sources]
+        page_texts = [self.cache.get(key) for key in cache_keys]
+        pending = [i for i, text in enumerate(page_texts) if text is None]
+
+        if pending:
+            for i, text in zip(pending, self._extract_texts([image_sources[i] for i in pending])):
+                page_texts[i] = text
+
+        for i in pending:
+            if page_texts[i]:
+                self.cache.put(cache_keys[i], page_texts[i])
+
+        if len(image_sources) == 1:
+            return page_texts[0]
+        return "\n\n".join(
+            f"{PAGE_HEADER.format(page=page)}\n{text}"
+            for page, text in enumerate(page_texts, start=1)
+            if text
+        )
+
+    def _get_pool(self):
+        # 워커의 모델 로딩 비용을 매번 치르지 않도록 풀을 한 번 만들어 재사용합니다.
+        # PaddlePaddle은 fork 이후 동작이 보장되지 않으므로 spawn 방식으로 워커를 띄웁니다.
+        with self._pool_lock:
+            if self._pool is None:
+                print(f"OCR 워커 프로세스 풀을 시작합니다... (최대 {self.max_workers}개, 워커마다 PaddleOCR 모델 1개)")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=(self.ocr_kwargs,),
+                )
+                atexit.unregister(self.close)  # 풀을 다시 만든 경우 중복 등록하지 않습니다.
+                atexit.register(self.close)
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._workers_ready = False
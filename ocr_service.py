@@ -0,0 +1,42 @@
+# ocr_service.py (프로세스 공용 OCR 서비스)
+
+import os
+import threading
+from ocr_processor import OCRProcessor
+
+# 기울어진 답안 사진이 많아 기본값은 각도 분류기 사용. 환경변수 OCR_USE_ANGLE_CLS=false로 끌 수 있습니다.
+OCR_USE_ANGLE_CLS = os.getenv("OCR_USE_ANGLE_CLS", "true").lower() in ("1", "true", "yes")
+# OCR 전 이미지 전처리(리사이즈/기울기 보정/여백 자르기) 사용 여부. 세부 설정은 image_preprocessor.DEFAULT_PREPROCESS_CONFIG
+# 오프라인 측정에서 이미지당 지연 시간이 약 4배(51ms → 190ms)로 늘었고 CER 개선은 아직 확인되지 않아 기본값은 끔입니다.
+# benchmarks/bench_ocr_preprocess.py로 실제 답안에서 CER/지연 시간 이득이 확인되면 기본값을 바꿉니다.
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "false").lower() in ("1", "true", "yes")
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_ocr_processor(use_angle_cls=None):
+    """
+    앱 전체가 함께 쓰는 OCRProcessor 싱글턴을 반환합니다.
+    PaddleOCR 모델은 임포트 시점이 아니라 첫 OCR 호출 때 한 번만 로딩됩니다.
+    이미 다른 각도 분류기 설정으로 만들어진 경우에는 ValueError를 발생시킵니다.
+    """
+    global _processor
+    if use_angle_cls is None:
+        use_angle_cls = OCR_USE_ANGLE_CLS
+    with _processor_lock:
+        if _processor is None:
+            _processor = OCRProcessor(use_angle_cls=use_angle_cls, preprocess={} if OCR_PREPROCESS else None)
+        elif _processor.ocr_config["use_angle_cls"] != use_angle_cls:
+            raise ValueError(
+                f"OCR 서비스가 이미 use_angle_cls={_processor.ocr_config['use_angle_cls']} 설정으로 생성되었습니다."
+            )
+        return _processor
+
+
+def ocr_image(image_bytes):
+    return get_ocr_processor().process_image(image_bytes)
+
+
+def ocr_pages(image_sources):
+    return get_ocr_processor().process_pages(image_sources)
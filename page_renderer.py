@@ -0,0 +1,120 @@
+# page_renderer.py (시험지 PDF 페이지 렌더링 캐시)
+
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import fitz
+
+PAGE_CACHE_DIR = "./.cache/pages"
+PAGE_CACHE_MAX_ENTRIES = 128  # 등록된 시험지 전체(약 110쪽)를 메모리에 둘 수 있는 크기
+PAGE_ZOOM = 2
+
+
+class PageRenderCache:
+    """
+    PDF 페이지를 PNG로 렌더링해 base64로 인코딩한 결과를 (pdf 경로, 수정 시각, 페이지 번호, 배율) 키로 저장합니다.
+    - 프로세스 내 LRU 캐시: 최근 max_entries 페이지
+    - 디스크 캐시(선택): cache_dir 아래 .b64 파일 (앱을 재시작해도 유지)
+    PDF 파일이 바뀌면 수정 시각이 달라져 자연스럽게 새로 렌더링됩니다.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_MAX_ENTRIES, cache_dir=PAGE_CACHE_DIR):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_path, page_index, zoom=PAGE_ZOOM):
+        abs_path = os.path.abspath(pdf_path)
+        raw_key = f"{abs_path}|{os.stat(abs_path).st_mtime_ns}|{page_index}|{zoom}"
+        return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+    def get_page_base64(self, pdf_path, page_index, zoom=PAGE_ZOOM):
+        """페이지 PNG의 base64 문자열을 반환합니다. 캐시에 없을 때만 PDF를 열어 렌더링합니다."""
+        key = self.make_key(pdf_path, page_index, zoom)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        encoded = self._read_disk(key)
+        if encoded is None:
+            encoded = self._render(pdf_path, page_index, zoom)
+            self._write_disk(key, encoded)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        with self._lock:
+            self._memory[key] = encoded
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return encoded
+
+    @staticmethod
+    def _render(pdf_path, page_index, zoom):
+        with fitz.open(pdf_path) as doc:
+            pix = doc[page_index].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            return base64.b64encode(pix.tobytes("png")).decode()
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.b64"), "r", encoding="ascii") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key, encoded):
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, f"{key}.b64")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="ascii") as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+
+    def warm_up(self, university_data, zoom=PAGE_ZOOM):
+        """config.UNIVERSITY_DATA에 등록된 모든 시험지 페이지를 미리 렌더링해 둡니다."""
+        start = time.perf_counter()
+        rendered = 0
+        for years in university_data.values():
+            for questions in years.values():
+                for question in questions.values():
+                    for page_index in question["page"]:
+                        try:
+                            self.get_page_base64(question["pdf"], page_index, zoom)
+                            rendered += 1
+                        except Exception as e:
+                            print(f"[PAGE-CACHE] {question['pdf']} {page_index}페이지 렌더링 실패: {e}")
+        print(f"✅ 시험지 페이지 {rendered}장 미리 렌더링 완료 ({time.perf_counter() - start:.1f}s)")
+        return rendered
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_page_render_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PageRenderCache()
+        return _default_cache
@@ -0,0 +1,123 @@
+# startup.py (앱 시작 시간 측정 및 백그라운드 모델 로딩)
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    구성 요소별 임포트/로딩 시간을 기록합니다. 여러 스레드에서 동시에 써도 됩니다.
+    예: with startup_timer.measure("ko-sbert", "load"): ...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+        self._active = {}
+
+    @contextmanager
+    def measure(self, component, phase="load", once=False):
+        """once=True이면 같은 (구성 요소, 단계)가 이미 기록된 경우 다시 기록하지 않습니다. (Streamlit 재실행 대비)"""
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active[thread_id] = f"{component} {phase}"
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._active.pop(thread_id, None)
+                if not (once and any(r["component"] == component and r["phase"] == phase for r in self._records)):
+                    self._records.append({
+                        "component": component,
+                        "phase": phase,
+                        "seconds": elapsed,
+                        "thread": threading.current_thread().name,
+                    })
+
+    def current_steps(self):
+        """지금 측정 중인 단계 이름들 (진행 표시용)"""
+        with self._lock:
+            return list(self._active.values())
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def format_report(self):
+        records = self.records()
+        if not records:
+            return "측정된 시작 시간이 없습니다."
+        width = max(len(f"{r['component']} ({r['phase']})") for r in records)
+        lines = [f"{'구성 요소':<{width}}  {'시간(s)':>8}  스레드"]
+        for r in records:
+            label = f"{r['component']} ({r['phase']})"
+            lines.append(f"{label:<{width}}  {r['seconds']:>8.2f}  {r['thread']}")
+        return "\n".join(lines)
+
+
+# 프로세스 전체가 함께 쓰는 타이머
+startup_timer = StartupTimer()
+
+
+class BackgroundLoader:
+    """
+    무거운 객체(첨삭 엔진, OCR 모델 등)를 데몬 스레드에서 만들어 둡니다.
+    페이지는 기다리지 않고 먼저 그려지고, 객체가 필요한 곳에서만 result()로 기다립니다.
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._done = threading.Event()
+        self._restart_lock = threading.Lock()
+        self._value = None
+        self.error = None
+        self.started_at = None
+        self.elapsed = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        threading.Thread(target=self._run, name=f"loader-{self.name}", daemon=True).start()
+        return self
+
+    def _run(self):
+        try:
+            self._value = self._factory()
+        except Exception as e:
+            self.error = e
+            print(f"[오류] {self.name} 로딩 실패: {e}")
+        finally:
+            self.elapsed = time.perf_counter() - self.started_at
+            self._done.set()
+
+    def restart_if_failed(self):
+        """
+        이전 로딩이 오류로 끝났으면 다시 시작하고 True를 돌려줍니다.
+        로더는 프로세스 동안 캐시되므로, 일시적인 오류(네트워크, 모델 다운로드 등)가 영구 실패로 남지 않도록 재실행 때 호출합니다.
+        """
+        with self._restart_lock:
+            if not self._done.is_set() or self.error is None:
+                return False
+            print(f"{self.name} 로딩을 다시 시도합니다... (이전 오류: {self.error})")
+            self._done.clear()
+            self.error = None
+            self.start()
+            return True
+
+    @property
+    def ready(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def result(self, timeout=None):
+        """로딩이 끝날 때까지 기다렸다가 결과를 돌려줍니다. 로딩 중 오류가 났으면 그 오류를 다시 발생시킵니다."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} 로딩이 {timeout}초 안에 끝나지 않았습니다.")
+        if self.error is not None:
+            raise self.error
+        return self._value
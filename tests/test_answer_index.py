@@ -0,0 +1,57 @@
+# tests/test_answer_index.py
+# 멘토 챗봇 프롬프트: 학생 답안/채점 기준 전체 대신 질문과 관련된 문장만 들어가는지 확인합니다. (가짜 임베딩)
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import answer_index
+from answer_index import ANSWER_TOP_K, CRITERIA_TOP_K, SentenceIndex, split_sentences
+from benchmarks.fakes import make_fake_embeddings
+from essay_grader import EssayGrader
+
+SENTENCES = [f"문장{i}호에서 정체성과 공동체의 관계를 설명한다." for i in range(12)]
+
+
+def test_split_sentences_joins_wrapped_lines_and_short_fragments():
+    text = "정체성은 공동체를 유지하는 힘이다. 가족이 그렇다.\n\n둘째 문단은\n변화의 필요성을 다룬다!"
+    assert split_sentences(text) == [
+        "정체성은 공동체를 유지하는 힘이다. 가족이 그렇다.",
+        "둘째 문단은 변화의 필요성을 다룬다!",
+    ]
+    assert split_sentences("") == [] and split_sentences(None) == []
+    long_line = "가" * (answer_index.MAX_SENTENCE_CHARS * 2 + 10)
+    assert [len(s) for s in split_sentences(long_line)] == [answer_index.MAX_SENTENCE_CHARS] * 2 + [10]
+
+
+def test_top_k_keeps_best_match_in_original_order():
+    embeddings = make_fake_embeddings(size=64, deterministic=True)
+    index = SentenceIndex.build(" ".join(SENTENCES), embeddings)
+    assert len(index) == len(SENTENCES) and index.matches(" ".join(SENTENCES))
+
+    top = index.top_k(embeddings.embed_query(SENTENCES[7]), 3)
+    assert SENTENCES[7] in top and len(top) == 3
+    assert top == sorted(top, key=SENTENCES.index)
+    assert SentenceIndex.build("", embeddings).top_k(embeddings.embed_query("질문"), 3) == []
+
+
+def test_mento_prompt_contains_only_relevant_excerpts():
+    grader = EssayGrader.__new__(EssayGrader)
+    grader.llm = None  # 대화 기록이 없으므로 요약 모델은 쓰이지 않습니다.
+    grader.embedding_model = grader._transient_embedding_model = make_fake_embeddings(size=64, deterministic=True)
+    grader._criteria_indexes = {}
+    grader._context_lock = threading.Lock()
+    criteria = " ".join(f"{i}번 채점 항목은 논거의 타당성을 본다." for i in range(10))
+
+    messages = grader._build_mento_messages(criteria, "모범답안", " ".join(SENTENCES), SENTENCES[4], history=[])
+    prompt = messages[-1]["content"]
+    included = [s for s in SENTENCES if s in prompt]
+    assert SENTENCES[4] in included
+    assert len(included) == ANSWER_TOP_K
+    assert sum(f"{i}번 채점 항목" in prompt for i in range(10)) == CRITERIA_TOP_K
+
+    # 같은 채점 기준은 다시 임베딩하지 않습니다.
+    grader._build_mento_messages(criteria, "모범답안", " ".join(SENTENCES), "결론은?", history=[])
+    assert list(grader._criteria_indexes) == [criteria]
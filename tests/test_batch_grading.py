@@ -0,0 +1,54 @@
+# tests/test_batch_grading.py
+# grade_essays_batch를 가짜 채팅 모델로 확인합니다. (저장된 FAISS 인덱스 + 가짜 임베딩, 네트워크 불필요)
+
+import os
+import re
+import sys
+import time
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from benchmarks.fakes import SleepyChatModel, make_fake_embeddings
+from essay_grader import EssayGrader
+
+QUESTION_ID = "ajou_2023_1"
+N_ANSWERS = 6
+FAILING_ANSWER = 2
+
+
+class EchoChatModel(SleepyChatModel):
+    """프롬프트 속 '답안-n'을 그대로 돌려줍니다. 앞 번호일수록 늦게 끝나고, FAILING_ANSWER번은 실패합니다."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        number = int(re.search(r"답안-(\d+)", messages[-1].content).group(1))
+        time.sleep(0.02 * (N_ANSWERS - number))
+        if number == FAILING_ANSWER:
+            raise ValueError(f"답안-{number} 처리 실패")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"첨삭-{number}"))])
+
+
+@pytest.fixture(scope="module")
+def grader(request):
+    cwd = os.getcwd()
+    os.chdir(ROOT_DIR)  # 인덱스 경로가 저장소 기준 상대 경로입니다.
+    request.addfinalizer(lambda: os.chdir(cwd))
+    return EssayGrader(llm=EchoChatModel(), embedding_model=make_fake_embeddings(), auto_sync_index=False, response_cache=False)
+
+
+def test_batch_keeps_input_order_and_isolates_failures(grader):
+    answers = [f"답안-{i} 정체성은 공동체를 유지하는 힘이다." for i in range(N_ANSWERS)]
+
+    results = grader.grade_essays_batch(QUESTION_ID, answers, max_concurrency=N_ANSWERS)
+
+    assert [r["index"] for r in results] == list(range(N_ANSWERS))
+    for i, r in enumerate(results):
+        if i == FAILING_ANSWER:
+            assert r["result"] is None
+            assert f"답안-{FAILING_ANSWER} 처리 실패" in r["error"]
+        else:
+            assert r == {"index": i, "result": f"첨삭-{i}", "error": None}
@@ -0,0 +1,44 @@
+# tests/test_bulk_embedder.py
+# 워커 프로세스로 임베딩할 때도 디스크 임베딩 캐시를 거치는지 확인합니다. (가짜 임베딩 모델)
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk_embedder
+from benchmarks.fakes import make_fake_embeddings
+from embedding_cache import CachedEmbeddings, EmbeddingCache
+
+DIM = 16
+FACTORY = {"n_workers": 2, "batch_size": 4, "chunk_size": 8, "model_factory": make_fake_embeddings, "factory_args": (DIM, True)}
+
+
+def embed_all(texts, model):
+    vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+    for chunk_order, chunk_vectors in bulk_embedder.iter_embedding_chunks(texts, model, **FACTORY):
+        vectors[chunk_order] = chunk_vectors
+    return vectors
+
+
+def test_workers_only_embed_cache_misses(tmp_path, monkeypatch):
+    texts = [f"문서 {i} " * (i % 5 + 1) for i in range(20)]
+    expected = np.asarray(make_fake_embeddings(DIM, deterministic=True).embed_documents(texts), dtype=np.float32)
+    model = CachedEmbeddings(make_fake_embeddings(DIM, deterministic=True), EmbeddingCache(str(tmp_path), "fake", True))
+
+    np.testing.assert_allclose(embed_all(texts[:12], model), expected[:12], rtol=1e-6)
+    assert len(model.cache) == 12
+
+    # 일부만 새 텍스트: 새 텍스트만 워커로 보냅니다.
+    np.testing.assert_allclose(embed_all(texts, model), expected, rtol=1e-6)
+    assert len(model.cache) == 20
+    assert model.cache.stats()["hits"] == 12
+
+    # 모두 캐시에 있으면 워커 프로세스를 띄우지 않습니다.
+    def no_pool(*args, **kwargs):
+        raise AssertionError("캐시가 모두 적중하면 워커 풀을 만들지 않아야 합니다.")
+
+    monkeypatch.setattr(bulk_embedder, "_make_embed_pool", no_pool)
+    np.testing.assert_allclose(embed_all(texts, model), expected, rtol=1e-6)
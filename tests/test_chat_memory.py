@@ -0,0 +1,88 @@
+# tests/test_chat_memory.py
+# 멘토 챗봇 대화 기억: 요약 + 최근 대화가 어떤 경우에도 token_budget(예약분 제외)을 넘지 않는지 확인합니다.
+# (가짜 채팅 모델, tiktoken 대신 어림 토큰 수)
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat_memory
+from benchmarks.fakes import SleepyChatModel
+from chat_memory import ConversationMemory, count_message_tokens, make_summary_executor
+
+TOKEN_BUDGET = 400
+
+
+@pytest.fixture(autouse=True)
+def offline_token_count(monkeypatch):
+    # 인코딩 파일을 내려받지 않도록 어림 토큰 수를 씁니다.
+    monkeypatch.setattr(chat_memory, "_encoding", lambda model_name: None)
+
+
+def make_history(n_turns, length=60):
+    return [{"user": f"{i}번째 질문 " + "가" * length, "assistant": f"{i}번째 답변 " + "나" * length} for i in range(n_turns)]
+
+
+def make_memory(summary_text="학생은 서론의 논지를 보완하기로 했다."):
+    executor = make_summary_executor()
+    memory = ConversationMemory(SleepyChatModel(response=summary_text), executor, recent_turns=4, token_budget=TOKEN_BUDGET)
+    return memory, executor
+
+
+@pytest.mark.parametrize("n_turns", [0, 1, 3, 10, 50])
+@pytest.mark.parametrize("reserved", [0, 150])
+def test_history_stays_within_budget(n_turns, reserved):
+    memory, executor = make_memory()
+    history = make_history(n_turns)
+    try:
+        memory.update(history)
+        memory.wait(timeout=5)
+        messages = memory.history_messages(history, reserved_tokens=reserved)
+    finally:
+        executor.shutdown()
+
+    assert count_message_tokens(messages) <= TOKEN_BUDGET - reserved
+    if n_turns:
+        # 예산이 허용하는 한 가장 최근 턴은 항상 원문으로 들어갑니다.
+        assert messages[-1]["content"] == history[-1]["assistant"]
+
+
+def test_old_turns_are_folded_into_summary():
+    memory, executor = make_memory()
+    history = make_history(10)
+    try:
+        memory.update(history)
+        memory.wait(timeout=5)
+        messages = memory.history_messages(history)
+    finally:
+        executor.shutdown()
+
+    assert memory.summarized_turns == 6
+    assert messages[0]["role"] == "system" and "서론의 논지" in messages[0]["content"]
+    # 요약된 턴은 원문으로 다시 보내지 않습니다.
+    assert all("0번째" not in m["content"] for m in messages[1:])
+
+
+def test_oversized_summary_is_truncated_to_budget():
+    memory, executor = make_memory(summary_text="요약" * 2000)
+    history = make_history(10)
+    try:
+        memory.update(history)
+        memory.wait(timeout=5)
+        messages = memory.history_messages(history, reserved_tokens=100)
+    finally:
+        executor.shutdown()
+
+    assert messages and messages[0]["role"] == "system"
+    assert count_message_tokens(messages) <= TOKEN_BUDGET - 100
+
+
+def test_no_room_returns_no_history():
+    memory, executor = make_memory()
+    try:
+        assert memory.history_messages(make_history(3), reserved_tokens=TOKEN_BUDGET) == []
+    finally:
+        executor.shutdown()
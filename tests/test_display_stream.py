@@ -0,0 +1,81 @@
+# tests/test_display_stream.py
+# 스트리밍 첨삭 표시: 토큰을 받는 도중에 완성된 수정 제안부터 한 번씩만 그리고, 전체 첨삭문을 돌려주는지 확인합니다.
+# (Streamlit 화면 함수는 기록용 가짜로 바꿉니다)
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import display_ui
+from benchmarks.fakes import FAKE_CORRECTION
+
+TWO_SUGGESTIONS = FAKE_CORRECTION.replace(
+    "**[예상 점수",
+    "학생 원문: \"변화는 필요하다.\"\n수정 제안: \"정체성은 변화를 통해 새롭게 유지된다.\"\n\n**[예상 점수",
+)
+
+
+class FakePlaceholder:
+    def __init__(self):
+        self.texts = []
+
+    def markdown(self, text):
+        self.texts.append(text)
+
+
+class FakeContainer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    drawn = {"suggestions": [], "main": FakePlaceholder(), "warnings": []}
+    monkeypatch.setattr(display_ui, "_display_answer_columns", lambda *args: None)
+    monkeypatch.setattr(display_ui, "_display_suggestion", lambda i, original, suggestion: drawn["suggestions"].append((i, original, drawn["tokens"])))
+    monkeypatch.setattr(display_ui.st, "empty", lambda: drawn["main"])
+    monkeypatch.setattr(display_ui.st, "container", FakeContainer)
+    monkeypatch.setattr(display_ui.st, "markdown", lambda *args, **kwargs: None)
+    monkeypatch.setattr(display_ui.st, "warning", drawn["warnings"].append)
+    return drawn
+
+
+def token_stream(text, drawn, size=7):
+    drawn["tokens"] = 0
+    for start in range(0, len(text), size):
+        drawn["tokens"] += 1
+        yield text[start:start + size]
+
+
+def test_suggestions_are_drawn_once_while_streaming(screen):
+    tokens = list(token_stream(TWO_SUGGESTIONS, {}))
+    result = display_ui.display_correction_stream("학생 답안", "모범 답안", token_stream(TWO_SUGGESTIONS, screen))
+
+    assert result == TWO_SUGGESTIONS
+    assert [(i, original) for i, original, _ in screen["suggestions"]] == [
+        (0, '"정체성은 중요한 것 같다."'),
+        (1, '"변화는 필요하다."'),
+    ]
+    # 첫 제안은 스트림이 끝나기 전에 (다음 제안이 시작되자마자) 그려집니다.
+    assert screen["suggestions"][0][2] < len(tokens)
+    assert screen["main"].texts[-1] == TWO_SUGGESTIONS.split(display_ui.SUGGESTION_HEADER, 1)[0]
+    assert screen["warnings"] == []
+
+
+def test_last_suggestion_without_trailing_section_is_drawn_at_end(screen):
+    text = FAKE_CORRECTION.split("\n\n**[예상 점수", 1)[0]
+    display_ui.display_correction_stream("학생 답안", "모범 답안", token_stream(text, screen))
+    assert [(i, original) for i, original, _ in screen["suggestions"]] == [(0, '"정체성은 중요한 것 같다."')]
+
+
+def test_malformed_suggestion_section_warns(screen):
+    text = "**[총평]**\n좋습니다.\n\n**[이렇게 바꿔보세요 (대안 문장 제안) 💡]**\n형식이 깨진 제안"
+    display_ui.display_correction_stream("학생 답안", "모범 답안", token_stream(text, screen))
+    assert screen["suggestions"] == []
+    assert len(screen["warnings"]) == 1
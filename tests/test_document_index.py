@@ -0,0 +1,81 @@
+# tests/test_document_index.py
+# (question_id, source_type) 정확 조회와 메타데이터 역색인, 그리고 이를 쓰는 EssayGrader 조회 함수를 확인합니다.
+
+import os
+import sys
+import threading
+
+import pytest
+from langchain_core.documents import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_index import DocumentIndex
+from document_store import DocumentStore, LazyDocstore, write_documents
+from essay_grader import EssayGrader
+
+
+def doc(question_id, source_type, university, year, text=None):
+    metadata = {"question_id": question_id, "source_type": source_type, "university": university, "year": year}
+    return Document(page_content=text or f"{question_id} {source_type}", metadata=metadata)
+
+
+ITEMS = [
+    ("a", doc("ajou_2024_1", "채점기준", "ajou", "2024")),
+    ("b", doc("ajou_2024_1", "모범답안", "ajou", "2024")),
+    ("c", doc("ajou_2023_1", "채점기준", "ajou", "2023")),
+    ("d", doc("kyunghee_2024_1", "채점기준", "kyunghee", "2024")),
+    # 같은 (question_id, source_type)가 또 나오면 처음 문서를 유지합니다.
+    ("e", doc("ajou_2024_1", "채점기준", "ajou", "2024", text="나중에 나온 중복 문서")),
+]
+
+
+def test_exact_lookup_by_question_and_source_type():
+    index = DocumentIndex(ITEMS)
+    assert index.get("ajou_2024_1", "모범답안").page_content == "ajou_2024_1 모범답안"
+    assert index.get("ajou_2024_1", "채점기준").page_content == "ajou_2024_1 채점기준"
+    assert index.get("ajou_2024_1", "출제의도") is None
+    assert index.get("seoul_2024_1", "채점기준") is None
+    assert set(index.get_question("ajou_2024_1")) == {"채점기준", "모범답안"}
+    assert index.get_question("seoul_2024_1") == {}
+    assert len(index) == len(ITEMS)
+
+
+def test_metadata_filters_intersect_in_document_order():
+    index = DocumentIndex(ITEMS)
+    assert index.filter_ids(university="ajou", year="2024") == ["a", "b", "e"]
+    assert index.filter_ids(source_type="채점기준", year="2024") == ["a", "d", "e"]
+    assert index.filter_ids(university="ajou", year=None) == ["a", "b", "c", "e"]
+    assert index.filter_ids() == ["a", "b", "c", "d", "e"]
+    assert index.filter_ids(university="seoul") == []
+    with pytest.raises(ValueError):
+        index.filter_ids(page=1)
+
+
+def test_lazy_docstore_index_decodes_only_requested_documents(tmp_path, monkeypatch):
+    path = str(tmp_path / "docstore.jsonl")
+    write_documents(path, ITEMS)
+    store = DocumentStore(path)
+    decoded = []
+    original_get = store.get
+    monkeypatch.setattr(store, "get", lambda doc_id: decoded.append(doc_id) or original_get(doc_id))
+    try:
+        index = DocumentIndex.from_docstore(LazyDocstore(store))
+        assert decoded == []  # 색인은 메타데이터만으로 만듭니다.
+        assert index.get("kyunghee_2024_1", "채점기준").page_content == "kyunghee_2024_1 채점기준"
+        assert decoded == ["d"]
+    finally:
+        store.close()
+
+
+def test_grader_lookups_use_the_index():
+    grader = EssayGrader.__new__(EssayGrader)
+    grader.document_index = DocumentIndex(ITEMS)
+    grader._context_cache = {}
+    grader._context_lock = threading.Lock()
+    grader._index_version = 0
+
+    assert grader.lookup_document("ajou_2023_1", "채점기준") == "ajou_2023_1 채점기준"
+    assert grader.lookup_document("ajou_2023_1", "모범답안") == "관련 정보를 찾을 수 없습니다."
+    assert grader.get_document_content("ajou_2024_1", "모범답안") == "ajou_2024_1 모범답안"
+    assert grader.get_document_content("ajou_2024_1", "출제의도") == "출제의도을(를) 찾을 수 없습니다."
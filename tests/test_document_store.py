@@ -0,0 +1,54 @@
+# tests/test_document_store.py
+# 열려 있는(memory-map) 문서 저장소 파일을 다시 저장할 때의 동작을 확인합니다.
+
+import os
+import sys
+
+import pytest
+from langchain_core.documents import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import make_fake_embeddings
+from document_store import DOCSTORE_FILE, DocumentStore, load_vector_store, save_vector_store, write_documents
+from index_maintenance import build_index, save_index_atomically, sync_index
+
+
+def make_documents(prefix):
+    return [Document(page_content=f"{prefix} 본문 {n}", metadata={"question_id": f"q{n}", "source_type": "채점기준"})
+            for n in range(4)]
+
+
+def test_rewrite_closes_open_store_and_stale_reader_fails(tmp_path):
+    path = str(tmp_path / "docs.jsonl")
+    write_documents(path, [(f"id{n}", doc) for n, doc in enumerate(make_documents("예전"))])
+    store = DocumentStore(path)
+    assert store.get("id0").page_content == "예전 본문 0"
+
+    write_documents(path, [(f"id{n}", doc) for n, doc in enumerate(make_documents("새로운 긴"))])
+
+    assert store._mmap is None  # 바꿔 끼우기 전에 닫혔어야 합니다.
+    with pytest.raises(RuntimeError):
+        store.get("id0")  # 예전 오프셋으로 새 파일을 읽지 않습니다.
+    assert DocumentStore(path).get("id0").page_content == "새로운 긴 본문 0"
+
+
+def test_saving_over_loaded_index_reopens_docstore(tmp_path):
+    index_dir = str(tmp_path / "faiss")
+    embeddings = make_fake_embeddings(size=16, deterministic=True)
+    save_index_atomically(build_index(make_documents("예전"), embeddings), index_dir, "v1")
+
+    vector_db = load_vector_store(index_dir, embeddings)
+    old_store = vector_db.docstore._dict._store
+    assert vector_db.docstore.search("q0::채점기준").page_content == "예전 본문 0"
+
+    sync_index(vector_db, make_documents("새로운"))
+    save_index_atomically(vector_db, index_dir, "v2")
+    assert old_store._mmap is None
+    assert vector_db.docstore.search("q1::채점기준").page_content == "새로운 본문 1"
+
+    # 자기 자신이 읽던 폴더에 바로 저장해도 계속 쓸 수 있어야 합니다.
+    save_vector_store(vector_db, index_dir)
+    assert vector_db.docstore.search("q2::채점기준").page_content == "새로운 본문 2"
+    assert load_vector_store(index_dir, embeddings).docstore.search("q3::채점기준").page_content == "새로운 본문 3"
+    assert os.path.exists(os.path.join(index_dir, DOCSTORE_FILE))
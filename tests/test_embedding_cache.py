@@ -0,0 +1,84 @@
+# tests/test_embedding_cache.py
+# 디스크 임베딩 캐시가 기록 도중 중단된 파일과 항목 수 상한을 안전하게 다루는지 확인합니다.
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_cache import EmbeddingCache
+
+DIM = 4
+
+
+def vector_of(i):
+    return np.full(DIM, i, dtype=np.float32)
+
+
+def make_cache(tmp_path, **kwargs):
+    return EmbeddingCache(str(tmp_path), "test-model", True, **kwargs)
+
+
+def fill(cache, numbers):
+    cache.put_many([f"k{i}" for i in numbers], [vector_of(i) for i in numbers])
+
+
+def assert_lookups(cache, numbers):
+    found = cache.get_many([f"k{i}" for i in numbers])
+    for i in numbers:
+        np.testing.assert_array_equal(found[f"k{i}"], vector_of(i))
+
+
+def test_orphan_vectors_are_truncated(tmp_path):
+    cache = make_cache(tmp_path)
+    fill(cache, range(3))
+    # 벡터만 기록되고 키는 기록되기 전에 중단된 상황
+    with open(cache._vectors_path, "ab") as f:
+        f.write(np.stack([vector_of(98), vector_of(99)]).tobytes())
+
+    cache = make_cache(tmp_path)
+    assert len(cache) == 3
+    fill(cache, [3, 4])
+    assert_lookups(make_cache(tmp_path), range(5))
+
+
+def test_extra_and_partial_keys_are_dropped(tmp_path):
+    cache = make_cache(tmp_path)
+    fill(cache, range(3))
+    with open(cache._keys_path, "a", encoding="ascii") as f:
+        f.write("orphan\npart")
+
+    cache = make_cache(tmp_path)
+    assert len(cache) == 3
+    fill(cache, [3])
+    reloaded = make_cache(tmp_path)
+    assert len(reloaded) == 4
+    assert_lookups(reloaded, range(4))
+
+
+def test_missing_keys_file_discards_vectors(tmp_path):
+    cache = make_cache(tmp_path)
+    fill(cache, range(3))
+    os.remove(cache._keys_path)
+
+    cache = make_cache(tmp_path)
+    assert len(cache) == 0
+    fill(cache, [7])
+    assert_lookups(make_cache(tmp_path), [7])
+
+
+def test_max_entries_keeps_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_entries=10)
+    fill(cache, range(10))
+    cache.get_many(["k0"])  # 가장 오래된 항목이지만 방금 조회했으므로 남아야 합니다.
+    fill(cache, [10])
+
+    assert len(cache) == 8
+    assert os.path.getsize(cache._vectors_path) == 8 * 4 * DIM
+    assert "k1" not in cache.get_many(["k1"])
+    assert_lookups(cache, [0, 10])
+    reloaded = make_cache(tmp_path, max_entries=10)
+    assert len(reloaded) == 8
+    assert_lookups(reloaded, [0, 5, 10])
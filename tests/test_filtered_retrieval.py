@@ -0,0 +1,83 @@
+# tests/test_filtered_retrieval.py
+# 메타데이터 사전 필터 검색: 후보 벡터 직접 계산 경로와 faiss IDSelectorBatch 경로 모두
+# 조건(source_type 등)에 맞는 문서만, 빠짐없이 돌려주는지 확인합니다. (임베딩 모델/네트워크 불필요)
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import filtered_retrieval
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from benchmarks.fakes import make_fake_embeddings
+from document_index import DocumentIndex
+from filtered_retrieval import FilteredSearcher
+from index_factory import build_ann_index
+
+DIM = 32
+N_QUESTIONS = 150
+SOURCE_TYPES = ("출제의도", "채점기준", "모범답안")
+
+
+def make_searcher(index_type):
+    rng = np.random.default_rng(0)
+    docs = {}
+    for n in range(N_QUESTIONS):
+        for source_type in SOURCE_TYPES:
+            university = "ajou" if n % 2 else "kyunghee"
+            docs[f"q{n}::{source_type}"] = Document(
+                page_content=f"q{n} {source_type}",
+                metadata={"question_id": f"q{n}", "source_type": source_type, "university": university, "year": "2024"},
+            )
+    ids = list(docs)
+    vectors = rng.normal(size=(len(ids), DIM)).astype(np.float32)
+    vector_db = FAISS(
+        embedding_function=make_fake_embeddings(size=DIM, deterministic=True),
+        index=build_ann_index(vectors, {"index_type": index_type, "nprobe": 64, "ef_search": 256}),
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+    return FilteredSearcher(vector_db, DocumentIndex.from_docstore(vector_db.docstore)), vectors
+
+
+@pytest.fixture(params=["rescore", "selector"])
+def search_path(request, monkeypatch):
+    if request.param == "selector":
+        # 후보 수와 상관없이 IDSelectorBatch 경로를 타도록 합니다.
+        monkeypatch.setattr(filtered_retrieval, "EXACT_RESCORE_LIMIT", 0)
+    return request.param
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_only_matching_source_type_is_returned(index_type, search_path):
+    searcher, vectors = make_searcher(index_type)
+    for row in (0, 1, 200):
+        results = searcher.search_by_vector(vectors[row], k=10, source_type="채점기준")
+        assert len(results) == 10
+        assert all(doc.metadata["source_type"] == "채점기준" for doc, _ in results)
+        distances = [distance for _, distance in results]
+        assert distances == sorted(distances)
+
+
+def test_both_paths_agree_on_exact_index(monkeypatch):
+    searcher, vectors = make_searcher("flat")
+    query = vectors[7] + 0.01
+    rescored = searcher.search_by_vector(query, k=5, source_type="모범답안", university="ajou")
+    monkeypatch.setattr(filtered_retrieval, "EXACT_RESCORE_LIMIT", 0)
+    selected = searcher.search_by_vector(query, k=5, source_type="모범답안", university="ajou")
+
+    assert [doc.page_content for doc, _ in rescored] == [doc.page_content for doc, _ in selected]
+    assert all(doc.metadata["university"] == "ajou" for doc, _ in rescored)
+    assert rescored[0][1] == pytest.approx(selected[0][1], rel=1e-4)
+
+
+def test_filter_returns_all_when_fewer_candidates_than_k(search_path):
+    searcher, vectors = make_searcher("flat")
+    results = searcher.search_by_vector(vectors[0], k=10, question_id="q3")
+    assert sorted(doc.metadata["source_type"] for doc, _ in results) == sorted(SOURCE_TYPES)
+    assert searcher.search_by_vector(vectors[0], k=10, source_type="없는유형") == []
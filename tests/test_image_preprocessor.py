@@ -0,0 +1,68 @@
+# tests/test_image_preprocessor.py
+# OCR 전처리: 리사이즈, 기울기 보정, 여백 자르기와 결과 배열 형식을 합성 답안 이미지로 확인합니다.
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_preprocessor import (DEFAULT_PREPROCESS_CONFIG, _adaptive_ink_mask, _estimate_skew, _to_gray, preprocess_image,
+                                preprocess_image_bytes)
+
+SKEW_DEGREES = 3.0
+
+
+def lined_page(width=1200, height=900, margin=250, skew=0.0):
+    """넓은 여백 안에 글자 줄처럼 검은 가로 막대가 있는 답안지. skew만큼 반시계 방향으로 기울입니다."""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(margin, height - margin, 40):
+        draw.rectangle([margin, y, width - margin, y + 12], fill="black")
+    return image.rotate(skew, resample=Image.BICUBIC, fillcolor="white") if skew else image
+
+
+def ink_mask(image):
+    gray = _to_gray(np.asarray(image.convert("RGB"), dtype=np.float32))
+    return _adaptive_ink_mask(gray, DEFAULT_PREPROCESS_CONFIG["block_size"], DEFAULT_PREPROCESS_CONFIG["threshold_offset"])
+
+
+def test_estimates_the_skew_angle():
+    step = DEFAULT_PREPROCESS_CONFIG["skew_angle_step"]
+    angle = _estimate_skew(ink_mask(lined_page(skew=SKEW_DEGREES)), DEFAULT_PREPROCESS_CONFIG["max_skew_angle"], step)
+    assert angle == pytest.approx(-SKEW_DEGREES, abs=step)
+    assert _estimate_skew(ink_mask(lined_page()), DEFAULT_PREPROCESS_CONFIG["max_skew_angle"], step) == 0.0
+
+
+def test_crops_margins_and_returns_rgb_uint8():
+    page = lined_page()
+    out = preprocess_image(page, {"deskew": False})
+    assert out.dtype == np.uint8 and out.ndim == 3 and out.shape[2] == 3
+    padding = DEFAULT_PREPROCESS_CONFIG["margin_padding"]
+    # 250px 여백이 (글자 영역 + padding) 크기로 줄어듭니다.
+    assert out.shape[1] <= 1200 - 2 * 250 + 2 * padding + 2
+    assert out.shape[0] < 900 - 250
+
+
+def test_resizes_large_photos_to_target_long_edge():
+    out = preprocess_image(lined_page(width=4000, height=3000, margin=10), {"crop_margins": False, "deskew": False})
+    assert max(out.shape[:2]) == DEFAULT_PREPROCESS_CONFIG["target_long_edge"]
+
+
+def test_all_steps_off_returns_original_pixels():
+    page = lined_page(width=300, height=200, margin=50)
+    config = {"target_long_edge": 0, "grayscale": False, "binarize": False, "deskew": False, "crop_margins": False}
+    assert np.array_equal(preprocess_image(page, config), np.asarray(page))
+
+
+def test_byte_cache_returns_read_only_shared_array():
+    buffer = io.BytesIO()
+    lined_page(width=400, height=300, margin=60).save(buffer, format="PNG")
+    first = preprocess_image_bytes(buffer.getvalue())
+    assert preprocess_image_bytes(buffer.getvalue()) is first
+    assert not first.flags.writeable
+    assert preprocess_image_bytes(buffer.getvalue(), {"binarize": True}) is not first
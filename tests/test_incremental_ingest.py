@@ -0,0 +1,68 @@
+# tests/test_incremental_ingest.py
+# JSON 증분 전처리 -> 변경분만 인덱스에 반영하는 흐름을 임시 폴더에서 확인합니다. (가짜 임베딩)
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_preprocessor
+from benchmarks.fakes import make_fake_embeddings
+from index_maintenance import build_index, corpus_fingerprint, load_documents, sync_index
+
+
+def write_question(json_dir, question_id, text):
+    with open(os.path.join(json_dir, f"{question_id}.json"), "w", encoding="utf-8") as f:
+        json.dump({"question_id": question_id, "grading_criteria": f"{text} 채점기준", "sample_answer": f"{text} 모범답안"}, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    monkeypatch.setattr(data_preprocessor, "JSON_DATA_DIR", str(json_dir))
+    monkeypatch.setattr(data_preprocessor, "OUTPUT_FILE", str(tmp_path / "preprocessed_documents.jsonl"))
+    monkeypatch.setattr(data_preprocessor, "MANIFEST_FILE", str(tmp_path / "ingest_manifest.json"))
+    for n in range(3):
+        write_question(json_dir, f"univ_2024_{n}", f"문항{n}")
+    return json_dir
+
+
+def indexed_contents(vector_db):
+    return {doc_id: doc.page_content for doc_id, doc in vector_db.docstore._dict.items()}
+
+
+def test_delta_sync_matches_full_sync(corpus):
+    first = data_preprocessor.ingest_incremental()
+    assert len(first["upserted"]) == 6 and first["deleted"] == []
+    vector_db = build_index(load_documents(data_preprocessor.OUTPUT_FILE), make_fake_embeddings(size=16, deterministic=True))
+
+    write_question(corpus, "univ_2024_0", "고친 문항0")
+    os.remove(corpus / "univ_2024_1.json")
+    write_question(corpus, "univ_2024_3", "문항3")
+    delta = data_preprocessor.ingest_incremental()
+
+    assert sorted(delta["upserted"]) == ["univ_2024_0::모범답안", "univ_2024_0::채점기준", "univ_2024_3::모범답안", "univ_2024_3::채점기준"]
+    assert delta["deleted"] == ["univ_2024_1::모범답안", "univ_2024_1::채점기준"]
+    stats = sync_index(vector_db, None, delta=delta)
+    assert stats == {"added": 2, "updated": 2, "deleted": 2, "unchanged": 2}
+
+    documents = load_documents(data_preprocessor.OUTPUT_FILE)
+    assert indexed_contents(vector_db) == {f"{d.metadata['question_id']}::{d.metadata['source_type']}": d.page_content for d in documents}
+    assert vector_db.index.ntotal == len(documents) == 6
+    # 변경분 반영 뒤에는 전체 비교로 다시 맞춰도 바뀔 것이 없어야 합니다.
+    assert sync_index(vector_db, documents) == {"added": 0, "updated": 0, "deleted": 0, "unchanged": 6}
+    assert corpus_fingerprint(documents) == corpus_fingerprint(vector_db.docstore._dict.values())
+
+
+def test_unchanged_corpus_skips_loading_documents(corpus, monkeypatch):
+    data_preprocessor.ingest_incremental()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("변경이 없으면 전처리 결과를 읽지 않아야 합니다.")
+
+    monkeypatch.setattr(data_preprocessor, "DocumentStore", fail)
+    assert data_preprocessor.ingest_incremental() == {"upserted": {}, "deleted": []}
@@ -0,0 +1,63 @@
+# tests/test_index_factory.py
+# 인덱스 종류별로 문서를 지운 뒤에도 행 번호 -> 문서 매핑이 맞는지 확인합니다. (임베딩 모델/네트워크 불필요)
+# 실행: python -m pytest -q tests
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from benchmarks.fakes import make_fake_embeddings
+from index_factory import build_ann_index, index_config_of, remove_from_store
+
+DIM = 32
+N_DOCS = 400
+
+
+def make_store(index_type):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(N_DOCS, DIM)).astype(np.float32)
+    ids = [f"d{i}" for i in range(N_DOCS)]
+    docs = [Document(page_content=doc_id, metadata={"question_id": doc_id}) for doc_id in ids]
+    vector_db = FAISS(
+        embedding_function=make_fake_embeddings(size=DIM, deterministic=True),
+        index=build_ann_index(vectors, {"index_type": index_type, "pq_m": 8}),
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+    return vector_db, vectors
+
+
+def top_hit(vector_db, vector):
+    return vector_db.similarity_search_with_score_by_vector(vector, k=1)[0][0].page_content
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_remove_keeps_untouched_documents_addressable(index_type):
+    vector_db, vectors = make_store(index_type)
+    assert index_config_of(vector_db.index)["index_type"] == index_type
+
+    remove_from_store(vector_db, ["d0", "d1", "d2"])
+
+    assert vector_db.index.ntotal == N_DOCS - 3
+    assert sorted(vector_db.index_to_docstore_id) == list(range(N_DOCS - 3))
+    assert index_config_of(vector_db.index)["index_type"] == index_type
+    for i in (3, 150, 300, N_DOCS - 1):
+        assert top_hit(vector_db, vectors[i]) == f"d{i}"
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_add_after_remove_does_not_reuse_labels(index_type):
+    vector_db, vectors = make_store(index_type)
+    remove_from_store(vector_db, ["d0", "d1", "d2"])
+    vector_db.add_documents([Document(page_content="new", metadata={"question_id": "new"})], ids=["new"])
+
+    new_vector = vector_db.embeddings.embed_query("new")
+    assert top_hit(vector_db, new_vector) == "new"
+    assert top_hit(vector_db, vectors[300]) == "d300"
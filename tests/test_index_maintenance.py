@@ -0,0 +1,82 @@
+# tests/test_index_maintenance.py
+# 시작할 때의 인덱스 최신 여부 확인: 전처리 문서 파일이 그대로면 문서를 디코딩하지 않아야 합니다.
+
+import os
+import sys
+
+import pytest
+from langchain_core.documents import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import essay_grader
+from benchmarks.fakes import make_fake_embeddings
+from document_store import write_documents
+from essay_grader import EssayGrader
+from index_factory import DEFAULT_INDEX_CONFIG
+from index_maintenance import (build_index, corpus_fingerprint, index_matches_source, load_documents, read_fingerprint,
+                               save_index_atomically, source_stamp)
+
+
+def make_documents(suffix=""):
+    return [Document(page_content=f"문항{n} {source_type}{suffix}", metadata={"question_id": f"univ_2024_{n}", "source_type": source_type})
+            for n in range(3) for source_type in ("채점기준", "모범답안")]
+
+
+def write_corpus(path, documents):
+    write_documents(path, [(f"{d.metadata['question_id']}::{d.metadata['source_type']}", d) for d in documents])
+
+
+@pytest.fixture
+def saved_index(tmp_path, monkeypatch):
+    index_dir, document_path = str(tmp_path / "faiss"), str(tmp_path / "preprocessed_documents.jsonl")
+    write_corpus(document_path, make_documents())
+    source = source_stamp(document_path)
+    documents = load_documents(document_path)
+    vector_db = build_index(documents, make_fake_embeddings(size=16, deterministic=True))
+    save_index_atomically(vector_db, index_dir, corpus_fingerprint(documents), source=source)
+    monkeypatch.setattr(essay_grader, "FAISS_INDEX_DIR", index_dir)
+    monkeypatch.setattr(essay_grader, "DOCUMENT_CACHE_PATH", document_path)
+    return index_dir, document_path
+
+
+def load_grader_index(auto_sync_index=True):
+    grader = EssayGrader.__new__(EssayGrader)
+    grader.embedding_model = make_fake_embeddings(size=16, deterministic=True)
+    grader.index_config = dict(DEFAULT_INDEX_CONFIG)
+    grader._load_vector_db(auto_sync_index)
+    return grader
+
+
+def test_unchanged_source_file_skips_decoding(saved_index, monkeypatch):
+    index_dir, document_path = saved_index
+    assert index_matches_source(index_dir, document_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("전처리 문서 파일이 그대로면 문서를 디코딩하지 않아야 합니다.")
+
+    monkeypatch.setattr(essay_grader, "load_documents", fail)
+    grader = load_grader_index()
+    assert grader.vector_db.index.ntotal == 6
+
+
+def test_rewritten_but_identical_file_is_checked_once(saved_index):
+    index_dir, document_path = saved_index
+    os.utime(document_path, ns=(0, source_stamp(document_path)[1] + 10**9))
+    assert not index_matches_source(index_dir, document_path)
+
+    load_grader_index()
+    # 내용이 같으면 인덱스는 그대로 두고, 다음부터 빠른 확인이 통과하도록 파일 정보만 갱신합니다.
+    assert index_matches_source(index_dir, document_path)
+
+
+def test_changed_source_file_refreshes_index(saved_index):
+    index_dir, document_path = saved_index
+    changed = make_documents(suffix=" (개정)")
+    write_corpus(document_path, changed)
+    assert not index_matches_source(index_dir, document_path)
+
+    grader = load_grader_index()
+    assert read_fingerprint(index_dir) == corpus_fingerprint(changed)
+    assert index_matches_source(index_dir, document_path)
+    assert sorted(doc.page_content for doc in grader.vector_db.docstore._dict.values()) == sorted(d.page_content for d in changed)
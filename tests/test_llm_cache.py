@@ -0,0 +1,84 @@
+# tests/test_llm_cache.py
+# LLM 응답 캐시: 키가 (모델, temperature, 메시지)로 정해지는지와 invoke / 스트리밍 체인 / SQLite 저장소 동작을 확인합니다.
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from benchmarks.fakes import SleepyChatModel
+from llm_cache import LLMResponseCache, MemoryResponseStore, SQLiteResponseStore, cached_chat_model, llm_identity
+
+MESSAGES = [{"role": "system", "content": "논술 첨삭 전문가입니다."}, {"role": "user", "content": "서론을 어떻게 고칠까요?"}]
+
+
+class CountingChatModel(SleepyChatModel):
+    model_name: str = "gpt-4o-mini"
+    temperature: float = 0.7
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+
+def test_key_depends_on_model_temperature_and_messages():
+    key = LLMResponseCache.make_key("gpt-4o-mini", 0.7, MESSAGES)
+    assert key != LLMResponseCache.make_key("gpt-4o", 0.7, MESSAGES)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", 0.0, MESSAGES)
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", 0.7, MESSAGES[:1])
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", 0.7, [MESSAGES[0], {"role": "user", "content": "결론을 어떻게 고칠까요?"}])
+    # 역할이 다르면 같은 본문이어도 다른 대화입니다.
+    assert key != LLMResponseCache.make_key("gpt-4o-mini", 0.7, [MESSAGES[0], {"role": "assistant", "content": MESSAGES[1]["content"]}])
+    # 메시지 형식이나 공백만 다른 같은 대화는 같은 키입니다.
+    same = [SystemMessage(content="논술 첨삭 전문가입니다."), HumanMessage(content="서론을  어떻게\n고칠까요? ")]
+    assert key == LLMResponseCache.make_key("gpt-4o-mini", 0.7, same)
+    assert key == LLMResponseCache.make_key("gpt-4o-mini", 0.7, [("system", MESSAGES[0]["content"]), ("human", MESSAGES[1]["content"])])
+
+
+def test_invoke_reuses_response_only_for_same_model_settings():
+    cache = LLMResponseCache(MemoryResponseStore())
+    llm = CountingChatModel(response="서론에 문제 제기를 넣으세요.")
+    assert llm_identity(llm) == ("gpt-4o-mini", 0.7)
+
+    assert cache.invoke(llm, MESSAGES) == "서론에 문제 제기를 넣으세요."
+    assert cache.invoke(llm, MESSAGES) == "서론에 문제 제기를 넣으세요."
+    assert llm.calls == 1
+
+    cold = CountingChatModel(temperature=0.0)
+    cache.invoke(cold, MESSAGES)
+    other_model = CountingChatModel(model_name="gpt-4o")
+    asyncio.run(cache.ainvoke(other_model, MESSAGES))
+    assert cold.calls == 1 and other_model.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 3
+
+
+def test_streaming_chain_stores_and_replays_response():
+    cache = LLMResponseCache(MemoryResponseStore())
+    llm = CountingChatModel(response="첨삭 결과입니다.")
+    prompt = ChatPromptTemplate.from_messages([("system", "첨삭 전문가"), ("user", "{answer}")])
+    chain = prompt | cached_chat_model(llm, cache) | StrOutputParser()
+
+    assert "".join(chain.stream({"answer": "답안-1"})) == "첨삭 결과입니다."
+    assert chain.invoke({"answer": "답안-1"}) == "첨삭 결과입니다."
+    assert llm.calls == 1
+    chain.invoke({"answer": "답안-2"})
+    assert llm.calls == 2
+
+
+def test_sqlite_store_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    llm = CountingChatModel(response="저장된 응답")
+    LLMResponseCache(SQLiteResponseStore(path)).invoke(llm, MESSAGES)
+
+    restarted = LLMResponseCache(SQLiteResponseStore(path))
+    assert restarted.invoke(llm, MESSAGES) == "저장된 응답"
+    assert llm.calls == 1
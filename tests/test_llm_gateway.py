@@ -0,0 +1,35 @@
+# tests/test_llm_gateway.py
+# 로컬 스텁 서버로 게이트웨이 비동기 호출을 확인합니다. (네트워크 불필요)
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_llm_server import STUB_RESPONSE, StubLLMServer
+from llm_gateway import LLMGateway
+
+
+@pytest.fixture
+def stub():
+    server = StubLLMServer(latency=0.0).start()
+    yield server
+    server.stop()
+
+
+def test_async_calls_work_across_event_loops(stub):
+    # Streamlit rerun처럼 호출마다 새 이벤트 루프를 써도 연결 풀이 예전 루프에 묶여 실패하면 안 됩니다.
+    gateway = LLMGateway({"base_url": stub.base_url, "api_key": "stub", "max_retries": 0})
+    llm = gateway.chat_model()
+
+    async def stream():
+        return "".join([chunk.content async for chunk in llm.astream("안녕하세요")])
+
+    for _ in range(3):
+        assert asyncio.run(llm.ainvoke("안녕하세요")).content == STUB_RESPONSE
+        assert asyncio.run(stream()).strip() == STUB_RESPONSE
+    assert gateway.stats()["failures"] == 0
+    assert gateway.http_async_client.loop_count == 1
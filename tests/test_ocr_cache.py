@@ -0,0 +1,71 @@
+# tests/test_ocr_cache.py
+# OCR 결과 캐시: 키에 이미지 바이트와 OCR 설정(전처리 포함)이 모두 들어가는지 확인합니다. (가짜 OCR 엔진)
+
+import io
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeOCREngine
+from ocr_cache import OCRCache
+from ocr_processor import OCRProcessor
+
+
+def png_bytes(color="white"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_processor(cache, preprocess=None):
+    processor = OCRProcessor(cache=cache, preprocess=preprocess, max_workers=0)
+    processor._ocr = FakeOCREngine()
+    return processor
+
+
+def test_key_covers_image_and_every_config_field():
+    image = png_bytes()
+    base = OCRCache.make_key(image, lang="korean", use_angle_cls=False, preprocess=None)
+    assert base == OCRCache.make_key(image, preprocess=None, use_angle_cls=False, lang="korean")  # 순서 무관
+    assert base != OCRCache.make_key(png_bytes("gray"), lang="korean", use_angle_cls=False, preprocess=None)
+    assert base != OCRCache.make_key(image, lang="korean", use_angle_cls=True, preprocess=None)
+    assert base != OCRCache.make_key(image, lang="korean", use_angle_cls=False, preprocess={"deskew": True})
+    assert (OCRCache.make_key(image, lang="korean", use_angle_cls=False, preprocess={"deskew": True})
+            != OCRCache.make_key(image, lang="korean", use_angle_cls=False, preprocess={"deskew": False}))
+
+
+def test_preprocess_setting_does_not_reuse_raw_result():
+    cache = OCRCache()
+    image = png_bytes()
+    raw, preprocessed = make_processor(cache), make_processor(cache, preprocess={})
+
+    raw.process_image(image)
+    raw.process_image(image)
+    assert raw._ocr.calls == 1  # 같은 설정이면 캐시 적중
+
+    preprocessed.process_image(image)
+    assert preprocessed._ocr.calls == 1  # 전처리 설정이 다르면 다시 OCR
+    assert make_processor(cache, preprocess={"deskew": False}).ocr_config != preprocessed.ocr_config
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    image = png_bytes()
+    first = make_processor(OCRCache(cache_dir=str(tmp_path)))
+    text = first.process_image(image)
+
+    second = make_processor(OCRCache(cache_dir=str(tmp_path)))
+    assert second.process_image(image) == text
+    assert second._ocr.calls == 0
+    assert second.cache.stats()["disk_hits"] == 1
+
+
+def test_failed_extraction_is_not_cached():
+    cache = OCRCache()
+    processor = make_processor(cache)
+    processor._ocr.lines = []  # 인식된 글자가 없는 이미지
+    assert processor.process_image(png_bytes()) == "이미지에서 텍스트를 추출하지 못했습니다."
+    processor.process_image(png_bytes())
+    assert processor._ocr.calls == 2
@@ -0,0 +1,74 @@
+# tests/test_ocr_processor.py
+# OCR 워커 풀: 한 장짜리 요청도 풀의 모델로 처리해 메인 프로세스에 모델을 따로 올리지 않는지 확인합니다.
+# (실제 프로세스 대신 스레드 풀 + 가짜 OCR 엔진)
+
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ocr_processor
+from benchmarks.fakes import FakeOCREngine
+from ocr_cache import OCRCache
+from ocr_processor import OCRProcessor
+
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def pooled_processor(monkeypatch):
+    worker_engine = FakeOCREngine()
+    monkeypatch.setattr(ocr_processor, "_worker_ocr", worker_engine)
+
+    def fail_loading(*args, **kwargs):
+        raise AssertionError("워커 풀을 쓰면 메인 프로세스에 모델을 올리지 않아야 합니다.")
+
+    monkeypatch.setattr(ocr_processor, "_load_paddle_ocr", fail_loading)
+    processor = OCRProcessor(cache=OCRCache(), max_workers=2)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(processor, "_get_pool", lambda: pool)
+    yield processor, worker_engine
+    pool.shutdown()
+
+
+def test_single_page_uses_pool_model(pooled_processor):
+    processor, worker_engine = pooled_processor
+    assert processor.process_image(png_bytes("white")).startswith("[문제 1]")
+    assert processor.process_pages([png_bytes("gray")]).startswith("[문제 1]")
+    assert worker_engine.calls == 2
+    assert processor._ocr is None
+
+
+def test_pages_keep_order_and_skip_cached(pooled_processor):
+    processor, worker_engine = pooled_processor
+    pages = [png_bytes("white"), png_bytes("gray"), png_bytes("black")]
+    processor.process_image(pages[1])
+
+    text = processor.process_pages(pages)
+    assert [line for line in text.splitlines() if line.endswith("페이지]")] == ["[1페이지]", "[2페이지]", "[3페이지]"]
+    assert worker_engine.calls == 3  # 캐시에 있던 2페이지는 다시 OCR하지 않습니다.
+
+
+def test_warm_up_marks_workers_ready(pooled_processor):
+    processor, _ = pooled_processor
+    assert not processor.is_loaded
+    processor.warm_up()
+    assert processor.is_loaded
+    assert processor._ocr is None
+
+
+def test_zero_workers_uses_in_process_model():
+    processor = OCRProcessor(cache=OCRCache(), max_workers=0)
+    processor._ocr = FakeOCREngine()
+    assert processor.process_pages([png_bytes("white"), png_bytes("gray")]).startswith("[1페이지]")
+    assert processor._ocr.calls == 2
+    assert processor._pool is None
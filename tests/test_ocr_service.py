@@ -0,0 +1,67 @@
+# tests/test_ocr_service.py
+# 공용 OCR 서비스: 여러 스레드(Streamlit 세션)가 동시에 불러도 같은 OCRProcessor와 모델 하나를 공유하는지 확인합니다.
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ocr_processor
+import ocr_service
+from benchmarks.fakes import FakeOCREngine
+
+N_CALLERS = 8
+
+
+@pytest.fixture
+def fresh_service(monkeypatch):
+    loads = []
+
+    def slow_fake_load(ocr_kwargs):
+        loads.append(ocr_kwargs)
+        time.sleep(0.05)  # 모델 로딩 중에 다른 스레드가 들어오도록 잠시 멈춥니다.
+        return FakeOCREngine()
+
+    monkeypatch.setattr(ocr_service, "_processor", None)
+    monkeypatch.setattr(ocr_processor, "_load_paddle_ocr", slow_fake_load)
+    monkeypatch.setattr(ocr_processor, "OCR_MAX_WORKERS", 0)  # 메인 프로세스 모델 경로
+    return loads
+
+
+def test_concurrent_callers_share_one_processor_and_model(fresh_service):
+    barrier = threading.Barrier(N_CALLERS)
+    processors, engines = [], []
+
+    def caller():
+        barrier.wait()
+        processor = ocr_service.get_ocr_processor()
+        processors.append(processor)
+        engines.append(processor.ocr)
+
+    threads = [threading.Thread(target=caller) for _ in range(N_CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(processors) == N_CALLERS
+    assert all(processor is processors[0] for processor in processors)
+    assert all(engine is engines[0] for engine in engines)
+    assert len(fresh_service) == 1
+
+
+def test_model_is_not_loaded_until_first_use(fresh_service):
+    processor = ocr_service.get_ocr_processor()
+    assert not processor.is_loaded
+    assert fresh_service == []
+
+
+def test_conflicting_angle_setting_is_rejected(fresh_service):
+    processor = ocr_service.get_ocr_processor(use_angle_cls=True)
+    assert ocr_service.get_ocr_processor(use_angle_cls=True) is processor
+    with pytest.raises(ValueError):
+        ocr_service.get_ocr_processor(use_angle_cls=False)
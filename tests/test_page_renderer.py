@@ -0,0 +1,72 @@
+# tests/test_page_renderer.py
+# 시험지 페이지 렌더링 캐시: 같은 페이지는 다시 렌더링하지 않고, PDF가 바뀌면(수정 시각) 새로 렌더링하는지 확인합니다.
+
+import base64
+import os
+import sys
+
+import fitz
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_renderer import PageRenderCache
+
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page(width=200, height=100).insert_text((20, 50), text)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    original = PageRenderCache._render
+
+    def counting_render(pdf_path, page_index, zoom):
+        calls.append((pdf_path, page_index, zoom))
+        return original(pdf_path, page_index, zoom)
+
+    monkeypatch.setattr(PageRenderCache, "_render", staticmethod(counting_render))
+    return calls
+
+
+def test_same_page_is_rendered_once(tmp_path, renders):
+    pdf_path = str(tmp_path / "exam.pdf")
+    write_pdf(pdf_path, "question 1")
+    cache = PageRenderCache(cache_dir=None)
+
+    first = cache.get_page_base64(pdf_path, 0)
+    assert cache.get_page_base64(pdf_path, 0) == first
+    assert base64.b64decode(first).startswith(b"\x89PNG")
+    assert len(renders) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "memory_entries": 1}
+
+
+def test_modified_pdf_is_rendered_again(tmp_path, renders):
+    pdf_path = str(tmp_path / "exam.pdf")
+    write_pdf(pdf_path, "question 1")
+    cache = PageRenderCache(cache_dir=str(tmp_path / "pages"))
+    old = cache.get_page_base64(pdf_path, 0)
+
+    write_pdf(pdf_path, "question 1 (revised)")
+    stat = os.stat(pdf_path)
+    os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # 파일 시스템 시각 단위가 거칠어도 확실히 바뀌도록
+
+    new = cache.get_page_base64(pdf_path, 0)
+    assert new != old
+    assert len(renders) == 2
+
+
+def test_disk_tier_is_shared_across_instances(tmp_path, renders):
+    pdf_path = str(tmp_path / "exam.pdf")
+    write_pdf(pdf_path, "question 1")
+    cache_dir = str(tmp_path / "pages")
+
+    encoded = PageRenderCache(cache_dir=cache_dir).get_page_base64(pdf_path, 0)
+    restarted = PageRenderCache(cache_dir=cache_dir)
+    assert restarted.get_page_base64(pdf_path, 0) == encoded
+    assert len(renders) == 1
+    assert restarted.stats()["hits"] == 1
@@ -0,0 +1,74 @@
+# tests/test_question_context.py
+# 문항별 검색 결과 캐시: 같은 문항은 다시 조회하지 않고, 인덱스가 바뀌면 비워지는지 확인합니다. (가짜 임베딩)
+
+import os
+import sys
+import threading
+
+import pytest
+from langchain_core.documents import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import make_fake_embeddings
+from essay_grader import EssayGrader
+from index_maintenance import build_index, sync_index
+
+
+def make_documents(criteria="1번 채점기준"):
+    return [
+        Document(page_content=criteria, metadata={"question_id": "q1", "source_type": "채점기준"}),
+        Document(page_content="1번 모범답안", metadata={"question_id": "q1", "source_type": "모범답안"}),
+        Document(page_content="2번 채점기준", metadata={"question_id": "q2", "source_type": "채점기준"}),
+    ]
+
+
+@pytest.fixture
+def grader():
+    grader = EssayGrader.__new__(EssayGrader)
+    grader._context_cache = {}
+    grader._context_lock = threading.Lock()
+    grader._index_version = 0
+    grader.vector_db = build_index(make_documents(), make_fake_embeddings(size=16, deterministic=True))
+    grader._build_document_index()
+    return grader
+
+
+def count_lookups(grader, monkeypatch):
+    calls = []
+    original = grader.document_index.get_question
+    monkeypatch.setattr(grader.document_index, "get_question", lambda question_id: calls.append(question_id) or original(question_id))
+    return calls
+
+
+def test_context_is_cached_per_question(grader, monkeypatch):
+    calls = count_lookups(grader, monkeypatch)
+    first = grader.get_question_context("q1")
+    assert grader.get_question_context("q1") is first
+    assert grader.get_document_content("q1", "모범답안") == "1번 모범답안"
+    assert calls == ["q1"]
+
+    assert first["retrieved_scoring_criteria"] == "1번 채점기준"
+    assert first["documents"]["출제의도"] == "출제의도을(를) 찾을 수 없습니다."
+    grader.get_question_context("q2")
+    assert calls == ["q1", "q2"]
+
+
+def test_index_refresh_clears_cached_context(grader):
+    assert grader.get_question_context("q1")["retrieved_scoring_criteria"] == "1번 채점기준"
+    sync_index(grader.vector_db, make_documents(criteria="고친 1번 채점기준"))
+    grader._build_document_index()
+    assert grader.get_question_context("q1")["retrieved_scoring_criteria"] == "고친 1번 채점기준"
+
+
+def test_result_fetched_during_refresh_is_not_cached(grader, monkeypatch):
+    original = grader.document_index.get_question
+
+    def refresh_while_reading(question_id):
+        docs = original(question_id)
+        grader._build_document_index()  # 조회하는 사이에 인덱스가 갱신된 경우
+        return docs
+
+    monkeypatch.setattr(grader.document_index, "get_question", refresh_while_reading)
+    grader.get_question_context("q1")
+    assert "q1" not in grader._context_cache
@@ -0,0 +1,36 @@
+# tests/test_startup.py
+# 백그라운드 로더: 일시적인 로딩 실패가 캐시된 로더에 영구히 남지 않고 재시도되는지 확인합니다.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup import BackgroundLoader
+
+
+def test_failed_loader_restarts_and_succeeds():
+    attempts = []
+
+    def flaky_factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("모델 다운로드 실패")
+        return "grader"
+
+    loader = BackgroundLoader("첨삭 엔진", flaky_factory).start()
+    assert loader.wait(5)
+    assert isinstance(loader.error, ConnectionError)
+
+    assert loader.restart_if_failed()
+    assert loader.result(timeout=5) == "grader"
+    assert loader.error is None
+    assert len(attempts) == 2
+
+
+def test_successful_or_running_loader_is_not_restarted():
+    calls = []
+    loader = BackgroundLoader("OCR 모델", lambda: calls.append(1) or "ocr").start()
+    assert loader.result(timeout=5) == "ocr"
+    assert not loader.restart_if_failed()
+    assert len(calls) == 1
@@ -0,0 +1,61 @@
+# tests/test_tracing.py
+# 측정 모듈: 지표 서버 기본 바인딩 주소와 프로세스 풀 워커 span 전달을 확인합니다.
+
+import io
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ocr_processor
+from benchmarks.fakes import FakeOCREngine
+from tracing import MetricsRegistry, PrometheusSink, Tracer
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 32), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_prometheus_binds_to_localhost_by_default():
+    sink = PrometheusSink(MetricsRegistry(), port=0)
+    try:
+        assert sink._server.server_address[0] == "127.0.0.1"
+    finally:
+        sink.close()
+
+
+def test_worker_spans_reach_parent_request(monkeypatch):
+    # 워커 프로세스 쪽 측정기 (부모와 별개의 registry)
+    worker_tracer = Tracer([ListSink()])
+    monkeypatch.setattr(ocr_processor, "tracer", worker_tracer)
+    monkeypatch.setattr(ocr_processor, "_worker_ocr", FakeOCREngine(), raising=False)
+    text, stages = ocr_processor._ocr_page_in_worker(png_bytes(), None)
+    assert text.startswith("[문제 1]")
+    assert [stage for stage, _ in stages] == ["ocr.decode", "ocr.paddle"]
+    assert worker_tracer.sinks[0].records == []  # 워커에서는 요청 기록을 내보내지 않습니다.
+
+    parent_sink = ListSink()
+    parent_tracer = Tracer([parent_sink])
+    with parent_tracer.request("grading"):
+        parent_tracer.record_stages(stages)
+    recorded = [stage["stage"] for stage in parent_sink.records[0]["stages"]]
+    assert recorded == ["ocr.decode", "ocr.paddle"]
+    assert parent_tracer.registry.summary()  # registry 히스토그램에도 들어갑니다.
+
+
+def test_collect_is_empty_when_tracing_is_off():
+    with Tracer().collect() as stages:
+        pass
+    assert stages == []
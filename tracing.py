@@ -0,0 +1,426 @@
+# tracing.py (첨삭 파이프라인 단계별 지연 시간 / 토큰 수 측정과 내보내기)
+
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 쉼표로 구분한 내보내기 대상 (log / json / prometheus). 비우면 측정하지 않으며, 이때 traced()는 원래 함수를 그대로 돌려줍니다.
+TRACE_SINKS = os.getenv("GRADER_TRACE", "")
+TRACE_JSON_PATH = os.getenv("GRADER_TRACE_JSON", "./.cache/traces/traces.jsonl")
+TRACE_PROMETHEUS_PORT = int(os.getenv("GRADER_TRACE_PROMETHEUS_PORT", "9464"))
+# 기본은 이 컴퓨터에서만 접근 가능. 다른 서버의 Prometheus가 수집해야 하면 0.0.0.0 등으로 지정합니다.
+TRACE_PROMETHEUS_HOST = os.getenv("GRADER_TRACE_PROMETHEUS_HOST", "127.0.0.1")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        total, result = 0, []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry:
+    """단계별 지연 시간 히스토그램과 카운터(요청 수, 오류 수, 토큰 수). 여러 스레드에서 동시에 써도 됩니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            if stage not in self._histograms:
+                self._histograms[stage] = Histogram()
+            self._histograms[stage].observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self):
+        """{단계: {"count", "mean", "max"}} (앱 화면 표시용)"""
+        with self._lock:
+            return {stage: {"count": h.count, "mean": h.sum / h.count, "max": h.max}
+                    for stage, h in sorted(self._histograms.items())}
+
+    def counters(self):
+        with self._lock:
+            return {(name, labels): value for (name, labels), value in self._counters.items()}
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 노출 형식"""
+        lines = ["# HELP grader_stage_seconds 첨삭 파이프라인 단계별 소요 시간", "# TYPE grader_stage_seconds histogram"]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                for bound, total in h.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'grader_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {total}')
+                lines.append(f'grader_stage_seconds_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'grader_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE grader_{name} counter")
+                for (counter, labels), value in sorted(self._counters.items()):
+                    if counter == name:
+                        label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                        lines.append(f"grader_{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTrace:
+    """요청 하나(첨삭 실행, 챗봇 질문 등) 동안의 단계별 시간과 토큰 수"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.stages = []
+        self.tokens = {"prompt": 0, "completion": 0}
+        self.seconds = None
+        self.error = None
+
+    def to_record(self):
+        return {
+            "request": self.name,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "error": self.error,
+            "stages": [{"stage": stage, "seconds": seconds} for stage, seconds in self.stages],
+            "tokens": dict(self.tokens),
+            **self.attrs,
+        }
+
+
+class _NoopSpan:
+    # 측정을 끈 경우 span()/request()가 돌려주는 공용 객체 (할당 없음)
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_request = ContextVar("grader_trace_request", default=None)
+
+
+class LogSink:
+    """요청이 끝날 때마다 한 줄로 출력합니다."""
+
+    def emit(self, record):
+        stages = " ".join(f"{s['stage']}={s['seconds']:.3f}s" for s in record["stages"])
+        status = f" error={record['error']}" if record["error"] else ""
+        print(f"[trace] {record['request']} {record['seconds']:.3f}s | {stages} | "
+              f"tokens prompt={record['tokens']['prompt']} completion={record['tokens']['completion']}{status}")
+
+
+class JSONFileSink:
+    """요청 기록을 JSONL 파일에 한 줄씩 덧붙입니다."""
+
+    def __init__(self, path=TRACE_JSON_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class PrometheusSink:
+    """registry를 http://<host>:<port>/metrics 로 노출합니다. 요청 기록은 이미 registry에 모이므로 emit은 하지 않습니다."""
+
+    def __init__(self, registry, port=TRACE_PROMETHEUS_PORT, host=TRACE_PROMETHEUS_HOST):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="trace-prometheus", daemon=True).start()
+        print(f"📈 단계별 지표를 http://{host}:{self._server.server_address[1]}/metrics 에서 노출합니다.")
+
+    def emit(self, record):
+        pass
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _make_token_handler(tracer):
+    # langchain_core 임포트(~0.1초)를 앱 첫 화면 이전에 하지 않도록, 측정을 켜고 LLM에 붙일 때 만듭니다.
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TokenUsageHandler(BaseCallbackHandler):
+        """LLM 호출마다 프롬프트/응답 토큰 수를 현재 요청과 registry에 더합니다. (응답 캐시 적중 시에는 호출되지 않음)"""
+
+        run_inline = True
+
+        def __init__(self, tracer):
+            self.tracer = tracer
+            self._models = {}  # run_id -> 모델 이름 (응답 토큰도 같은 모델 라벨로 집계)
+
+        def on_chat_model_start(self, serialized, messages, *, run_id=None, **kwargs):
+            from chat_memory import count_tokens
+            params = kwargs.get("invocation_params") or {}
+            model = params.get("model_name") or params.get("model") or params.get("_type", "unknown")
+            self._models[run_id] = model
+            prompt_tokens = sum(count_tokens(m.content if isinstance(m.content, str) else str(m.content)) for batch in messages for m in batch)
+            self.tracer.add_tokens(model, prompt=prompt_tokens)
+
+        def on_llm_end(self, response, *, run_id=None, **kwargs):
+            from chat_memory import count_tokens
+            completion_tokens = 0
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                    completion_tokens += usage["output_tokens"] if usage else count_tokens(generation.text)
+            model = self._models.pop(run_id, "unknown")
+            self.tracer.add_tokens(model, completion=completion_tokens)
+
+        def on_llm_error(self, error, *, run_id=None, **kwargs):
+            self._models.pop(run_id, None)
+
+    return TokenUsageHandler(tracer)
+
+
+class Tracer:
+    """
+    단계(span)별 소요 시간을 registry 히스토그램에 모으고, 요청(request) 단위 기록을 sink들로 내보냅니다.
+    sink가 하나도 없으면 span()/request()는 아무것도 하지 않는 공용 객체를 돌려주고,
+    traced()는 함수를 감싸지 않고 그대로 돌려줍니다.
+    예: with tracer.request("grading"): ... with tracer.span("ocr"): ...
+    """
+
+    def __init__(self, sinks=()):
+        self.registry = MetricsRegistry()
+        self.sinks = list(sinks)
+        self._token_handler = None
+
+    @property
+    def enabled(self):
+        return bool(self.sinks)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def span(self, stage):
+        if not self.sinks:
+            return _NOOP_SPAN
+        return self._span(stage)
+
+    @contextmanager
+    def _span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.registry.inc("stage_errors_total", stage=stage)
+            raise
+        finally:
+            self._record(stage, time.perf_counter() - start)
+
+    def _record(self, stage, seconds):
+        self.registry.observe(stage, seconds)
+        trace = _current_request.get()
+        if trace is not None:
+            trace.stages.append((stage, seconds))
+
+    @contextmanager
+    def collect(self):
+        """
+        이 블록 안에서 기록된 span을 [(stage, 초)] 목록으로 모읍니다. (registry에도 그대로 기록)
+        프로세스 풀 워커에서 잰 시간을 결과와 함께 부모 프로세스로 돌려줄 때 씁니다. 부모는 record_stages로 넣습니다.
+        """
+        if not self.sinks:
+            yield []
+            return
+        trace = RequestTrace("collect", {})
+        token = _current_request.set(trace)
+        try:
+            yield trace.stages
+        finally:
+            _current_request.reset(token)
+
+    def record_stages(self, stages):
+        """다른 프로세스에서 collect로 모은 span을 현재 요청과 registry에 더합니다."""
+        if self.sinks:
+            for stage, seconds in stages:
+                self._record(stage, seconds)
+
+    def request(self, name, **attrs):
+        """요청 하나의 범위. 이미 요청 안이면 같은 이름의 span으로 동작합니다."""
+        if not self.sinks:
+            return _NOOP_SPAN
+        if _current_request.get() is not None:
+            return self._span(name)
+        return self._request(name, attrs)
+
+    @contextmanager
+    def _request(self, name, attrs):
+        trace = RequestTrace(name, attrs)
+        token = _current_request.set(trace)
+        start = time.perf_counter()
+        try:
+            yield trace
+        except BaseException as e:
+            trace.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            trace.seconds = time.perf_counter() - start
+            try:
+                _current_request.reset(token)
+            except ValueError:
+                # 제너레이터가 다른 컨텍스트에서 정리되는 경우 (예: 다 소비되지 않은 스트림이 GC될 때)
+                _current_request.set(None)
+            self.registry.observe(f"request.{name}", trace.seconds)
+            self.registry.inc("requests_total", request=name, status="error" if trace.error else "ok")
+            record = trace.to_record()
+            for sink in self.sinks:
+                try:
+                    sink.emit(record)
+                except Exception as e:
+                    print(f"[경고] 측정 기록 내보내기 실패({type(sink).__name__}): {e}")
+
+    def add_tokens(self, model, prompt=0, completion=0):
+        if not self.sinks:
+            return
+        if prompt:
+            self.registry.inc("llm_tokens_total", prompt, model=model, kind="prompt")
+        if completion:
+            self.registry.inc("llm_tokens_total", completion, model=model, kind="completion")
+        trace = _current_request.get()
+        if trace is not None:
+            trace.tokens["prompt"] += prompt
+            trace.tokens["completion"] += completion
+
+    def instrument_llm(self, llm):
+        """LangChain 채팅 모델에 토큰 수 집계 콜백을 붙입니다. 측정을 끈 경우 아무것도 하지 않습니다."""
+        if self.sinks and hasattr(llm, "callbacks"):
+            if self._token_handler is None:
+                self._token_handler = _make_token_handler(self)
+            llm.callbacks = [*(llm.callbacks or []), self._token_handler]
+        return llm
+
+    def traced(self, stage, request=None):
+        """
+        함수 실행 시간을 stage로 기록하는 데코레이터. (일반/async 함수, 제너레이터, async 제너레이터)
+        제너레이터는 다 소비될 때까지를 재고, 첫 값이 나오기까지의 시간을 '{stage}.first_item'으로 따로 기록합니다.
+        request를 주면 바깥에 요청이 없을 때 그 이름으로 요청을 엽니다 (예: API에서 grade_essay만 호출하는 경우).
+        모듈을 임포트할 때 측정이 꺼져 있으면 원래 함수를 그대로 돌려줍니다.
+        """
+        def decorate(func):
+            if not self.sinks:
+                return func
+            def scope():
+                if request and _current_request.get() is None:
+                    return self._request(request, {})
+                return _NOOP_SPAN
+
+            if inspect.isasyncgenfunction(func):
+                @functools.wraps(func)
+                async def async_gen_wrapper(*args, **kwargs):
+                    with scope(), self._span(stage):
+                        start = time.perf_counter()
+                        first = True
+                        async for item in func(*args, **kwargs):
+                            if first:
+                                self._record(f"{stage}.first_item", time.perf_counter() - start)
+                                first = False
+                            yield item
+                return async_gen_wrapper
+
+            if inspect.isgeneratorfunction(func):
+                @functools.wraps(func)
+                def gen_wrapper(*args, **kwargs):
+                    with scope(), self._span(stage):
+                        start = time.perf_counter()
+                        first = True
+                        for item in func(*args, **kwargs):
+                            if first:
+                                self._record(f"{stage}.first_item", time.perf_counter() - start)
+                                first = False
+                            yield item
+                return gen_wrapper
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with scope(), self._span(stage):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with scope(), self._span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+
+def make_sink(name, registry):
+    if name == "log":
+        return LogSink()
+    if name == "json":
+        return JSONFileSink()
+    if name == "prometheus":
+        return PrometheusSink(registry)
+    raise ValueError(f"알 수 없는 측정 내보내기 대상입니다: {name} (log / json / prometheus)")
+
+
+def _tracer_from_env():
+    tracer = Tracer()
+    for name in filter(None, (part.strip() for part in TRACE_SINKS.split(","))):
+        if name == "prometheus":
+            from multiprocessing import parent_process
+            if parent_process() is not None:
+                # OCR 워커 프로세스도 이 모듈을 임포트하므로, 지표 서버는 메인 프로세스에서만 띄웁니다.
+                continue
+        try:
+            tracer.add_sink(make_sink(name, tracer.registry))
+        except OSError as e:
+            print(f"[경고] 측정 내보내기 대상 '{name}'을(를) 시작하지 못했습니다: {e}")
+    return tracer
+
+
+# 프로세스 전체가 함께 쓰는 측정기 (GRADER_TRACE 환경변수로 켬)
+tracer = _tracer_from_env()